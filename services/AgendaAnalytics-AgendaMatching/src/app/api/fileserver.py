@@ -1,24 +1,86 @@
-import requests
-import json
-
-from app.logs.logger import logging_text
-import app.definitions as definitions
-
-def upload(salted_fileserver_service, content, filename):
-    try: 
-        special_char_map = {ord('ä'):'ae', ord('ü'):'ue', ord('ö'):'oe', ord('ß'):'ss'}
-        filename = filename.translate(special_char_map)
-        logging_text.info("uploading results to SALTED fileserver")
-        r = requests.post(
-                salted_fileserver_service+"/files/",
-                files= [('file',(filename, content))]
-            )
-        logging_text.info(r.text)
-        response_json = r.json()
-        file_uuid = response_json[0]
-        status_code = definitions.MESSAGE_SUCCESS
-    except Exception as e:
-        status_code = definitions.MESSAGE_ERROR
-        file_uuid = None
-        logging_text.info(e)
-    return status_code, file_uuid
\ No newline at end of file
+import os
+import requests
+import json
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.logs.logger import logging_text
+import app.definitions as definitions
+
+# number of parallel uploads and files per upload request, the fileserver accepts several files in one POST /files/ form
+UPLOAD_WORKERS = int(os.environ.get("FILESERVER_UPLOAD_WORKERS", 4))
+UPLOAD_BATCH_SIZE = int(os.environ.get("FILESERVER_UPLOAD_BATCH_SIZE", 25))
+# a batch is closed earlier when its files add up to this many bytes
+UPLOAD_BATCH_BYTES = 32 * 1024 * 1024
+
+special_char_map = {ord('ä'):'ae', ord('ü'):'ue', ord('ö'):'oe', ord('ß'):'ss'}
+
+
+def create_session():
+    # keep-alive connections for all upload threads. An upload POST is not idempotent, the fileserver may have stored
+    # some files of a batch before a read error or an error status, so only connections that could not be opened
+    # (nothing was sent yet) are retried
+    retry = Retry(total=3, connect=3, read=0, status=0, other=0, redirect=0, backoff_factor=0.5, allowed_methods=["POST"])
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=UPLOAD_WORKERS, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+session = create_session()
+
+
+def make_batches(files):
+    # positions of the files, split into batches of at most UPLOAD_BATCH_SIZE files and about UPLOAD_BATCH_BYTES
+    batches = []
+    batch = []
+    batch_bytes = 0
+    for position, (filename, content) in enumerate(files):
+        if batch and (len(batch) >= UPLOAD_BATCH_SIZE or batch_bytes + len(content) > UPLOAD_BATCH_BYTES):
+            batches.append(batch)
+            batch = []
+            batch_bytes = 0
+        batch.append(position)
+        batch_bytes += len(content)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def upload_batch(salted_fileserver_service, files):
+    # upload (filename, content) tuples in one request, returns their file uuids in the same order
+    r = session.post(
+            salted_fileserver_service+"/files/",
+            files= [('file',(filename.translate(special_char_map), content)) for filename, content in files]
+        )
+    logging_text.info(r.text)
+    r.raise_for_status()
+    file_uuids = r.json()
+    if len(file_uuids) != len(files):
+        raise ValueError(f"fileserver returned {len(file_uuids)} uuids for {len(files)} files")
+    return file_uuids
+
+
+def upload_many(salted_fileserver_service, files):
+    # upload (filename, content) tuples in batches with UPLOAD_WORKERS parallel requests.
+    # Returns a (status_code, file_uuid) tuple for every file in the given order
+    files = list(files)
+    results = [(definitions.MESSAGE_ERROR, None)] * len(files)
+    batches = make_batches(files)
+    logging_text.info(f"uploading {len(files)} files in {len(batches)} requests to SALTED fileserver")
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+        futures = [(batch, executor.submit(upload_batch, salted_fileserver_service, [files[position] for position in batch])) for batch in batches]
+        for batch, future in futures:
+            try:
+                for position, file_uuid in zip(batch, future.result()):
+                    results[position] = (definitions.MESSAGE_SUCCESS, file_uuid)
+            except Exception as e:
+                logging_text.info(f"upload of {', '.join(files[position][0] for position in batch)} failed")
+                logging_text.info(e)
+    return results
+
+
+def upload(salted_fileserver_service, content, filename):
+    logging_text.info("uploading results to SALTED fileserver")
+    return upload_many(salted_fileserver_service, [(filename, content)])[0]
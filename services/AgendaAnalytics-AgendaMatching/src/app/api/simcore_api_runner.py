@@ -1,271 +1,408 @@
-import requests
-import datetime
-import json
-import time
-import sys
-import ntpath
-import os
-import re
-from io import BytesIO
-from bson.objectid import ObjectId
-from pymongo import MongoClient
-from os import listdir
-from os.path import isfile, join
-
-
-
-from app.logs.logger import logging_text
-import app.definitions as definitions
-
-class simcore_runner:
-
-    def __init__(self,settings=None):
-        self.settings = {
-            'simcore_api_url': None,
-            'entity_id': None,
-            'params': None,
-            'sleep': 180
-        }
-        if settings is not None:
-            logging_text.info("updating settings cause not None")
-            self.settings.update(settings)
-        pass    
-
-    
-    def host_files(self, text_type):
-        if text_type=="analysis":
-            entity_id_cut= self.settings['entity_id'].split(":")[-1]
-            dirname = f"/home/{entity_id_cut.replace('-','_')}/"
-            filename = os.path.join(dirname, f'./analysis.txt')   
-            file_binary = open(filename,'rb')
-            file_binary_tupel = ('analysis.txt',file_binary)
-            return file_binary_tupel
-        if text_type=="reference":
-            agenda_entity_id = self.settings['params']['agenda_entity_id']     
-            agenda_entity_id_cut= agenda_entity_id.split(":")[-1]   
-            dirname = f"/usr/src/app/refcorpora/{agenda_entity_id_cut}/"       
-            logging_text.info(f"trying to get all files from {dirname}")  
-            for f in listdir(dirname):
-                logging_text.info(f)
-            files_binary_tupel = [(f,open(join(dirname, f),'rb')) for f in listdir(dirname) if isfile(join(dirname, f))]
-    
-            return files_binary_tupel
-
-    def open_task(self):
-        url = self.settings['simcore_api_url']+"/open_task"
-        logging_text.info("creating project")
-        r = requests.get(url)
-        logging_text.info(r.status_code)
-        logging_text.info(r.text)        
-        return r.status_code, r.json()
-    
-    def upload_anatext(self, token, anatext_binary):
-        url = self.settings['simcore_api_url']+f"/upload_text/{token}"
-        logging_text.info("uploading analysis text")
-        files = [('ufile', anatext_binary)]
-        r = requests.post(url, files = files)
-        logging_text.info(r.status_code)
-        logging_text.info(r.text)
-        return r.status_code, r.json()
-
-    def upload_reftext(self, token, reftext_binary):
-        url = self.settings['simcore_api_url']+f"/upload_reference/{token}"
-        logging_text.info("uploading reference text")
-        files = [('ufile',reftext_binary)]
-        r = requests.post(url, files = files)
-        logging_text.info(r.status_code)
-        logging_text.info(r.text)
-        return r.status_code, r.json()
-    
-    def set_analyzer(self, token, analyzer):
-        url = self.settings['simcore_api_url']+f"/set_analyzer/{token}"
-        params = {'analyzer': analyzer}
-        logging_text.info("setting analyzer")
-        r = requests.post(url, params = params)
-        logging_text.info(r.status_code)
-        logging_text.info(r.text)
-        return r.status_code, r.json()
-    
-    def analyse_project(self, token, analyzer , num_reftexts):
-        url = self.settings['simcore_api_url']+f"/analyze_project/{token}"
-        logging_text.info("analyzing project")
-        try:
-            start_simcore = time.time()
-            try:
-                r = requests.get(url, timeout = 1)       
-            except requests.exceptions.ReadTimeout: 
-                pass                 
-            logging_text.info("sending checking status")
-            while True:
-                code, response = self.simcore_status(token)
-                if ('details' not in response):
-                    logging_text.info("checking status has no details specified")
-                    time.sleep(self.settings['sleep'])
-                    continue
-                elif analyzer == "coarse":
-                    if ((response['status'] == 1) and (len([s for s in response['details']['files'] if "results" in s]) != 2)):
-                            logging_text.info("not all files are computed yet")
-                            time.sleep(self.settings['sleep'])
-                            continue
-                    elif ((response['status'] == 1) and (len([s for s in response['details']['files'] if "results" in s]) == 2)):
-                        logging_text.info("finished in %fs"%(time.time() - start_simcore))
-                        status_code = definitions.MESSAGE_SUCCESS
-                        break
-                    elif (response['status'] == -1):
-                        logging_text.info("finished in %fs"%(time.time() - start_simcore))
-                        status_code = definitions.MESSAGE_ERROR
-                        break
-                    else:
-                        logging_text.info(response)
-                        time.sleep(self.settings['sleep'])
-                        continue
-                elif analyzer == "detailed":
-                    if ((response['status'] == 1) and (len([s for s in response['details']['files'] if "results" in s]) != (num_reftexts*2+2))):
-                            logging_text.info("not all files are computed yet")
-                            time.sleep(self.settings['sleep'])
-                            continue
-                    elif ((response['status'] == 1) and (len([s for s in response['details']['files'] if "results" in s]) == (num_reftexts*2+2))):
-                        logging_text.info("finished in %fs"%(time.time() - start_simcore))
-                        status_code = definitions.MESSAGE_SUCCESS
-                        break
-                    elif (response['status'] == -1):
-                        logging_text.info("finished in %fs"%(time.time() - start_simcore))
-                        status_code = definitions.MESSAGE_ERROR
-                        break
-                    else:
-                        logging_text.info(response)
-                        time.sleep(self.settings['sleep'])
-                        continue     
-
-        except Exception as exc:
-            logging_text.info("Starting simcore service threw error")
-            logging_text.info(exc)
-            status_code = definitions.MESSAGE_ERROR
-            return status_code
-        return status_code
-
-    def simcore_status(self, token):
-        # for each analysis text, 2 files get calcualted (.joblib and .xlsx) --> in the "files" attribute there must be num analysis * 2 + 1 entries
-        try:
-            url = self.settings['simcore_api_url']+f"/list_task_files/{token}"
-            logging_text.info("getting project info for status update")
-            r = requests.get(url, timeout = 10)
-            logging_text.info(r.json)
-            logging_text.info(r.status_code)
-            logging_text.info(r.text)
-        except requests.exceptions.ReadTimeout: 
-            logging_text.info("ran in ReadTimeout error")
-            return definitions.MESSAGE_ERROR, {}                
-        return r.status_code, r.json()
-
-    def set_vizualizer(self, token, vizualizer):
-        url = self.settings['simcore_api_url']+f"/set_visualizer/{token}"
-        params = {'sc_visualizer': vizualizer}
-        logging_text.info("setting visualizer")
-        r = requests.post(url, params = params)
-        logging_text.info(r.status_code)
-        logging_text.info(r.text)
-        return r.status_code, r.json()
-    
-    def visualize_project(self, token):
-        url = self.settings['simcore_api_url']+f"/visualize_project/{token}"
-        logging_text.info("visualizing project")
-        r = requests.get(url)
-        logging_text.info(r.status_code)
-        logging_text.info(r.text)
-        return r.status_code, r.json()
-
-    def get_result_files(self,token):
-        url = self.settings['simcore_api_url']+f"/list_task_files/{token}"
-        logging_text.info("getting project info downloading project files")
-        r = requests.get(url)
-        logging_text.info(r.status_code)
-        logging_text.info(r.text)
-        files = r.json()["details"]["files"] 
-        matching_files = []
-        for file in files:
-            file_name = file.split("/")[-1]
-            url = self.settings['simcore_api_url']+f"/download_file/{token}"
-            params = {"afilepath": file}
-            r = requests.post(url, params = params, timeout = 1200)
-            matching_files.append({"file_name": file_name, "file_content_binary": r.content})
-        return matching_files
-    
-    def close_task(self, token):
-        url = self.settings['simcore_api_url']+f"/close_task/{token}"
-        logging_text.info("closing project")
-        r = requests.get(url)
-        logging_text.info(r.status_code)
-        logging_text.info(r.text)        
-        return r.status_code, r.json()
-    
-
-        
-    
-    def run(self):
-        try:
-            logging_text.info('Starting pipeline')
-            logging_text.info('Simcore URL: '+ self.settings['simcore_api_url'])
-            logging_text.info('-------------------------')
-            # getting all documents stored for corresponding entity in crawled documents 
-            logging_text.info(f"Getting analysis text from host file system")
-            analysis_text_binary_tupel= self.host_files("analysis")
-            logging_text.info(f"Getting reference text from host file system")
-            reference_texts_binary_tupel = self.host_files("reference")
-            logging_text.info(analysis_text_binary_tupel)
-            logging_text.info(reference_texts_binary_tupel)
-            code, response = self.open_task()
-            project_token = response["details"]["token"]
-            logging_text.info(f"The following token was obtained: {project_token}")
-            if code == 200:
-                # upload orga text as analysis text
-                code, response = self.upload_anatext(project_token,analysis_text_binary_tupel)
-                if code == 200:
-                    # upload reference texts as reference text
-                    for tupel in reference_texts_binary_tupel:
-                        code, response = self.upload_reftext(project_token, tupel)
-                        if code == 200:
-                            continue
-                        else:
-                            break          
-                    # only continues when last code is also 200
-                    if code == 200:
-                        code, response = self.set_analyzer(project_token, "coarse")
-                        if code == 200:                            
-                            code = self.analyse_project(project_token, "coarse", len(reference_texts_binary_tupel))
-                            if code == definitions.MESSAGE_SUCCESS:
-                                code, response = self.set_vizualizer(project_token, "coarse")                     
-                                if code == 200:                                    
-                                    code, response = self.set_analyzer(project_token, "detailed")        
-                                    if code == 200:                        
-                                        code = self.analyse_project(project_token, "detailed", len(reference_texts_binary_tupel))
-                                        if code == definitions.MESSAGE_SUCCESS:
-                                            matching_files = self.get_result_files(project_token)
-                                            code, response =self.close_task(project_token)  
-                                            status_code = definitions.MESSAGE_SUCCESS                                            
-                                        else:
-                                            return definitions.MESSAGE_ERROR
-                                    else:
-                                        status_code = definitions.MESSAGE_ERROR
-                                else:
-                                    status_code = definitions.MESSAGE_ERROR
-                            else:
-                                return definitions.MESSAGE_ERROR
-                        else:
-                            return definitions.MESSAGE_ERROR  
-                    else:
-                        return definitions.MESSAGE_ERROR                
-                else:
-                    return definitions.MESSAGE_ERROR        
-            else:
-                return definitions.MESSAGE_ERROR
-            logging_text.info('-------------------------')
-            logging_text.info('Pipeline finished')
-
-        except: 
-            status_code = definitions.MESSAGE_ERROR
-            matching_files = []
-        
-        
-        return status_code, matching_files
-        
+import requests
+import datetime
+import hashlib
+import json
+import time
+import sys
+import ntpath
+import os
+import re
+import tarfile
+import threading
+from io import BytesIO
+from bson.objectid import ObjectId
+from pymongo import MongoClient
+from os import listdir
+from os.path import isfile, join
+
+
+
+from app.logs.logger import logging_text
+import app.definitions as definitions
+
+
+# the simcore engine of this process, models stay loaded between matchings
+simcore_engine = None
+simcore_engine_lock = threading.Lock()
+
+def get_simcore_engine(simcore_path):
+    global simcore_engine
+    with simcore_engine_lock:
+        if simcore_engine is None:
+            # simcore reads its settings.toml through the global dynaconf settings, its modules are imported from its src folder
+            os.environ.setdefault("SETTINGS_FILE_FOR_DYNACONF", os.path.join(simcore_path, "settings.toml"))
+            sys.path.append(os.path.join(simcore_path, "src"))
+            from simcore_engine_mod import SimCoreEngine
+            logging_text.info(f"loaded simcore engine from {simcore_path}")
+            simcore_engine = SimCoreEngine()
+    return simcore_engine
+
+
+# an analysis taking longer than this many seconds or this many failed status requests in a row is given up
+SIMCORE_TIMEOUT = int(os.environ.get("SIMCORE_TIMEOUT", 7200))
+SIMCORE_MAX_ERRORS = int(os.environ.get("SIMCORE_MAX_ERRORS", 5))
+
+
+def is_text_file(dirname, filename):
+    # simcore skips hidden files (e.g. .gitkeep, .DS_Store) of uploads, they are neither uploaded nor part of the corpus hash
+    return isfile(join(dirname, filename)) and not filename.startswith(".")
+
+
+class simcore_runner:
+
+    def __init__(self,settings=None):
+        self.settings = {
+            'simcore_api_url': None,
+            'entity_id': None,
+            'params': None,
+            'poll': 5,
+            'wait': 60,
+            'timeout': SIMCORE_TIMEOUT,
+            'max_errors': SIMCORE_MAX_ERRORS
+        }
+        if settings is not None:
+            logging_text.info("updating settings cause not None")
+            self.settings.update(settings)
+        pass    
+
+    
+    def host_files(self, text_type):
+        if text_type=="analysis":
+            entity_id_cut= self.settings['entity_id'].split(":")[-1]
+            dirname = f"/home/{entity_id_cut.replace('-','_')}/"
+            filename = os.path.join(dirname, f'./analysis.txt')   
+            file_binary = open(filename,'rb')
+            file_binary_tupel = ('analysis.txt',file_binary)
+            return file_binary_tupel
+        if text_type=="reference":
+            agenda_entity_id = self.settings['params']['agenda_entity_id']     
+            agenda_entity_id_cut= agenda_entity_id.split(":")[-1]   
+            dirname = f"/usr/src/app/refcorpora/{agenda_entity_id_cut}/"       
+            logging_text.info(f"trying to get all files from {dirname}")  
+            for f in listdir(dirname):
+                logging_text.info(f)
+            files_binary_tupel = [(f,open(join(dirname, f),'rb')) for f in listdir(dirname) if is_text_file(dirname, f)]
+    
+            return files_binary_tupel
+
+    def open_task(self):
+        url = self.settings['simcore_api_url']+"/open_task"
+        logging_text.info("creating project")
+        r = requests.get(url)
+        logging_text.info(r.status_code)
+        logging_text.info(r.text)        
+        return r.status_code, r.json()
+    
+    def upload_anatext(self, token, anatext_binary):
+        url = self.settings['simcore_api_url']+f"/upload_text/{token}"
+        logging_text.info("uploading analysis text")
+        files = [('ufile', anatext_binary)]
+        r = requests.post(url, files = files)
+        logging_text.info(r.status_code)
+        logging_text.info(r.text)
+        return r.status_code, r.json()
+
+    def upload_reftext(self, token, reftext_binary):
+        url = self.settings['simcore_api_url']+f"/upload_reference/{token}"
+        logging_text.info("uploading reference text")
+        files = [('ufile',reftext_binary)]
+        r = requests.post(url, files = files)
+        logging_text.info(r.status_code)
+        logging_text.info(r.text)
+        return r.status_code, r.json()
+
+    def upload_reftexts(self, token, reftexts_binary):
+        # all reference texts in one multipart request, simcore reports the result per file
+        url = self.settings['simcore_api_url']+f"/upload_files/{token}"
+        params = {'is_reference': True}
+        logging_text.info(f"uploading {len(reftexts_binary)} reference texts")
+        files = [('ufiles', reftext_binary) for reftext_binary in reftexts_binary]
+        r = requests.post(url, params = params, files = files)
+        logging_text.info(r.status_code)
+        logging_text.info(r.text)
+        return r.status_code, r.json()
+    
+    def corpus_hash(self, reftexts_binary):
+        # same recipe as simcore: sha256 over "<name>\0<sha256 of content>\n" for all files sorted by name
+        h = hashlib.sha256()
+        for name, file_binary in sorted(reftexts_binary, key=lambda tupel: tupel[0]):
+            digest = hashlib.sha256(file_binary.read()).hexdigest()
+            file_binary.seek(0)
+            h.update(f"{name}\0{digest}\n".encode("utf-8"))
+        return h.hexdigest()
+
+    def ensure_corpus(self, corpus_id, reftexts_binary):
+        # the agenda is registered in simcore only once and again only when its files changed
+        url = self.settings['simcore_api_url']+f"/corpus_status/{corpus_id}"
+        logging_text.info(f"checking reference corpus {corpus_id}")
+        r = requests.get(url)
+        logging_text.info(r.status_code)
+        logging_text.info(r.text)
+        response = r.json()
+        if r.status_code == 200 and response['status'] == 1 and response['details']['corpus']['content_hash'] == self.corpus_hash(reftexts_binary):
+            logging_text.info(f"reference corpus {corpus_id} is up to date")
+            return r.status_code, response
+        url = self.settings['simcore_api_url']+f"/register_corpus/{corpus_id}"
+        logging_text.info(f"registering {len(reftexts_binary)} reference texts as corpus {corpus_id}")
+        files = [('ufiles', reftext_binary) for reftext_binary in reftexts_binary]
+        r = requests.post(url, files = files)
+        logging_text.info(r.status_code)
+        logging_text.info(r.text)
+        return r.status_code, r.json()
+
+    def attach_corpus(self, token, corpus_id):
+        url = self.settings['simcore_api_url']+f"/attach_corpus/{token}"
+        params = {'corpus_id': corpus_id}
+        logging_text.info(f"attaching reference corpus {corpus_id}")
+        r = requests.post(url, params = params)
+        logging_text.info(r.status_code)
+        logging_text.info(r.text)
+        return r.status_code, r.json()
+
+    def set_analyzer(self, token, analyzer):
+        url = self.settings['simcore_api_url']+f"/set_analyzer/{token}"
+        params = {'analyzer': analyzer}
+        logging_text.info("setting analyzer")
+        r = requests.post(url, params = params)
+        logging_text.info(r.status_code)
+        logging_text.info(r.text)
+        return r.status_code, r.json()
+    
+    def analyse_project(self, token):
+        # the analysis runs as a background job in simcore. Its status is long-polled: simcore answers as soon as the job changed, so the end is noticed at once
+        url = self.settings['simcore_api_url']+f"/analyze_project/{token}"
+        logging_text.info("analyzing project")
+        try:
+            start_simcore = time.time()
+            r = requests.get(url, timeout = 60)
+            logging_text.info(r.status_code)
+            logging_text.info(r.text)
+            job_id = r.json()['details']['job_id']
+            logging_text.info("waiting for job status")
+            version = 0
+            errors = 0
+            deadline = start_simcore + self.settings['timeout']
+            while True:
+                if time.time() > deadline:
+                    logging_text.info("simcore job %s not finished after %ds, giving up"%(job_id, self.settings['timeout']))
+                    status_code = definitions.MESSAGE_ERROR
+                    break
+                code, response = self.wait_job(token, job_id, version, min(self.settings['wait'], max(deadline - time.time(), 1)))
+                if ('details' not in response) or ('state' not in response['details']):
+                    errors += 1
+                    logging_text.info("checking status has no details specified (%d of %d errors)"%(errors, self.settings['max_errors']))
+                    if errors >= self.settings['max_errors']:
+                        status_code = definitions.MESSAGE_ERROR
+                        break
+                    time.sleep(self.settings['poll'])
+                    continue
+                errors = 0
+                if response['details']['state'] == "done":
+                    logging_text.info("finished in %fs"%(time.time() - start_simcore))
+                    status_code = definitions.MESSAGE_SUCCESS
+                    break
+                elif response['details']['state'] == "failed":
+                    logging_text.info("finished in %fs"%(time.time() - start_simcore))
+                    logging_text.info(response['details']['message'])
+                    status_code = definitions.MESSAGE_ERROR
+                    break
+                else:
+                    logging_text.info(f"job {response['details']['state']}, progress {response['details']['progress']}")
+                    version = response['details']['version']
+                    continue
+
+        except Exception as exc:
+            logging_text.info("Starting simcore service threw error")
+            logging_text.info(exc)
+            status_code = definitions.MESSAGE_ERROR
+            return status_code
+        return status_code
+
+    def wait_job(self, token, job_id, version, wait=None):
+        if wait is None:
+            wait = self.settings['wait']
+        try:
+            url = self.settings['simcore_api_url']+f"/wait_job/{token}"
+            params = {'job_id': job_id, 'version': version, 'timeout': wait}
+            logging_text.info("waiting for job status")
+            r = requests.get(url, params = params, timeout = wait + 10)
+            logging_text.info(r.status_code)
+            logging_text.info(r.text)
+            return r.status_code, r.json()
+        except (requests.exceptions.RequestException, ValueError) as exc:
+            # the caller counts this as a failed status request and tries again
+            logging_text.info("waiting for job status failed")
+            logging_text.info(exc)
+            return definitions.MESSAGE_ERROR, {}
+
+    def simcore_status(self, token):
+        # for each analysis text, 1 result file gets calcualted (.parquet, the .xlsx is generated on download) --> in the "files" attribute there must be num analysis + 1 entries
+        try:
+            url = self.settings['simcore_api_url']+f"/list_task_files/{token}"
+            logging_text.info("getting project info for status update")
+            r = requests.get(url, timeout = 10)
+            logging_text.info(r.json)
+            logging_text.info(r.status_code)
+            logging_text.info(r.text)
+        except requests.exceptions.ReadTimeout: 
+            logging_text.info("ran in ReadTimeout error")
+            return definitions.MESSAGE_ERROR, {}                
+        return r.status_code, r.json()
+
+    def set_vizualizer(self, token, vizualizer):
+        url = self.settings['simcore_api_url']+f"/set_visualizer/{token}"
+        params = {'sc_visualizer': vizualizer}
+        logging_text.info("setting visualizer")
+        r = requests.post(url, params = params)
+        logging_text.info(r.status_code)
+        logging_text.info(r.text)
+        return r.status_code, r.json()
+    
+    def visualize_project(self, token):
+        url = self.settings['simcore_api_url']+f"/visualize_project/{token}"
+        logging_text.info("visualizing project")
+        r = requests.get(url)
+        logging_text.info(r.status_code)
+        logging_text.info(r.text)
+        return r.status_code, r.json()
+
+    def get_result_files(self,token):
+        # all results come as one tar.gz archive that is read while it is streamed,
+        # the kpi calculation reads the parquet results directly
+        url = self.settings['simcore_api_url']+f"/download_results/{token}"
+        logging_text.info("downloading result archive")
+        matching_files = []
+        with requests.get(url, stream = True, timeout = 1200) as r:
+            logging_text.info(r.status_code)
+            r.raise_for_status()
+            if r.headers.get("content-type", "").startswith("application/json"):
+                # no archive but a status message, e.g. when a job of the task is still running
+                logging_text.info(r.text)
+                return matching_files
+            with tarfile.open(fileobj = r.raw, mode = "r|gz") as archive:
+                for member in archive:
+                    if member.isfile():
+                        content_binary = archive.extractfile(member).read()
+                        matching_files.append({"file_name": member.name, "file_content_binary": content_binary})
+        logging_text.info(f"{len(matching_files)} result files downloaded")
+        return matching_files
+    
+    def close_task(self, token):
+        url = self.settings['simcore_api_url']+f"/close_task/{token}"
+        logging_text.info("closing project")
+        r = requests.get(url)
+        logging_text.info(r.status_code)
+        logging_text.info(r.text)        
+        return r.status_code, r.json()
+    
+
+        
+    
+    def run(self):
+        try:
+            logging_text.info('Starting pipeline')
+            logging_text.info('Simcore URL: '+ self.settings['simcore_api_url'])
+            logging_text.info('-------------------------')
+            # getting all documents stored for corresponding entity in crawled documents 
+            logging_text.info(f"Getting analysis text from host file system")
+            analysis_text_binary_tupel= self.host_files("analysis")
+            logging_text.info(f"Getting reference text from host file system")
+            reference_texts_binary_tupel = self.host_files("reference")
+            logging_text.info(analysis_text_binary_tupel)
+            logging_text.info(reference_texts_binary_tupel)
+            code, response = self.open_task()
+            project_token = response["details"]["token"]
+            logging_text.info(f"The following token was obtained: {project_token}")
+            if code == 200:
+                # upload orga text as analysis text
+                code, response = self.upload_anatext(project_token,analysis_text_binary_tupel)
+                if code == 200:
+                    # use the agenda as registered reference corpus instead of uploading it to every task
+                    corpus_id = self.settings['params']['agenda_entity_id'].split(":")[-1]
+                    code, response = self.ensure_corpus(corpus_id, reference_texts_binary_tupel)
+                    if code == 200 and response['status'] == 1:
+                        code, response = self.attach_corpus(project_token, corpus_id)
+                    # only continues when the corpus is attached
+                    if code == 200 and response['status'] == 1:
+                        # coarse and detailed results in one analysis pass over the texts
+                        code, response = self.set_analyzer(project_token, "coarse+detailed")
+                        if code == 200:                            
+                            code = self.analyse_project(project_token)
+                            if code == definitions.MESSAGE_SUCCESS:
+                                code, response = self.set_vizualizer(project_token, "coarse")                     
+                                if code == 200:                                    
+                                    matching_files = self.get_result_files(project_token)
+                                    code, response =self.close_task(project_token)  
+                                    status_code = definitions.MESSAGE_SUCCESS                                            
+                                else:
+                                    status_code = definitions.MESSAGE_ERROR
+                            else:
+                                return definitions.MESSAGE_ERROR
+                        else:
+                            return definitions.MESSAGE_ERROR  
+                    else:
+                        return definitions.MESSAGE_ERROR                
+                else:
+                    return definitions.MESSAGE_ERROR        
+            else:
+                return definitions.MESSAGE_ERROR
+            logging_text.info('-------------------------')
+            logging_text.info('Pipeline finished')
+
+        except: 
+            status_code = definitions.MESSAGE_ERROR
+            matching_files = []
+        
+        
+        return status_code, matching_files
+
+
+class simcore_engine_runner(simcore_runner):
+    # runs simcore in this process instead of calling its api: the texts are handed over in memory
+    # and the results come back as dataframes, which the kpi calculation reads directly
+
+    def __init__(self,settings=None):
+        super().__init__(settings)
+        self.settings.setdefault('simcore_path', None)
+        self.settings.setdefault('analyzers', ["coarse+detailed"])
+
+    def read_texts(self, text_type):
+        texts = {}
+        files_binary_tupel = self.host_files(text_type)
+        if text_type == "analysis":
+            files_binary_tupel = [files_binary_tupel]
+        for name, file_binary in files_binary_tupel:
+            with file_binary:
+                texts[name] = file_binary.read().decode("utf-8")
+        return texts
+
+    def run(self):
+        try:
+            logging_text.info('Starting pipeline')
+            logging_text.info('Simcore engine: '+ self.settings['simcore_path'])
+            logging_text.info('-------------------------')
+            engine = get_simcore_engine(self.settings['simcore_path'])
+            logging_text.info(f"Getting analysis text from host file system")
+            analysis_texts = self.read_texts("analysis")
+            logging_text.info(f"Getting reference text from host file system")
+            reference_texts = self.read_texts("reference")
+            logging_text.info(f"matching {list(analysis_texts)} with {len(reference_texts)} reference texts")
+            start_simcore = time.time()
+            results = engine.analyze_texts(analysis_texts, reference_texts, analyzers=self.settings['analyzers'])
+            logging_text.info("finished in %fs"%(time.time() - start_simcore))
+            # the results are handed on as the parquet files simcore would have written, together with their dataframes
+            matching_files = []
+            for analyzer_results in results.values():
+                for name, rdf in analyzer_results.items():
+                    matching_files.append({"file_name": f"{name}.parquet", "file_content_binary": engine.result_bytes(rdf), "dataframe": rdf})
+            status_code = definitions.MESSAGE_SUCCESS
+            logging_text.info('-------------------------')
+            logging_text.info('Pipeline finished')
+
+        except Exception as exc:
+            logging_text.info("Running simcore engine threw error")
+            logging_text.info(exc)
+            status_code = definitions.MESSAGE_ERROR
+            matching_files = []
+
+        return status_code, matching_files
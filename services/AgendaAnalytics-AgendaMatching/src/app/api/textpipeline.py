@@ -0,0 +1,134 @@
+import io
+import re
+import time
+import hashlib
+
+from app.logs.logger import logging_text
+
+
+# lines shorter than this are mostly navigation, headings, page numbers or table cells of the crawled documents
+MIN_LINE_LENGTH = 43
+# a text without sentence ends is cut into pieces of this length, such that the pipeline keeps bounded memory
+MAX_SENTENCE_LENGTH = 100000
+
+SPACES_RE = re.compile(" {2,}")
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+# the stages of the pipeline are generators: every line passes all stages before the next one is read,
+# so no stage holds more than a sentence of the text
+
+def read_lines(documents):
+    # lines of the texts of all documents, one document after the other
+    for document in documents:
+        if isinstance(document['text'], str):
+            # universal newlines like reading the text from a file
+            yield from io.StringIO(document['text'], newline=None)
+        else:
+            logging_text.info(f"skip concat text of {document['name']} since its not a valid string")
+
+
+def filter_short_lines(lines, min_length=MIN_LINE_LENGTH):
+    for line in lines:
+        line = line.strip()
+        if len(line) >= min_length:
+            yield line
+
+
+def normalize_whitespace(lines):
+    # remove long white spaces
+    for line in lines:
+        yield SPACES_RE.sub(" ", line)
+
+
+def split_sentences(lines, max_length=MAX_SENTENCE_LENGTH):
+    # the lines are joined with spaces and cut after every . ! or ? followed by white space,
+    # sentences spanning several lines (e.g. of a pdf) are thus joined again
+    pending = []
+    pending_length = 0
+    for line in lines:
+        parts = SENTENCE_END_RE.split(line)
+        if pending and pending[-1][-1:] in (".", "!", "?"):
+            # the space joining the line ends the pending sentence
+            yield " ".join(pending)
+            pending, pending_length = [], 0
+        if len(parts) > 1:
+            pending.append(parts[0])
+            yield " ".join(pending)
+            yield from parts[1:-1]
+            pending, pending_length = [], 0
+        if parts[-1]:
+            pending.append(parts[-1])
+            pending_length += len(parts[-1]) + 1
+        if pending_length > max_length:
+            text = " ".join(pending)
+            while len(text) > max_length:
+                yield text[:max_length]
+                text = text[max_length:]
+            pending, pending_length = [text], len(text)
+    if pending:
+        yield " ".join(pending)
+
+
+def dedup_sentences(sentences):
+    # remove duplicate sentences (e.g. cookie banners and footers of crawled pages), only a short hash is kept per sentence
+    seen = set()
+    for sentence in sentences:
+        digest = hashlib.blake2b(sentence.encode("utf-8"), digest_size=8).digest()
+        if digest not in seen:
+            seen.add(digest)
+            yield sentence
+
+
+STAGES = [
+    ("filter", filter_short_lines),
+    ("normalize", normalize_whitespace),
+    ("split", split_sentences),
+    ("dedup", dedup_sentences),
+]
+
+
+def timed(items, timings, name):
+    # adds the time spent in producing the items (including the stages before) to timings[name]
+    timings.setdefault(name, 0.0)
+    iterator = iter(items)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            timings[name] += time.perf_counter() - start
+            return
+        timings[name] += time.perf_counter() - start
+        yield item
+
+
+def write_analysis_text(documents, filenames, timings=None):
+    # run the texts of the documents through all stages and write the sentences, one per line, to every
+    # file in filenames in one pass. Returns the number of sentences written. With a dict as timings the
+    # seconds spent in every stage (without the stages before) are filled in
+    inclusive = {}
+    items = timed(read_lines(documents), inclusive, "read")
+    for name, stage in STAGES:
+        items = timed(stage(items), inclusive, name)
+
+    start = time.perf_counter()
+    count = 0
+    files = [open(filename, "w") for filename in filenames]
+    try:
+        for sentence in items:
+            for f in files:
+                f.write(sentence + "\n")
+            count += 1
+    finally:
+        for f in files:
+            f.close()
+    total = time.perf_counter() - start
+
+    if timings is not None:
+        before = 0.0
+        for name in ["read"] + [name for name, _ in STAGES]:
+            timings[name] = inclusive[name] - before
+            before = inclusive[name]
+        timings["write"] = total - before
+    return count
@@ -0,0 +1,86 @@
+import json
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# the app modules are imported in the order of app.main
+from app.db import crud
+from app.api import kpi
+from kpi_benchmark import as_parquet, as_xlsx, calculate_legacy, normalize
+
+
+ANALYSIS = [
+    "We reduce the water use of our plants.",
+    "Our energy comes from renewable sources.",
+    "The annual report is published in spring.",
+    "We reduce the water use of our plants.",
+]
+
+
+def make_results():
+    # detailed results of the analysis text against five targets of two goals and the coarse result, as simcore writes them.
+    # The third sentence matches nothing and goal 2 has a target without any match
+    rng = np.random.default_rng(0)
+    results = []
+    coarse = []
+    for ref_tag in ["sdg.1-1.txt", "sdg.1-2.txt", "sdg.1-3.txt", "sdg.2-1.txt", "sdg.2-2.txt"]:
+        reference = [f"{ref_tag} sentence {j}." for j in range(3)] + [f"{ref_tag} sentence 0."]
+        values = rng.random((len(ANALYSIS), len(reference)), dtype=np.float32)
+        values[values < 0.3] = 0.0
+        values[2] = 0.0
+        if ref_tag == "sdg.2-2.txt":
+            values[:] = 0.0
+        results.append((f"analysis.txt${ref_tag}.detailed", pd.DataFrame(values, index=ANALYSIS, columns=reference)))
+        similarity = 0.0 if ref_tag == "sdg.1-3.txt" else float(rng.random())
+        coarse.append(("analysis.txt", " ".join(ANALYSIS), similarity, ref_tag, " ".join(reference)))
+    results.append(("analysis.txt.coarse", pd.DataFrame(coarse, columns=["ana_tag", "ana_text", "similarity", "ref_tag", "ref_text"])))
+    return results
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    xlsx_files = [{"filename": f"{name}.xlsx", "content_binary": as_xlsx(rdf)} for name, rdf in make_results()]
+    # the previous calculation warns about fragments without any match
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return calculate_legacy(xlsx_files, "sdg")
+
+
+def kpi_files(source):
+    if source == "xlsx":
+        return [{"filename": f"{name}.xlsx", "content_binary": as_xlsx(rdf)} for name, rdf in make_results()]
+    if source == "parquet":
+        return [{"filename": f"{name}.parquet", "content_binary": as_parquet(rdf)} for name, rdf in make_results()]
+    return [{"filename": f"{name}.parquet", "content_binary": b"", "dataframe": rdf} for name, rdf in make_results()]
+
+
+@pytest.mark.parametrize("source", ["xlsx", "parquet", "dataframe"])
+def test_calculate_matches_the_previous_calculation(baseline, source):
+    assert len(baseline["detailed"]["raw_values"]) == 5 * len(ANALYSIS) and len(baseline["coarse"]["mean_per_level0"]) == 2
+    kpivalue = kpi.calculate(kpi_files(source), "sdg")
+    json.dumps(kpivalue)
+    assert normalize(kpivalue) == normalize(baseline)
+
+
+def test_calculate_aggregates():
+    kpivalue = kpi.calculate(kpi_files("dataframe"), "sdg")
+    assert len(kpivalue["text"]["analysis"]) == len(ANALYSIS)
+    assert len(kpivalue["detailed"]["raw_values"]) == 5 * len(ANALYSIS)
+    # a sentence without matches and a target without matches are nan
+    assert all(np.isnan(value["similarity"]) for value in kpivalue["detailed"]["raw_values"] if value["fragment"] == 3)
+    per_level1 = {(value["level0"], value["level1"]): value["similarity"] for value in kpivalue["detailed"]["mean_per_level1"]}
+    assert np.isnan(per_level1[("2", "2")])
+    per_level0 = {value["level0"]: value["similarity"] for value in kpivalue["detailed"]["mean_per_level0"]}
+    assert per_level0["1"] == pytest.approx(np.mean([per_level1[("1", level1)] for level1 in "123"]))
+    assert np.isnan(per_level0["2"])
+    # a coarse similarity of 0 is reported as missing
+    coarse = {value["level0"]: value["similarity"] for value in kpivalue["coarse"]["mean_per_level0"]}
+    assert coarse["1"] == "None" and isinstance(coarse["2"], float)
+
+
+def test_preferred_source_is_used():
+    # the same result as parquet and as Excel export: the parquet file is read
+    files = kpi_files("parquet") + [{"filename": "analysis.txt$sdg.1-1.txt.detailed.xlsx", "content_binary": b"not an excel file"}]
+    assert normalize(kpi.calculate(files, "sdg")) == normalize(kpi.calculate(kpi_files("parquet"), "sdg"))
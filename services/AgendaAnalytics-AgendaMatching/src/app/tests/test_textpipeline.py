@@ -0,0 +1,80 @@
+import re
+
+# the app modules are imported in the order of app.main
+from app.db import crud
+from app.api import textpipeline
+
+
+DOCUMENTS = [
+    {"name": "report.pdf", "text": "Annual report 2021\r\n"
+                                   "We reduce the water use of our plants by recycling the cooling water.  The energy of our\n"
+                                   "sites comes from renewable sources since the beginning of 2020! Do we protect the climate?\n"
+                                   "Page 3\n"
+                                   "Accept all cookies to get the best experience on our website.\n"},
+    {"name": "broken.html", "text": None},
+    {"name": "index.html", "text": "Home | Products | About us\n"
+                                   "Accept all cookies to get the best experience on our website.\n"
+                                   "Our     employees volunteer in the schools of the region every month.\n"},
+]
+
+
+def previous_text(documents):
+    # the analysis text as assembled before the pipeline: all lines long enough, joined by spaces
+    text = " "
+    for document in documents:
+        if isinstance(document["text"], str):
+            text = text + "\n" + document["text"]
+    lines = [line.strip() for line in text.splitlines()]
+    text = " ".join(line for line in lines if len(line) >= textpipeline.MIN_LINE_LENGTH)
+    return re.sub(" +", " ", text)
+
+
+def run(documents, stages):
+    items = textpipeline.read_lines(documents)
+    for name, stage in textpipeline.STAGES:
+        if name in stages:
+            items = stage(items)
+    return list(items)
+
+
+def test_stages():
+    sentences = run(DOCUMENTS, ["filter", "normalize", "split", "dedup"])
+    assert sentences == [
+        "We reduce the water use of our plants by recycling the cooling water.",
+        "The energy of our sites comes from renewable sources since the beginning of 2020!",
+        "Do we protect the climate?",
+        "Accept all cookies to get the best experience on our website.",
+        "Our employees volunteer in the schools of the region every month.",
+    ]
+
+
+def test_sentences_give_the_previous_text():
+    assert " ".join(run(DOCUMENTS, ["filter", "normalize", "split"])) == previous_text(DOCUMENTS)
+
+
+def test_filter_short_lines():
+    assert list(textpipeline.filter_short_lines(["  short line  \n", "x" * 43 + "\n"])) == ["x" * 43]
+
+
+def test_split_sentences_across_lines():
+    lines = ["The first sentence spans", "two lines. The second one", "ends here.", "A third one."]
+    assert list(textpipeline.split_sentences(lines)) == [
+        "The first sentence spans two lines.", "The second one ends here.", "A third one."]
+
+
+def test_split_sentences_cuts_text_without_sentence_ends():
+    sentences = list(textpipeline.split_sentences(["a" * 25, "b" * 25], max_length=20))
+    assert "".join(sentences).replace(" ", "") == "a" * 25 + "b" * 25
+    assert all(len(sentence) <= 20 for sentence in sentences)
+
+
+def test_write_analysis_text(tmp_path):
+    filenames = [str(tmp_path / "analysis.txt"), str(tmp_path / "debug.txt")]
+    timings = {}
+    count = textpipeline.write_analysis_text(DOCUMENTS, filenames, timings)
+    assert count == 5
+    for filename in filenames:
+        with open(filename) as f:
+            assert f.read().splitlines() == run(DOCUMENTS, ["filter", "normalize", "split", "dedup"])
+    assert list(timings) == ["read", "filter", "normalize", "split", "dedup", "write"]
+    assert all(seconds >= 0 for seconds in timings.values())
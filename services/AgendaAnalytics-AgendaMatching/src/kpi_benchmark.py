@@ -0,0 +1,222 @@
+##########################################################################################
+###  Benchmark of the KPI calculation on the results of a matching against an agenda
+###  with 169 targets (like the SDGs). Run from the src directory, e.g.
+###
+###  python kpi_benchmark.py --fragments 300
+###
+###  Compares the previous calculation (Excel sheets, row by row) with kpi.calculate
+###  on the Excel sheets, the parquet files and the dataframes of the simcore engine.
+##########################################################################################
+
+import argparse
+import io
+import json
+import time
+import warnings
+from statistics import mean
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+# the app modules are imported in the order of app.main
+from app.db import crud
+from app.api import kpi
+from app.logs.logger import logging_text
+
+# targets per goal of the sustainable development goals, 169 in total
+SDG_TARGETS = [7, 8, 13, 10, 9, 8, 5, 12, 8, 10, 10, 11, 5, 10, 12, 12, 19]
+
+
+def make_results(fragments, sentences, seed=0):
+    # detailed results of one analysis text against every target and the coarse result, as simcore writes them
+    rng = np.random.default_rng(seed)
+    analysis = [f"analysis sentence {i} about water energy and climate." for i in range(fragments)]
+    results = []
+    coarse = []
+    for goal, targets in enumerate(SDG_TARGETS, start=1):
+        for target in range(1, targets + 1):
+            ref_tag = f"sdg.{goal}-{target}.txt"
+            reference = [f"target {goal}.{target} sentence {j}." for j in range(sentences)]
+            values = rng.random((fragments, sentences), dtype=np.float32)
+            values[values < 0.1] = 0.0
+            results.append((f"analysis.txt${ref_tag}.detailed", pd.DataFrame(values, index=analysis, columns=reference)))
+            coarse.append(("analysis.txt", " ".join(analysis), float(rng.random()), ref_tag, " ".join(reference)))
+    results.append(("analysis.txt.coarse", pd.DataFrame(coarse, columns=["ana_tag", "ana_text", "similarity", "ref_tag", "ref_text"])))
+    return results
+
+
+def as_xlsx(rdf):
+    with io.BytesIO() as fh:
+        rdf.to_excel(fh, sheet_name="Similarity_result", engine="xlsxwriter")
+        return fh.getvalue()
+
+
+def as_parquet(rdf):
+    # like simcore: columns by position, their labels in the metadata
+    table = pa.Table.from_pandas(rdf.set_axis([str(i) for i in range(rdf.shape[1])], axis="columns"))
+    metadata = dict(table.schema.metadata)
+    metadata[b"simcore.columns"] = json.dumps(list(rdf.columns)).encode("utf-8")
+    with io.BytesIO() as fh:
+        pq.write_table(table.replace_schema_metadata(metadata), fh, compression="zstd")
+        return fh.getvalue()
+
+
+def normalize(value):
+    # kpi values compared up to float rounding and the order of the level0 aggregates
+    if isinstance(value, float):
+        return "nan" if np.isnan(value) else round(value, 9)
+    if isinstance(value, dict):
+        return {key: normalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [normalize(item) for item in value]
+        if items and isinstance(items[0], dict) and set(items[0]) == {"level0", "similarity"}:
+            items = sorted(items, key=lambda item: item["level0"])
+        return items
+    return value
+
+
+def calculate_legacy(kpi_files, agenda_entity_id):
+    # the previous calculation, kept as baseline
+    try:
+        kpivalue = {
+            "text": {
+                "analysis": [],
+                "reference": []            
+            },
+            "detailed": {
+                "description": "The detailed analysis matches every sentence of the analysis text with every sentence of every reference text. The means of the matching results for every reference text level are represented within the aggregated values (null values are ignored). The raw results are represented within the raw values.", 
+                "mean_per_level0": [],
+                "mean_per_level1": [],
+                "raw_values": []
+                }, 
+            "coarse": {
+                "description": "The coarse analysis matches the whole analysis text with every reference text. The means of the matching results for every reference text level are represented within the aggregated values (null values are ignored).", 
+                "mean_per_level0": [],
+                "mean_per_level1": [],
+            }
+            }
+
+        single = 0
+        list_level0=[]
+        for result in kpi_files:              
+            # detailed calculation (e.g. for analysis.txt$esg.1-3.txt.detailed.xlsx)            
+            if result["filename"].endswith(".detailed.xlsx"):
+                filename = result["filename"]
+                content = result["content_binary"]
+                file_number = filename.split("$")[1].split(".")[1]  
+                level0=file_number.split("-")[0]
+                level1=file_number.split("-")[1]           
+                with io.BytesIO(content) as fh:
+                    df_detailed = pd.io.excel.read_excel(fh, index_col=0)
+                    mean_calc = np.nanmean(df_detailed[df_detailed!=0], axis=1) # do not include null values into the mean calculation - calculate over axis
+                    df_detailed['mean_similarity'] = mean_calc     
+                    df_detailed['fragment'] = range(1, int(len(df_detailed)) + 1)                  
+                    for index , row in df_detailed.iterrows():
+                        kpivalue["detailed"]["raw_values"].append({"level0":level0, "level1":level1, "fragment": int(row["fragment"]), "similarity":row["mean_similarity"]})
+                        # fill text analysis only once in kpivalue
+                        if single == 0:
+                            ana_text = ILLEGAL_CHARACTERS_RE.sub('_',str(index))  
+                            kpivalue["text"]["analysis"].append({"fragment":int(row["fragment"]), "text": ana_text})                    
+                    target_mean = np.nanmean(df_detailed['mean_similarity']) # do not include nan values into the mean calculation (e.g. when mean of fragment results to np.nan, 0 is not possible since fragment mean is only calculated on not null)
+                    target_mean = (target_mean if target_mean is not np.nan else "None") # scorpio does not accept np.nan 
+                    kpivalue["detailed"]["mean_per_level1"].append({"level0":level0, "level1":level1, "similarity": target_mean})
+                    single = 1    
+                list_level0.append(level0)                         
+            
+            # coarse calculation  
+            elif result["filename"]=="analysis.txt.coarse.xlsx":
+                content = result["content_binary"]
+                with io.BytesIO(content) as fh:
+                    df_coarse = pd.read_excel(fh, engine='openpyxl')    
+                    # loop over all rows in df_coarse to identify similarity for each target
+                    for _ , row in df_coarse.iterrows():  
+                        file_number=row["ref_tag"].split(".")[1]
+                        level0=file_number.split("-")[0]
+                        level1=file_number.split("-")[1]
+                        target_name=row["ref_tag"].split(".")[0]  
+                        target_text = row["ref_text"]
+                        kpivalue["text"]["reference"].append({"title": target_name, "level0": level0 , "level1": level1, "text": target_text})                                 
+                        kpivalue["coarse"]["mean_per_level1"].append({"level0":level0, "level1":level1, "similarity": (row["similarity"] if row["similarity"]!=0 else "None")})  # scorpio does not accept np.nan                 
+            else:
+                continue             
+            
+        # try to fill aggregated values        
+        list_level0 = list(set(list_level0))            
+        sim_per_level0_detailed ={}
+        for x in list_level0:
+            sim_per_level0_detailed[x]=[]
+        for value in kpivalue["detailed"]["mean_per_level1"]:
+            level0 = value["level0"]
+            sim_per_level0_detailed[value["level0"]].append(value["similarity"])          
+        for x in list_level0:               
+            try:
+                mean_value_detailed = mean(d for d in sim_per_level0_detailed[x] if d is not np.nan) 
+            except:
+                mean_value_detailed = "None"   # scorpio does not accept None          
+            kpivalue["detailed"]["mean_per_level0"].append({"level0":x, "similarity": mean_value_detailed})    
+
+        sim_per_level0_coarse ={}
+        for x in list_level0:
+            sim_per_level0_coarse[x]=[]
+        for value in kpivalue["coarse"]["mean_per_level1"]:
+            level0 = value["level0"]
+            sim_per_level0_coarse[value["level0"]].append(value["similarity"])          
+        for x in list_level0:              
+            try:
+                mean_value_coarse = mean(d for d in sim_per_level0_coarse[x] if d is not np.nan) 
+            except:
+                mean_value_coarse = "None"    # scorpio does not accept None                 
+            kpivalue["coarse"]["mean_per_level0"].append({"level0":x, "similarity": mean_value_coarse})        
+    
+    
+    except Exception as e:
+        logging_text.info(e)
+    
+    return kpivalue
+
+
+def timed(label, func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = func()
+        times.append(time.perf_counter() - start)
+    print(f"{label:<32} {min(times):>9.3f}s")
+    return value, min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark of the KPI calculation")
+    parser.add_argument("--fragments", type=int, default=300, help="sentences of the analysis text")
+    parser.add_argument("--sentences", type=int, default=3, help="sentences per agenda target")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = make_results(args.fragments, args.sentences)
+    print(f"{len(results) - 1} targets, {args.fragments} analysis sentences, {args.sentences} sentences per target")
+    xlsx_files = [{"filename": f"{name}.xlsx", "content_binary": as_xlsx(rdf)} for name, rdf in results]
+    parquet_files = [{"filename": f"{name}.parquet", "content_binary": as_parquet(rdf)} for name, rdf in results]
+    engine_files = [{"filename": f"{name}.parquet", "content_binary": b"", "dataframe": rdf} for name, rdf in results]
+
+    # the previous calculation warns about fragments without any match
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        baseline, t_baseline = timed("previous (xlsx, row by row)", lambda: calculate_legacy(xlsx_files, "sdg"), 1)
+    candidates = [
+        ("kpi.calculate (xlsx)", xlsx_files),
+        ("kpi.calculate (parquet)", parquet_files),
+        ("kpi.calculate (engine dataframes)", engine_files),
+    ]
+    expected = normalize(baseline)
+    for label, files in candidates:
+        value, t = timed(label, lambda: kpi.calculate(files, "sdg"), args.repeat)
+        json.dumps(value)
+        same = normalize(value) == expected
+        print(f"{'':<32} speedup {t_baseline / t:>6.1f}x, {'same' if same else 'DIFFERENT'} kpi value")
+
+
+if __name__ == "__main__":
+    main()
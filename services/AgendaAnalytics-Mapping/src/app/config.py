@@ -1,9 +1,9 @@
-from dynaconf import Dynaconf
-import os
-
-current_directory = os.path.dirname(os.path.realpath(__file__))
-
-settings = Dynaconf(
-    envvar_prefix="DYNACONF",  
-    settings_files=[f"{current_directory}/settings.yaml", f"{current_directory}/.secrets.yaml"],  # Loads files in the given order.
+from dynaconf import Dynaconf
+import os
+
+current_directory = os.path.dirname(os.path.realpath(__file__))
+
+settings = Dynaconf(
+    envvar_prefix="DYNACONF",  
+    settings_files=[f"{current_directory}/settings.yaml", f"{current_directory}/.secrets.yaml"],  # Loads files in the given order.
 )
\ No newline at end of file
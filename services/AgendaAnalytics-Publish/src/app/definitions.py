@@ -1,11 +1,11 @@
-# definition of constants for runtime improvement and better reading comprehension
-
-RESPONSE_400 = "400-Bad Request"
-RESPONSE_409 = "409-Already Exists."
-RESPONSE_201 = "201-Created."
-RESPONSE_204 = "204-No Content."
-RESPONSE_207 = "207-Not Updated."
-MESSAGE_SUCCESS = "Success."
-MESSAGE_ERROR = "Error."
-MESSAGE_CLIENT_ERROR = "Client Error."
+# definition of constants for runtime improvement and better reading comprehension
+
+RESPONSE_400 = "400-Bad Request"
+RESPONSE_409 = "409-Already Exists."
+RESPONSE_201 = "201-Created."
+RESPONSE_204 = "204-No Content."
+RESPONSE_207 = "207-Not Updated."
+MESSAGE_SUCCESS = "Success."
+MESSAGE_ERROR = "Error."
+MESSAGE_CLIENT_ERROR = "Client Error."
 NGSI_API_ENTITIES = "/ngsi-ld/v1/entities"
\ No newline at end of file
@@ -1,4 +1,12 @@
+import os
 from abc import ABC, abstractmethod
+from dynaconf import settings
+from simcore_api_schema_mod import Status
+
+from handlers.corpus_handler_mod import corpora
+
+ANAFOLDERNAME = settings.ANAFOLDERNAME
+RESFOLDERNAME = settings.RESFOLDERNAME
 #from typing import List, Optional
 
 class AbstractHandler(ABC):
@@ -11,11 +19,65 @@ class AbstractHandler(ABC):
     def __init__(self):
         return
 
+    @staticmethod
+    def read_texts(folder:str):
+        """
+        read all texts of a project folder exactly once and return them
+        as a list of (filename, text) tuples. Empty texts are omitted.
+        """
+        texts = list()
+        for filename in os.listdir(folder):
+            with open(os.path.join(folder, filename), "r") as f:
+                text = f.read()
+            if not text:
+                continue
+            texts.append((filename, text))
+        return texts
+
+    @staticmethod
+    def get_reference(project:str):
+        """
+        folder of the reference texts of a project and the embedding
+        store for them, to be used as context manager. Projects attached
+        to a registered corpus use its texts and precomputed embeddings.
+        """
+        return corpora.resolve_reference(project)
+
+    def analyze_project(self, project:str, progress=None):
+        """
+        analyze the texts of a project folder and write the results
+        into its result folder. progress is an optional callback
+        progress(done, total) counting the analyzed pairs of documents
+        """
+        anadir = os.path.join(project, ANAFOLDERNAME)
+        root = os.path.join(project, RESFOLDERNAME)
+        #
+        # every text is read exactly once. Results are written
+        # as soon as they are generated.
+        #
+        generated_files = []
+        with self.get_reference(project) as (refdir, refstore):
+            for name, tag, rdf in self.analyze_texts(self.read_texts(anadir), self.read_texts(refdir), refstore, progress):
+                generated_files += self.writer.write_result_file(rdf, root=root, name=name, tag=tag)
+
+        s = Status.SUCCESS
+        m = f"{project} analysis done."
+        d = {"generated_files": generated_files}
+        return s, m, d
+
     #
     # these methods are to be implemented by the derived classes
     #
 
     @abstractmethod
-    def analyze_project(self, project:str):
+    def analyze_texts(self, anatexts, reftexts, refstore=None, progress=None):
+        """
+        analyze the analysis texts against the reference texts, both
+        given as lists of (filename, text) tuples, and yield the results
+        as (name, tag, dataframe) tuples. refstore is the embedding store
+        of the reference texts (None for the shared store), progress is
+        an optional callback progress(done, total) counting the analyzed
+        pairs of documents
+        """
         pass
     
@@ -0,0 +1,45 @@
+import os
+import logging
+import torch
+from dynaconf import settings
+
+from handlers.coarse_handler_mod import CoarseHandler
+
+CHUNK_TOKENS = settings.CHUNK_TOKENS
+MAX_CHUNKS = settings.MAX_CHUNKS
+CHUNK_BATCH_SIZE = settings.CHUNK_BATCH_SIZE
+CHUNK_POOLING = settings.CHUNK_POOLING
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+
+class CoarseChunkedHandler(CoarseHandler):
+    """
+    Coarse handler for long documents. Instead of letting the
+    transformer truncate a document after its first (mainly) 512 tokens
+    every document is split into token windows. All windows of all
+    documents are embedded in one batched call and then pooled into
+    one vector per document. The results are written in the coarse
+    format and can be visualized as such.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.tag = "coarse"
+        return
+
+    ###################################################
+    #
+    # embed whole documents by pooling over the
+    # embeddings of their chunks
+    #
+    def embed_documents(self, texts, store=None):
+        chunked = [self.nlpcore.chunk_document(text, CHUNK_TOKENS, MAX_CHUNKS) for text in texts]
+        logger.info(f"Chunks per document: {[len(chunks) for chunks in chunked]}")
+        #
+        # the chunks of a document are stored like the sentences
+        # of a detailed corpus. Pooling is not part of the key.
+        #
+        split = f"chunks-{CHUNK_TOKENS}-{MAX_CHUNKS}"
+        embeddings = self.nlpcore.embed_corpora(chunked, split=split, batch_size=CHUNK_BATCH_SIZE, store=store)
+        return torch.stack([self.nlpcore.pool_embeddings(emb, CHUNK_POOLING) for emb in embeddings])
@@ -0,0 +1,75 @@
+import os
+import logging
+import torch
+
+from handlers.coarse_handler_mod import CoarseHandler
+from handlers.detailed_handler_mod import DetailedHandler
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+
+class CoarseDetailedHandler(DetailedHandler):
+    """
+    Handler class that runs the coarse and the detailed analysis in a
+    single pass. The texts are read once, and the whole documents for
+    the coarse analysis as well as the unique sentences for the detailed
+    analysis go through one encoder pass where they share the length
+    buckets and batches. Both result sets are written as the coarse and
+    the detailed handler would write them, such that their visualizers
+    work unchanged.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.coarse = CoarseHandler()
+        return
+
+    ###################################################
+    #
+    # analyze texts given as (filename, text) tuples and
+    # yield the coarse and then the detailed results
+    #
+    def analyze_texts(self, anatexts, reftexts, refstore=None, progress=None):
+
+        ana_items = self.make_corpora(anatexts)
+        ref_items = self.make_corpora(reftexts)
+        #
+        # the coarse analysis compares all texts, the detailed one only
+        # those whose sentence corpora did not remain empty
+        #
+        do_coarse = bool(anatexts and reftexts)
+        do_detailed = bool(ana_items and ref_items)
+        coarse_total = len(anatexts) * len(reftexts) if do_coarse else 0
+        detailed_total = len(ana_items) * len(ref_items) if do_detailed else 0
+
+        groups = list()
+        if do_coarse:
+            groups.append(([[text] for _, text in anatexts], "document", None))
+            groups.append(([[text] for _, text in reftexts], "document", refstore))
+        if do_detailed:
+            ana_group, ana_inverses = self.collapsed_group([corpus for _, corpus in ana_items])
+            ref_group, ref_inverses = self.collapsed_group([corpus for _, corpus in ref_items], refstore)
+            groups += [ana_group, ref_group]
+
+        print(f"doing sim for {len(anatexts)} analysis against {len(reftexts)} reference texts")
+        embeddings = self.nlpcore.embed_groups(groups) if groups else []
+
+        simmat = None
+        if do_coarse:
+            ana_docs, ref_docs = embeddings[:2]
+            embeddings = embeddings[2:]
+            simmat = self.nlpcore.gen_sim_matrix(torch.cat(ana_docs), torch.cat(ref_docs))
+            if progress:
+                progress(coarse_total, coarse_total + detailed_total)
+        yield from self.coarse.make_results(anatexts, reftexts, simmat)
+
+        if do_detailed:
+            ana_embeds = list(zip(embeddings[0], ana_inverses))
+            ref_embeds = list(zip(embeddings[1], ref_inverses))
+            #
+            # the detailed pairs are counted after the coarse ones
+            #
+            detailed_progress = None
+            if progress:
+                detailed_progress = lambda done, total: progress(coarse_total + done, coarse_total + total)
+            yield from self.make_results(ana_items, ref_items, ana_embeds, ref_embeds, detailed_progress)
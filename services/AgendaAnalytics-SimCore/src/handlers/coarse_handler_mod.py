@@ -1,17 +1,12 @@
 import os
 import logging
 import pandas as pd
-from dynaconf import settings
-from simcore_api_schema_mod import Status
+import torch
 
 from nlpcore.nlpcore_mod import NLPCore
 from utils.resultwriter_mod import Resultwriter
 from handlers.abstract_handler_mod import AbstractHandler
 
-REFFOLDERNAME = settings.REFFOLDERNAME
-ANAFOLDERNAME = settings.ANAFOLDERNAME
-RESFOLDERNAME = settings.RESFOLDERNAME
-
 logger = logging.getLogger(os.path.basename(__file__))
 
 
@@ -32,95 +27,62 @@ class CoarseHandler(AbstractHandler):
 
     ###################################################
     #
-    # analyze project. project folder is relative to
-    # the project ROOT.
+    # embed whole documents. Each document is a corpus
+    # of its own in the embedding store such that
+    # known documents are not encoded again.
     #
-    def analyze_project(self, project: str):
+    def embed_documents(self, texts, store=None):
+        embeddings = self.nlpcore.embed_corpora([[text] for text in texts], split="document", store=store)
+        return torch.cat(embeddings)
+
+    ###################################################
+    #
+    # analyze texts given as (filename, text) tuples
+    # and yield one result per analysis text
+    #
+    def analyze_texts(self, anatexts, reftexts, refstore=None, progress=None):
 
         #
-        # keep track of generated files
-        #
-        generated_files = []
-        #
-        # loop over the files in the reference and analysis folder
+        # all analysis and all reference texts are embedded in large
+        # batches, each of them exactly once. The full matrix of
+        # analysis x reference similarities is then computed in one go.
         #
-        anadir = os.path.join(project, ANAFOLDERNAME)
-        refdir = os.path.join(project, REFFOLDERNAME)
+        simmat = None
+        if anatexts and reftexts:
+            print(f"doing sim for {len(anatexts)} analysis against {len(reftexts)} reference texts")
+            ana_embeds = self.embed_documents([text for _, text in anatexts])
+            ref_embeds = self.embed_documents([text for _, text in reftexts], refstore)
+            simmat = self.nlpcore.gen_sim_matrix(ana_embeds, ref_embeds)
+            assert simmat.shape == (len(anatexts), len(reftexts))
+            if progress:
+                progress(simmat.size, simmat.size)
+
+        yield from self.make_results(anatexts, reftexts, simmat)
 
-        anafiles = os.listdir(anadir)
-        reffiles = os.listdir(refdir)
+    ###################################################
+    #
+    # one result per analysis text from the matrix of
+    # analysis x reference similarities
+    #
+    def make_results(self, anatexts, reftexts, simmat):
 
-        for anafile in anafiles:
+        for i, (anafile, anatext) in enumerate(anatexts):
             #
-            # for each company text we generate a birds-eye analysis
+            # for each company text we generate a birds-eye analysis.
+            # Add the current analysis text results to the corresponding
+            # result list. It was asked by the users that the texts not be
+            # truncated!
             #
-            absanafile = os.path.join(anadir, anafile)
-            anatext = ""
-            with open(absanafile, "r") as f:
-                anatext = f.read()
-                if not anatext:
-                    continue
-
             resultlist = list()
-            for reffile in reffiles:
-
-                absreffile = os.path.join(refdir, reffile)
-                reftext = ""
-                with open(absreffile, "r") as f:
-                    reftext = f.read()
-                    if not reftext:
-                        continue
-
-                print("doing sim for ", absanafile, "against", absreffile)
-
-                #
-                # the "corpus" here consists of only two texts, namely
-                # one reference and one analysis text.
-                # The result for all references and one analysis text
-                # is collected and written out
-                #
-                mini_corpus = [anatext, reftext]
-                #
-                # embed the 'corpus' and compute similarity
-                #
-                embeddings = self.nlpcore.embed_corpus(mini_corpus)
-                assert embeddings.shape[0] == 2  # we only have two 'sentences'
-                smat = self.nlpcore.gen_sim_matrix(embeddings[0], embeddings[1])
-                assert smat.shape == (1, 1)
-
-                #
-                # add the current analysis text results to the corresponding
-                # result list. It was asked by the users that the texts not be
-                # truncated!
-                #
-                data_tuple = (anafile, anatext, smat.item(), reffile, reftext)
+            for j, (reffile, reftext) in enumerate(reftexts):
+                data_tuple = (anafile, anatext, simmat[i, j].item(), reffile, reftext)
                 resultlist.append(data_tuple)
             #
             # here we have done analysis for all reference files and ONE analysis file.
-            # We generate the dataframe and write it out.
+            # We generate the dataframe and hand it out.
             #
             similarity_df = pd.DataFrame(
                 data=resultlist,
                 columns=["ana_tag", "ana_text", "similarity", "ref_tag", "ref_text"],
             )
-            #
-            # serialize dataframe in the joblib format.
-            # Always write an Excel sheet in addition where
-            # the filename ending is "self.tag.xlsx"
-            #
-            g = self.writer.write_result_file(
-                similarity_df,
-                root=os.path.join(project, RESFOLDERNAME),
-                # name=".".join([anafile, reffile]),
-                name=anafile,
-                tag=self.tag,
-            )
-            #
-            # add generated files as their names to the file list returned to caller.
-            #
-            generated_files += g
-
-        s = Status.SUCCESS
-        m = f"{project} analysis done."
-        d = {"generated_files": generated_files}
-        return s, m, d
+            yield anafile, self.tag, similarity_df
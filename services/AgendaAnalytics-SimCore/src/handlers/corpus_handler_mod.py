@@ -0,0 +1,300 @@
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import string
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from dynaconf import settings
+
+from nlpcore.embedding_store_mod import EmbeddingStore
+
+CORPUSFOLDER = settings.CORPUSFOLDER
+REFFOLDERNAME = settings.REFFOLDERNAME
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+
+class CorpusHandler:
+    """
+    This class manages named reference corpora that are registered once
+    and then attached to any number of projects instead of uploading the
+    same reference texts again. A corpus is stored in versions named by
+    the hash of its content:
+
+        corpora/<corpus_id>/corpus.json              current version and metadata
+        corpora/<corpus_id>/corpus.lock              lock shared by all worker processes
+        corpora/<corpus_id>/<version>/texts          the reference texts
+        corpora/<corpus_id>/<version>/embeddings     its own embedding store
+        corpora/<corpus_id>/<version>/leases         one file per reader of the version
+
+    The embeddings of a version are never evicted. Registering changed
+    content creates a new version and supersedes the previous one. A
+    superseded version stays readable as long as an analysis started
+    on it holds a lease and is deactivated together with its embeddings
+    once the last lease is returned.
+    """
+
+    def __init__(self, root=CORPUSFOLDER):
+        self.root = root
+        self.stores = dict()
+        self.lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+        return
+
+    # ---------------------------------------------------------------------------
+    @contextmanager
+    def locked(self, corpus_id:str):
+        """
+        exclusive lock of a corpus. It is a file lock such that the
+        worker processes of the REST API (and the threads within them,
+        every call opens the lock file anew) register and read versions
+        one after the other.
+        """
+        folder = os.path.join(self.root, corpus_id)
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, "corpus.lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def valid_corpus_id(corpus_id:str) -> bool:
+        return re.fullmatch(r"[A-Za-z0-9][A-Za-z0-9_.-]*", corpus_id) is not None
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def text_name(filename:str):
+        """
+        the name under which an uploaded file is stored: its base name,
+        such that no entry can be written outside the folder. Hidden
+        files (.gitkeep, .DS_Store) and empty names give None.
+        """
+        name = os.path.basename(filename.replace("\\", "/"))
+        if not name or name.startswith("."):
+            return None
+        return name
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def content_hash(folder:str) -> str:
+        """
+        hash over the names and contents of all texts of a folder.
+        Clients can compute the same hash to find out whether their
+        files differ from the registered corpus:
+        sha256 over "<name>\\0<sha256 of content>\\n" for all files sorted by name,
+        hidden files are left out like they are skipped on upload
+        """
+        h = hashlib.sha256()
+        for filename in sorted(filter(CorpusHandler.text_name, os.listdir(folder))):
+            with open(os.path.join(folder, filename), "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            h.update(f"{filename}\0{digest}\n".encode("utf-8"))
+        return h.hexdigest()
+
+    # ---------------------------------------------------------------------------
+    def get_meta(self, corpus_id:str):
+        path = os.path.join(self.root, corpus_id, "corpus.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    # ---------------------------------------------------------------------------
+    def stage(self, corpus_id:str) -> str:
+        """
+        create an empty texts folder for a new version of a corpus.
+        The version is named once its content is known, see commit.
+        """
+        nonce = "".join(random.choices(string.ascii_lowercase, k=16))
+        stagedir = os.path.join(self.root, corpus_id, "staging-" + nonce)
+        os.makedirs(os.path.join(stagedir, REFFOLDERNAME))
+        return os.path.join(stagedir, REFFOLDERNAME)
+
+    # ---------------------------------------------------------------------------
+    def put_meta(self, corpus_id:str, meta):
+        #
+        # the metadata is replaced atomically such that projects
+        # always see either the old or the new version
+        #
+        path = os.path.join(self.root, corpus_id, "corpus.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+        return
+
+    # ---------------------------------------------------------------------------
+    def commit(self, corpus_id:str, textdir:str):
+        """
+        make the staged texts the current version of the corpus. If the
+        content did not change the registered version and its embeddings
+        are kept. Returns the metadata and whether the content changed.
+        """
+        stagedir = os.path.dirname(textdir)
+        content_hash = self.content_hash(textdir)
+        with self.locked(corpus_id):
+            meta = self.get_meta(corpus_id)
+            if meta is not None and meta["content_hash"] == content_hash:
+                self.deactivate(stagedir)
+                return meta, False
+
+            version = content_hash[:16]
+            versiondir = os.path.join(self.root, corpus_id, version)
+            if os.path.exists(versiondir):
+                #
+                # the content of a superseded version that is still
+                # being read comes back, it is current again
+                #
+                self.deactivate(stagedir)
+            else:
+                os.rename(stagedir, versiondir)
+            superseded = meta.get("superseded", []) + [meta["version"]] if meta is not None else []
+            new_meta = {
+                "corpus_id": corpus_id,
+                "content_hash": content_hash,
+                "version": version,
+                "files": sorted(os.listdir(os.path.join(versiondir, REFFOLDERNAME))),
+                "registered_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "superseded": [v for v in superseded if v != version],
+            }
+            self.put_meta(corpus_id, new_meta)
+            new_meta = self.retire(corpus_id)
+        logger.info(f"Corpus {corpus_id} registered in version {version}")
+        return new_meta, True
+
+    # ---------------------------------------------------------------------------
+    @contextmanager
+    def reading(self, corpus_id:str):
+        """
+        the folder of the current version of a corpus, which is kept
+        readable until the block is left even if a new version is
+        registered in the meantime
+        """
+        with self.locked(corpus_id):
+            versiondir = self.get_version_dir(corpus_id)
+            if versiondir is None:
+                raise FileNotFoundError(f"Corpus {corpus_id} is not registered")
+            lease = os.path.join(versiondir, "leases", f"{os.getpid()}-{uuid.uuid4().hex}")
+            os.makedirs(os.path.dirname(lease), exist_ok=True)
+            open(lease, "w").close()
+        try:
+            yield versiondir
+        finally:
+            with self.locked(corpus_id):
+                os.remove(lease)
+                self.retire(corpus_id)
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def has_readers(versiondir:str) -> bool:
+        """
+        whether a live process holds a lease of the version. Leases of
+        processes that died are removed.
+        """
+        folder = os.path.join(versiondir, "leases")
+        if not os.path.isdir(folder):
+            return False
+        readers = False
+        for name in os.listdir(folder):
+            try:
+                os.kill(int(name.split("-")[0]), 0)
+                readers = True
+            except PermissionError:
+                readers = True
+            except (ProcessLookupError, ValueError):
+                os.remove(os.path.join(folder, name))
+        return readers
+
+    # ---------------------------------------------------------------------------
+    def retire(self, corpus_id:str):
+        """
+        deactivate the superseded versions of a corpus that nobody reads
+        any more. Has to be called under the lock of the corpus. Returns
+        the updated metadata.
+        """
+        meta = self.get_meta(corpus_id)
+        if meta is None or not meta.get("superseded"):
+            return meta
+        kept = list()
+        for version in meta["superseded"]:
+            versiondir = os.path.join(self.root, corpus_id, version)
+            if self.has_readers(versiondir):
+                kept.append(version)
+                continue
+            with self.lock:
+                self.stores.pop(versiondir, None)
+            self.deactivate(versiondir)
+            logger.info(f"Superseded version {version} of corpus {corpus_id} deactivated")
+        if kept != meta["superseded"]:
+            meta["superseded"] = kept
+            self.put_meta(corpus_id, meta)
+        return meta
+
+    # ---------------------------------------------------------------------------
+    def deactivate(self, folder:str):
+        """
+        like projects, outdated folders are not removed recursively but
+        deactivated by renaming them with a "$$$" prefix
+        """
+        if os.path.exists(folder):
+            nonce = "$$$" + "".join(random.choices(string.ascii_uppercase + string.ascii_lowercase, k=40))
+            os.rename(folder, os.path.join(os.path.dirname(folder), nonce))
+        return
+
+    # ---------------------------------------------------------------------------
+    def get_version_dir(self, corpus_id:str):
+        meta = self.get_meta(corpus_id)
+        if meta is None:
+            return None
+        return os.path.join(self.root, corpus_id, meta["version"])
+
+    # ---------------------------------------------------------------------------
+    def get_store(self, versiondir:str) -> EmbeddingStore:
+        with self.lock:
+            if versiondir not in self.stores:
+                self.stores[versiondir] = EmbeddingStore(root=os.path.join(versiondir, "embeddings"), max_mb=None)
+            return self.stores[versiondir]
+
+    # ---------------------------------------------------------------------------
+    @contextmanager
+    def resolve_reference(self, project:str):
+        """
+        the reference texts of a project and the embedding store to use
+        for them: the texts of the attached corpus and its store, or the
+        uploaded texts of the project and the shared store (None). The
+        version of the corpus stays readable until the block is left.
+        """
+        corpus_file = os.path.join(project, "corpus.conf")
+        if os.path.exists(corpus_file):
+            with open(corpus_file, "r") as f:
+                corpus_id = f.read()
+            if self.get_meta(corpus_id) is None:
+                raise FileNotFoundError(f"Attached corpus {corpus_id} is not registered")
+            with self.reading(corpus_id) as versiondir:
+                yield os.path.join(versiondir, REFFOLDERNAME), self.get_store(versiondir)
+        else:
+            yield os.path.join(project, REFFOLDERNAME), None
+
+    # ---------------------------------------------------------------------------
+    def list_corpora(self):
+        corpora = list()
+        for corpus_id in sorted(os.listdir(self.root)):
+            meta = self.get_meta(corpus_id)
+            if meta is not None:
+                corpora.append(meta)
+        return corpora
+
+
+#
+# the corpora shared by all handlers of this worker process
+#
+corpora = CorpusHandler()
@@ -1,18 +1,13 @@
 import os
 import logging
+import numpy as np
 import pandas as pd
-from dynaconf import settings
-from simcore_api_schema_mod import Status
 
 from nlpcore.nlpcore_mod import NLPCore
 from utils.resultwriter_mod import Resultwriter
 from utils.preprocessing_mod import Preprocessing
 from handlers.abstract_handler_mod import AbstractHandler
 
-REFFOLDERNAME = settings.REFFOLDERNAME
-ANAFOLDERNAME = settings.ANAFOLDERNAME
-RESFOLDERNAME = settings.RESFOLDERNAME
-
 logger = logging.getLogger(os.path.basename(__file__))
 
 
@@ -32,94 +27,104 @@ class DetailedHandler(AbstractHandler):
 
     ###################################################
     #
-    # analyze project. project folder is relative to
-    # the project ROOT.
+    # split texts into sentence corpora and drop those
+    # that remain empty
     #
-    def analyze_project(self, project: str):
+    def make_corpora(self, texts):
+        corpora = list()
+        for filename, text in texts:
+            corpus = self.prepro.make_corpus_from_text(text)
+            if not corpus:
+                logger.warning(f"Encountered empty corpus for {filename}, check results carefully!")
+                continue
+            corpora.append((filename, corpus))
+        return corpora
+
+    ###################################################
+    #
+    # embed corpora with repeated sentences collapsed.
+    # Per corpus the embeddings of its unique sentences
+    # and the map from sentences to them are returned.
+    #
+    def embed_collapsed(self, corpora, store=None):
+        group, inverses = self.collapsed_group(corpora, store)
+        embeds = self.nlpcore.embed_groups([group])[0]
+        return list(zip(embeds, inverses))
+
+    ###################################################
+    #
+    # the unique sentences of the corpora as a group
+    # for NLPCore.embed_groups and per corpus the map
+    # from its sentences to them
+    #
+    def collapsed_group(self, corpora, store=None):
+        collapsed = [self.prepro.collapse_duplicates(corpus) for corpus in corpora]
+        group = ([unique for unique, _, _ in collapsed], self.prepro.split_tag, store)
+        return group, [inverse for _, inverse, _ in collapsed]
+
+    ###################################################
+    #
+    # analyze texts given as (filename, text) tuples
+    # and yield one result per pair of documents
+    #
+    def analyze_texts(self, anatexts, reftexts, refstore=None, progress=None):
 
         #
-        # keep track of generated files
-        #
-        generated_files = []
-        #
-        # loop over the files in the reference and analysis folder
+        # every document is split into sentences and embedded exactly
+        # once. In the detailed mode it can happen that some corpora
+        # remain empty due to very short sentences. We must not enter
+        # further computations then and omit this document. Filling a
+        # corpus with a default sentence is not advisable because this
+        # could cause a 100% match if, by accident, two such corpora get
+        # to be compared
         #
-        anadir = os.path.join(project, ANAFOLDERNAME)
-        refdir = os.path.join(project, REFFOLDERNAME)
+        ana_items = self.make_corpora(anatexts)
+        ref_items = self.make_corpora(reftexts)
 
-        anafiles = os.listdir(anadir)
-        reffiles = os.listdir(refdir)
-
-        for anafile in anafiles:
+        if ana_items and ref_items:
             #
-            # for each company text we generate a birds-eye analysis
+            # repeated sentences are encoded and compared only once
             #
-            absanafile = os.path.join(anadir, anafile)
-            anatext = ""
-            with open(absanafile, "r") as f:
-                anatext = f.read()
-                if not anatext:
-                    continue
+            ana_embeds = self.embed_collapsed([corpus for _, corpus in ana_items])
+            ref_embeds = self.embed_collapsed([corpus for _, corpus in ref_items], refstore)
+            yield from self.make_results(ana_items, ref_items, ana_embeds, ref_embeds, progress)
 
-            for reffile in reffiles:
+    ###################################################
+    #
+    # one result per pair of documents from the
+    # embeddings of their unique sentences
+    #
+    def make_results(self, ana_items, ref_items, ana_embeds, ref_embeds, progress=None):
 
-                absreffile = os.path.join(refdir, reffile)
-                reftext = ""
-                with open(absreffile, "r") as f:
-                    reftext = f.read()
-                    if not reftext:
-                        continue
+        pairs_total = len(ana_items) * len(ref_items)
+        pairs_done = 0
+        if progress:
+            progress(pairs_done, pairs_total)
 
-                print("doing sim for ", absanafile, "against", absreffile)
+        for (anafile, ana_corpus), (ana_emb, ana_inverse) in zip(ana_items, ana_embeds):
+            #
+            # the similarity matrices of this analysis text against all
+            # reference texts are computed from the cached embeddings
+            # in a single stacked matrix multiply
+            #
+            print("doing sim for ", anafile, "against", len(ref_items), "reference texts")
+            simblocks = self.nlpcore.gen_sim_blocks(ana_emb, [emb for emb, _ in ref_embeds])
 
+            for (reffile, ref_corpus), (_, ref_inverse), simblock in zip(ref_items, ref_embeds, simblocks):
                 #
-                # now generate two corpora consisting of the individual
-                # document sentences.
-                #
-                ana_corpus = self.prepro.make_corpus_from_text(anatext)
-                ref_corpus = self.prepro.make_corpus_from_text(reftext)
-                #
-                # in the detailed mode it can happen that some corpora remain
-                # empty due to very short sentences. We must not enter further
-                # computations then and omit this document. Filling a corpus with
-                # a default sentence is not advisable because this could cause a
-                # 100% match if, by accident, two such corpora get to be compared
+                # expand the matrix of the unique sentences back
+                # to all sentences of both documents
                 #
-                if (not ana_corpus) or (not ref_corpus):
-                    logger.warning(f"Encountered empty ana or ref corpus, check results carefully!")
-                    continue
-                else:
-                    l1 = len(ana_corpus)
-                    l2 = len(ref_corpus)
-                    msg = f"Chunks in analyze/ref corpus: {l1}/{l2}"
-                    logger.info(msg)
-                #
-                # corpora are non-empty. We proceed.
-                #
-                ana_embeds = self.nlpcore.embed_corpus(ana_corpus)
-                ref_embeds = self.nlpcore.embed_corpus(ref_corpus)
-                #
-                #
-                # compute similarity matrix
-                #
-                simarr = self.nlpcore.gen_sim_matrix(ana_embeds, ref_embeds)
+                simarr = simblock[np.ix_(ana_inverse, ref_inverse)]
+                msg = f"Chunks in analyze/ref corpus: {len(ana_corpus)}/{len(ref_corpus)}"
+                logger.info(msg)
                 #
                 # generate a similarity dataframe for this file pair based
                 # on sentences
                 #
                 similarity_df = self.prepro.make_df_from_array(simarr, ana_corpus, ref_corpus)
-                g = self.writer.write_result_file(
-                    similarity_df,
-                    root=os.path.join(project, RESFOLDERNAME),
-                    name="$".join([anafile, reffile]),
-                    tag=self.tag)
-                
-                #
-                # add generated file to main file list
-                #
-                generated_files += g
+                yield "$".join([anafile, reffile]), self.tag, similarity_df
 
-        s = Status.SUCCESS
-        m = f"{project} analysis done."
-        d = {"generated_files": generated_files}
-        return s, m, d
+                pairs_done += 1
+                if progress:
+                    progress(pairs_done, pairs_total)
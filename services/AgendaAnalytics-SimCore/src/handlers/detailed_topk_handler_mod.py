@@ -0,0 +1,110 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from dynaconf import settings
+
+from handlers.detailed_handler_mod import DetailedHandler
+
+TOPK = settings.TOPK
+TOPK_THRESHOLD = settings.TOPK_THRESHOLD
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+
+###################################################
+#
+# expand the rows of the sparse matches of unique
+# sentences back to all sentences. Sentence i gets
+# the matches of unique sentence inverse[i].
+#
+def expand_rows(block, inverse):
+    order = np.argsort(block["rows"], kind="stable")
+    per_unique = np.bincount(block["rows"], minlength=len(block["row_mean"]))
+    starts = np.cumsum(per_unique) - per_unique
+    per_row = per_unique[inverse]
+    offsets = np.arange(per_row.sum()) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+    source = order[np.repeat(starts[inverse], per_row) + offsets]
+    return {
+        "rows": np.repeat(np.arange(len(inverse)), per_row),
+        "cols": block["cols"][source],
+        "values": block["values"][source],
+        "row_mean": block["row_mean"][inverse],
+        "row_max": block["row_max"][inverse],
+    }
+
+
+class DetailedTopkHandler(DetailedHandler):
+    """
+    Handler class that splits the reference and analysis documents
+    into sentences like the detailed handler but does not keep the
+    dense sentence x sentence matrices. Per analysis document it writes
+    the top-k matches of every analysis sentence in every reference
+    document in a compact coordinate form ("topk") and the mean
+    similarity of every analysis sentence per reference document
+    ("topk_means")
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.tag = "topk"
+        return
+
+    ###################################################
+    #
+    # analyze texts given as (filename, text) tuples
+    # and yield two results per analysis text
+    #
+    def analyze_texts(self, anatexts, reftexts, refstore=None, progress=None):
+
+        ana_items = self.make_corpora(anatexts)
+        ref_items = self.make_corpora(reftexts)
+
+        if ana_items and ref_items:
+            ana_embeds = self.embed_collapsed([corpus for _, corpus in ana_items])
+            #
+            # the top-k matches range over all reference sentences. Their
+            # embeddings are expanded from the unique ones without encoding
+            # duplicates again.
+            #
+            ref_embeds = [emb[inverse] for emb, inverse in self.embed_collapsed([corpus for _, corpus in ref_items], refstore)]
+            pairs_total = len(ana_items) * len(ref_items)
+            if progress:
+                progress(0, pairs_total)
+
+            for n, ((anafile, ana_corpus), (ana_emb, ana_inverse)) in enumerate(zip(ana_items, ana_embeds)):
+
+                print("doing sim for ", anafile, "against", len(ref_items), "reference texts")
+                sparse_blocks = self.nlpcore.gen_topk_blocks(ana_emb, ref_embeds, TOPK, TOPK_THRESHOLD)
+                sparse_blocks = [expand_rows(block, ana_inverse) for block in sparse_blocks]
+
+                #
+                # the matches of all reference documents in one
+                # coordinate frame. ana_idx is the row of the analysis
+                # sentence in the means frame, ref_idx the position of the
+                # reference sentence in its document.
+                #
+                matches = list()
+                for (reffile, ref_corpus), block in zip(ref_items, sparse_blocks):
+                    matches.append(pd.DataFrame({
+                        "ref_tag": reffile,
+                        "ana_idx": block["rows"],
+                        "ref_idx": block["cols"],
+                        "similarity": block["values"],
+                        "ref_text": [ref_corpus[i] for i in block["cols"]],
+                    }))
+                topk_df = pd.concat(matches, ignore_index=True)
+
+                #
+                # the row aggregates form a dense but small frame:
+                # analysis sentences x reference documents
+                #
+                means_df = pd.DataFrame(
+                    data={reffile: block["row_mean"] for (reffile, _), block in zip(ref_items, sparse_blocks)},
+                )
+                means_df.index = ana_corpus
+
+                yield anafile, self.tag, topk_df
+                yield anafile, self.tag + "_means", means_df
+                if progress:
+                    progress((n + 1) * len(ref_items), pairs_total)
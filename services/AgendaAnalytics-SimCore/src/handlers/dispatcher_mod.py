@@ -1,254 +1,629 @@
-# - standard imports
-
-import glob
-import logging
-import os
-import string
-import random
-from dynaconf import settings
-
-# - interfaces
-
-from interfaces.handler_interface_mod import HandlerInterface
-from interfaces.visualizer_interface_mod import VisualizerInterface
-
-# - analysis modules
-
-from handlers.coarse_handler_mod import CoarseHandler
-from handlers.detailed_handler_mod import DetailedHandler
-
-# - visualization modules
-
-from visualizers.coarse_visualizer_mod import CoarseVisualizer
-from visualizers.detailed_visualizer_mod import DetailedVisualizer
-
-# - schema definitions
-
-from simcore_api_schema_mod import Status
-
-# - handler classes
-
-NLP_handlers = {"coarse": CoarseHandler,
-                "detailed":DetailedHandler,
-                }
-
-# - visualizer classes
-
-Visualizers = {"coarse": CoarseVisualizer,
-               "detailed":DetailedVisualizer,
-                }
-
-logger = logging.getLogger(os.path.basename(__file__))
-
-#
-# get root of projects (externally configured)
-#
-PROJECTFOLDER = settings.PROJECTFOLDER
-REFFOLDERNAME = settings.REFFOLDERNAME
-ANAFOLDERNAME = settings.ANAFOLDERNAME
-RESFOLDERNAME = settings.RESFOLDERNAME
-
-
-class Dispatcher:
-
-    def __init__(self):
-        """
-        Initialize Dispatcher class that takes calls from the REST API and distributes
-        task accordingly
-        """
-    
-    # ---------------------------------------------------------------------------
-    def create_project(self, project):
-
-        dir_project = os.path.join(PROJECTFOLDER, project)
-        try:
-            # project folder
-            os.makedirs(dir_project, exist_ok=False)
-            # reference folder
-            dir_reference = os.path.join(dir_project, REFFOLDERNAME)
-            os.makedirs(dir_reference)
-            # analysis folder
-            dir_reference = os.path.join(dir_project, ANAFOLDERNAME)
-            os.makedirs(dir_reference)
-            # result folder
-            dir_reference = os.path.join(dir_project, RESFOLDERNAME)
-            os.makedirs(dir_reference)
-
-            s = Status.SUCCESS
-            m = "Temporary folders generated."
-            d = {}
-        except Exception as e:
-            s = Status.FAILED
-            m = f"Problem with temporary file structure: {e}"
-            d = {}
-        return s, m, d
-
-    # ---------------------------------------------------------------------------
-    def purge_project(self, project):
-        dir_project = os.path.join(PROJECTFOLDER, project)
-        if os.path.exists(dir_project):
-            #
-            # we do not recursively remove the tree but deactivate it
-            # by prefixing the name with "$$$"
-            # shutil.rmtree(dir_project)
-            # Recursive delete is very dangerous in case of wrongly
-            # initialized path variables and can destroy user data.
-            # Only activate this if you have totally 
-            # separated file systems (e.g. in a Docker container) 
-            #
-            nonce = ''.join(random.choices(string.ascii_uppercase + string.ascii_lowercase, k=40))
-            nonce = "$$$" + nonce
-            deac_project_name = os.path.join(PROJECTFOLDER, nonce)
-            os.rename(dir_project, deac_project_name)
-            s = Status.SUCCESS
-            m = f"Project {project} deactivated"
-            d = {}
-        else:
-            s = Status.FAILED
-            m = f"Internal error: project folder {project} does not exist!"
-            d = {}
-        return s, m, d
-
-    
-    # ---------------------------------------------------------------------------
-    def set_analyzer(self, token, sc_usecase):
-        if sc_usecase not in NLP_handlers:
-            avail_usecases = ", ".join(list(NLP_handlers.keys()))
-            details = {"available":avail_usecases}
-            return Status.FAILED, f"NLP analyzer {sc_usecase} not implemented", details
-        else:
-            dir_project = os.path.join(PROJECTFOLDER, token, "nlp.conf")
-            with open(dir_project, "w") as f:
-                f.write(sc_usecase)
-            return Status.SUCCESS, f"NLP analyzer set to {sc_usecase}", {}
-
-    # ---------------------------------------------------------------------------
-    def set_visualizer(self, token, sc_visualizer):
-        if sc_visualizer not in Visualizers:
-            avail_usecases = ", ".join(list(Visualizers.keys()))
-            details = {"available":avail_usecases}
-            return Status.FAILED, f"Visualizer {sc_visualizer} not implemented", details
-        else:
-            dir_project = os.path.join(PROJECTFOLDER, token, "vis.conf")
-            with open(dir_project, "w") as f:
-                f.write(sc_visualizer)
-            return Status.SUCCESS, f"Visualizer set to {sc_visualizer}", {}
-
-    # ---------------------------------------------------------------------------
-    def list_task_files(self, project):
-
-        dir_project = os.path.join(PROJECTFOLDER, project)
-
-        if os.path.exists(dir_project):
-
-            results = []
-            for path in glob.glob(f"{dir_project}/**/*", recursive=True):
-                if not os.path.isdir(path):
-                    results.append(path)
-
-            s = Status.SUCCESS
-            m = f"Files of task {project}"
-            d = {"files": results}
-
-        else:
-
-            s = Status.FAILED
-            m = f"Project {project} doess not exist"
-            d = {}
-
-        return s, m, d
-
-    # ---------------------------------------------------------------------------
-    def upload_text(self, project, textfilename, buf, is_reference=False):
-
-        if is_reference:
-            targetfolder = os.path.join(PROJECTFOLDER, project, REFFOLDERNAME)
-        else:
-            targetfolder = os.path.join(PROJECTFOLDER, project, ANAFOLDERNAME)
-
-        if not os.path.exists(targetfolder):
-            s = Status.FAILED
-            m = f"Destination {targetfolder} does not exist. Was the project generated?"
-            d = {}
-            return s, m, d
-
-        target = os.path.join(targetfolder, textfilename)
-        try:
-            with open(target, "wb") as fh:
-                fh.write(buf.getbuffer())
-            s = Status.SUCCESS
-            m = f"File {textfilename} copied to destination {target}"
-            d = {}
-        except Exception as e:
-            s = Status.FAILED
-            m = f"Problem uploading {textfilename}: {e}"
-            d = {}
-        return s, m, d
-
-    # ---------------------------------------------------------------------------
-    def analyze_project(self, project):
-        dir_project = os.path.join(PROJECTFOLDER, project)
-
-        if not os.path.exists(dir_project):
-            s = Status.FAILED
-            m = f"Project {project} does not exist"
-            d = {}
-            return s, m, d
-
-        sc_usecase = "coarse"
-        nlp_config_file = os.path.join(dir_project, "nlp.conf")
-        if os.path.exists(nlp_config_file):
-            with open(nlp_config_file, "r") as f:
-                sc_usecase = f.read()
-        #
-        # invoke specific handler through interface
-        # that deals with the specific analysis
-        #
-        print(f"NLP handler >{sc_usecase}< was selected")
-        hi = HandlerInterface(NLP_handlers[sc_usecase])
-        s, m, d = hi.analyze_project(dir_project)
-        return s, m, d
-
-    # ---------------------------------------------------------------------------
-    def visualize_project(self, project):
-        dir_project = os.path.join(PROJECTFOLDER, project)
-
-        if not os.path.exists(dir_project):
-            s = Status.FAILED
-            m = f"Project {project} does not exist"
-            d = {}
-            return s, m, d
-        
-        sc_visualizer = "coarse"
-        vis_config_file = os.path.join(dir_project, "vis.conf")
-        if os.path.exists(vis_config_file):
-            with open(vis_config_file, "r") as f:
-                sc_visualizer = f.read()
-
-        #
-        # invoke specific visualizer through interface
-        # that reads the pandas dataframes
-        # generated by the NLP analysis module.
-        #
-        vi = VisualizerInterface(Visualizers[sc_visualizer])
-        s, m, d = vi.visualize_project(dir_project)
-        return s, m, d
-
-    # ---------------------------------------------------------------------------
-    def download_file(self, absfilename):
-        if not os.path.exists(absfilename):
-            s = Status.FAILED
-            m = f"File {absfilename} not found in task."
-            d = {}
-        else:
-            s = Status.SUCCESS
-            m = f"File {absfilename} found."
-            onlyfilename = os.path.basename(absfilename)
-            d = {
-                "file_location": absfilename,
-                "media_type": "application/octet-stream",
-                "filename": onlyfilename,
-            }
-        return s, m, d
-
-    
\ No newline at end of file
+# - standard imports
+
+import glob
+import logging
+import os
+import shutil
+import string
+import random
+import tarfile
+import zipfile
+import zlib
+from dynaconf import settings
+
+# - interfaces
+
+from interfaces.handler_interface_mod import HandlerInterface
+from interfaces.visualizer_interface_mod import VisualizerInterface
+
+# - analysis modules
+
+from handlers.coarse_handler_mod import CoarseHandler
+from handlers.coarse_chunked_handler_mod import CoarseChunkedHandler
+from handlers.detailed_handler_mod import DetailedHandler
+from handlers.detailed_topk_handler_mod import DetailedTopkHandler
+from handlers.coarse_detailed_handler_mod import CoarseDetailedHandler
+from handlers.corpus_handler_mod import corpora
+
+# - visualization modules
+
+from visualizers.coarse_visualizer_mod import CoarseVisualizer
+from visualizers.detailed_visualizer_mod import DetailedVisualizer, heatmap_pool
+from visualizers.detailed_overview_visualizer_mod import DetailedOverviewVisualizer
+
+# - shared models
+
+from nlpcore.model_registry_mod import registry
+from nlpcore.embedding_store_mod import store
+
+# - result formats
+
+from utils.resultwriter_mod import Resultwriter, EXPORT_FORMATS
+
+# - schema definitions
+
+from simcore_api_schema_mod import Status
+
+# - handler classes
+
+NLP_handlers = {"coarse": CoarseHandler,
+                "coarse_chunked": CoarseChunkedHandler,
+                "detailed":DetailedHandler,
+                "detailed_topk":DetailedTopkHandler,
+                "coarse+detailed":CoarseDetailedHandler,
+                }
+
+# - visualizer classes
+
+Visualizers = {"coarse": CoarseVisualizer,
+               "detailed":DetailedVisualizer,
+               "detailed_overview":DetailedOverviewVisualizer,
+                }
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+#
+# get root of projects (externally configured)
+#
+PROJECTFOLDER = settings.PROJECTFOLDER
+REFFOLDERNAME = settings.REFFOLDERNAME
+ANAFOLDERNAME = settings.ANAFOLDERNAME
+RESFOLDERNAME = settings.RESFOLDERNAME
+WARMUP_MODELS = settings.WARMUP_MODELS
+
+
+class Dispatcher:
+
+    def __init__(self):
+        """
+        Initialize Dispatcher class that takes calls from the REST API and distributes
+        task accordingly
+        """
+    
+    # ---------------------------------------------------------------------------
+    def create_project(self, project):
+
+        dir_project = os.path.join(PROJECTFOLDER, project)
+        try:
+            # project folder
+            os.makedirs(dir_project, exist_ok=False)
+            # reference folder
+            dir_reference = os.path.join(dir_project, REFFOLDERNAME)
+            os.makedirs(dir_reference)
+            # analysis folder
+            dir_reference = os.path.join(dir_project, ANAFOLDERNAME)
+            os.makedirs(dir_reference)
+            # result folder
+            dir_reference = os.path.join(dir_project, RESFOLDERNAME)
+            os.makedirs(dir_reference)
+
+            s = Status.SUCCESS
+            m = "Temporary folders generated."
+            d = {}
+        except Exception as e:
+            s = Status.FAILED
+            m = f"Problem with temporary file structure: {e}"
+            d = {}
+        return s, m, d
+
+    # ---------------------------------------------------------------------------
+    def purge_project(self, project):
+        dir_project = os.path.join(PROJECTFOLDER, project)
+        if os.path.exists(dir_project):
+            #
+            # we do not recursively remove the tree but deactivate it
+            # by prefixing the name with "$$$"
+            # shutil.rmtree(dir_project)
+            # Recursive delete is very dangerous in case of wrongly
+            # initialized path variables and can destroy user data.
+            # Only activate this if you have totally 
+            # separated file systems (e.g. in a Docker container) 
+            #
+            nonce = ''.join(random.choices(string.ascii_uppercase + string.ascii_lowercase, k=40))
+            nonce = "$$$" + nonce
+            deac_project_name = os.path.join(PROJECTFOLDER, nonce)
+            os.rename(dir_project, deac_project_name)
+            s = Status.SUCCESS
+            m = f"Project {project} deactivated"
+            d = {"deactivated_folder": deac_project_name}
+        else:
+            s = Status.FAILED
+            m = f"Internal error: project folder {project} does not exist!"
+            d = {}
+        return s, m, d
+
+    
+    # ---------------------------------------------------------------------------
+    def set_analyzer(self, token, sc_usecase):
+        if sc_usecase not in NLP_handlers:
+            avail_usecases = ", ".join(list(NLP_handlers.keys()))
+            details = {"available":avail_usecases}
+            return Status.FAILED, f"NLP analyzer {sc_usecase} not implemented", details
+        else:
+            dir_project = os.path.join(PROJECTFOLDER, token, "nlp.conf")
+            with open(dir_project, "w") as f:
+                f.write(sc_usecase)
+            return Status.SUCCESS, f"NLP analyzer set to {sc_usecase}", {}
+
+    # ---------------------------------------------------------------------------
+    def set_visualizer(self, token, sc_visualizer):
+        if sc_visualizer not in Visualizers:
+            avail_usecases = ", ".join(list(Visualizers.keys()))
+            details = {"available":avail_usecases}
+            return Status.FAILED, f"Visualizer {sc_visualizer} not implemented", details
+        else:
+            dir_project = os.path.join(PROJECTFOLDER, token, "vis.conf")
+            with open(dir_project, "w") as f:
+                f.write(sc_visualizer)
+            return Status.SUCCESS, f"Visualizer set to {sc_visualizer}", {}
+
+    # ---------------------------------------------------------------------------
+    def set_callback(self, token, callback_url):
+        dir_project = os.path.join(PROJECTFOLDER, token, "callback.conf")
+        with open(dir_project, "w") as f:
+            f.write(callback_url)
+        return Status.SUCCESS, f"Callback set to {callback_url}", {}
+
+    # ---------------------------------------------------------------------------
+    def get_callback(self, token):
+        callback_file = os.path.join(PROJECTFOLDER, token, "callback.conf")
+        if not os.path.exists(callback_file):
+            return None
+        with open(callback_file, "r") as f:
+            return f.read()
+
+    # ---------------------------------------------------------------------------
+    def list_task_files(self, project):
+
+        dir_project = os.path.join(PROJECTFOLDER, project)
+
+        if os.path.exists(dir_project):
+
+            results = []
+            for path in glob.glob(f"{dir_project}/**/*", recursive=True):
+                if not os.path.isdir(path):
+                    results.append(path)
+
+            s = Status.SUCCESS
+            m = f"Files of task {project}"
+            d = {"files": results}
+
+        else:
+
+            s = Status.FAILED
+            m = f"Project {project} doess not exist"
+            d = {}
+
+        return s, m, d
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def get_text_folder(project, is_reference=False):
+        if is_reference:
+            return os.path.join(PROJECTFOLDER, project, REFFOLDERNAME)
+        return os.path.join(PROJECTFOLDER, project, ANAFOLDERNAME)
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def write_text(targetfolder, textfilename, fileobj):
+        """
+        stream a file object into the folder in chunks. Only the base
+        name of the file is used such that no entry can be written
+        outside the folder. Returns the per-file result.
+        """
+        name = corpora.text_name(textfilename)
+        if name is None:
+            return {"name": textfilename, "status": "skipped", "message": "no valid file name"}
+        target = os.path.join(targetfolder, name)
+        try:
+            with open(target, "wb") as fh:
+                shutil.copyfileobj(fileobj, fh)
+            return {"name": name, "status": "ok", "bytes": os.path.getsize(target)}
+        except Exception as e:
+            return {"name": name, "status": "failed", "message": str(e)}
+
+    # ---------------------------------------------------------------------------
+    def upload_text(self, project, textfilename, buf, is_reference=False):
+
+        targetfolder = self.get_text_folder(project, is_reference)
+
+        if not os.path.exists(targetfolder):
+            s = Status.FAILED
+            m = f"Destination {targetfolder} does not exist. Was the project generated?"
+            d = {}
+            return s, m, d
+
+        result = self.write_text(targetfolder, textfilename, buf)
+        if result["status"] == "ok":
+            s = Status.SUCCESS
+            m = f"File {textfilename} copied to destination {targetfolder}"
+            d = {}
+        else:
+            s = Status.FAILED
+            m = f"Problem uploading {textfilename}: {result['message']}"
+            d = {}
+        return s, m, d
+
+    # ---------------------------------------------------------------------------
+    def upload_texts(self, project, files, is_reference=False):
+        """
+        upload many texts given as (filename, file object) pairs
+        """
+        targetfolder = self.get_text_folder(project, is_reference)
+
+        if not os.path.exists(targetfolder):
+            s = Status.FAILED
+            m = f"Destination {targetfolder} does not exist. Was the project generated?"
+            d = {}
+            return s, m, d
+
+        results = [self.write_text(targetfolder, textfilename, fileobj) for textfilename, fileobj in files]
+        return self.summarize_uploads(results)
+
+    # ---------------------------------------------------------------------------
+    def upload_archive(self, project, archivename, fileobj, is_reference=False):
+        """
+        unpack a zip or tar (optionally compressed) archive into the
+        text folder. Tar archives are read as a stream, entry by entry.
+        Zip archives need their central directory at the end and are
+        therefore read from the seekable upload file. Directories and
+        other non-regular entries are skipped.
+        """
+        targetfolder = self.get_text_folder(project, is_reference)
+
+        if not os.path.exists(targetfolder):
+            s = Status.FAILED
+            m = f"Destination {targetfolder} does not exist. Was the project generated?"
+            d = {}
+            return s, m, d
+
+        try:
+            results = self.extract_archive(targetfolder, archivename, fileobj)
+        except (tarfile.TarError, zipfile.BadZipFile) as e:
+            s = Status.FAILED
+            m = f"Problem reading archive {archivename}: {e}"
+            d = {}
+            return s, m, d
+        return self.summarize_uploads(results)
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def is_archive(filename):
+        return filename.lower().endswith((".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz"))
+
+    # ---------------------------------------------------------------------------
+    def extract_archive(self, targetfolder, archivename, fileobj):
+        results = []
+        if archivename.lower().endswith(".zip"):
+            with zipfile.ZipFile(fileobj) as zf:
+                for info in zf.infolist():
+                    if info.is_dir():
+                        continue
+                    with zf.open(info) as entry:
+                        results.append(self.write_text(targetfolder, info.filename, entry))
+        else:
+            with tarfile.open(fileobj=fileobj, mode="r|*") as tf:
+                for info in tf:
+                    if not info.isfile():
+                        continue
+                    results.append(self.write_text(targetfolder, info.name, tf.extractfile(info)))
+        return results
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def summarize_uploads(results):
+        uploaded = [r for r in results if r["status"] == "ok"]
+        failed = [r for r in results if r["status"] == "failed"]
+        if not uploaded and not failed:
+            s = Status.FAILED
+            m = "No files found in upload"
+        elif failed:
+            s = Status.WARNING
+            m = f"{len(failed)} of {len(uploaded) + len(failed)} files failed to upload"
+        else:
+            s = Status.SUCCESS
+            m = f"{len(uploaded)} files uploaded"
+        if len(uploaded) + len(failed) < len(results):
+            m += f", {len(results) - len(uploaded) - len(failed)} skipped"
+        d = {"files": results}
+        return s, m, d
+
+    # ---------------------------------------------------------------------------
+    def register_corpus(self, corpus_id, files):
+        """
+        register the texts given as (filename, file object) pairs, or
+        as a single archive, as the named reference corpus. Only a
+        complete upload replaces the registered version.
+        """
+        if not corpora.valid_corpus_id(corpus_id):
+            return Status.FAILED, f"Invalid corpus id {corpus_id}", {}
+
+        textdir = corpora.stage(corpus_id)
+        try:
+            if len(files) == 1 and self.is_archive(files[0][0]):
+                results = self.extract_archive(textdir, *files[0])
+            else:
+                results = [self.write_text(textdir, filename, fileobj) for filename, fileobj in files]
+        except (tarfile.TarError, zipfile.BadZipFile) as e:
+            corpora.deactivate(os.path.dirname(textdir))
+            return Status.FAILED, f"Problem reading archive {files[0][0]}: {e}", {}
+
+        s, m, d = self.summarize_uploads(results)
+        if s != Status.SUCCESS:
+            corpora.deactivate(os.path.dirname(textdir))
+            return Status.FAILED, f"Corpus {corpus_id} not registered: {m}", d
+
+        meta, changed = corpora.commit(corpus_id, textdir)
+        s = Status.SUCCESS
+        m = f"Corpus {corpus_id} registered in version {meta['version']}" if changed else f"Corpus {corpus_id} unchanged"
+        d = {"corpus": meta, "changed": changed, "files": results}
+        return s, m, d
+
+    # ---------------------------------------------------------------------------
+    def precompute_corpus(self, corpus_id, version=None, progress=None):
+        """
+        embed the sentences (detailed analyzers) and the documents (coarse
+        analyzer) of a registered corpus into its own embedding store.
+        With a version given nothing is done once the corpus has moved on
+        to a newer version, whose own job precomputes it.
+        """
+        if corpora.get_meta(corpus_id) is None:
+            return Status.FAILED, f"Corpus {corpus_id} is not registered", {}
+        with corpora.reading(corpus_id) as versiondir:
+            if version is not None and os.path.basename(versiondir) != version:
+                return Status.SUCCESS, f"Version {version} of corpus {corpus_id} is superseded", {}
+            store = corpora.get_store(versiondir)
+            texts = DetailedHandler.read_texts(os.path.join(versiondir, REFFOLDERNAME))
+            if progress:
+                progress(0, 2)
+            detailed = DetailedHandler()
+            detailed.embed_collapsed([corpus for _, corpus in detailed.make_corpora(texts)], store)
+            if progress:
+                progress(1, 2)
+            CoarseHandler().embed_documents([text for _, text in texts], store)
+            if progress:
+                progress(2, 2)
+        return Status.SUCCESS, f"Embeddings of corpus {corpus_id} precomputed", store.get_stats()
+
+    # ---------------------------------------------------------------------------
+    def corpus_status(self, corpus_id):
+        meta = corpora.get_meta(corpus_id) if corpora.valid_corpus_id(corpus_id) else None
+        if meta is None:
+            return Status.FAILED, f"Corpus {corpus_id} is not registered", {}
+        d = {"corpus": meta, "embeddings": corpora.get_store(corpora.get_version_dir(corpus_id)).get_stats()}
+        return Status.SUCCESS, f"Corpus {corpus_id} in version {meta['version']}", d
+
+    # ---------------------------------------------------------------------------
+    def list_corpora(self):
+        return Status.SUCCESS, "Registered corpora", {"corpora": corpora.list_corpora()}
+
+    # ---------------------------------------------------------------------------
+    def attach_corpus(self, token, corpus_id):
+        """
+        use a registered corpus as the reference texts of a project
+        instead of uploaded ones
+        """
+        if not corpora.valid_corpus_id(corpus_id) or corpora.get_meta(corpus_id) is None:
+            return Status.FAILED, f"Corpus {corpus_id} is not registered", {}
+        dir_project = os.path.join(PROJECTFOLDER, token, "corpus.conf")
+        with open(dir_project, "w") as f:
+            f.write(corpus_id)
+        return Status.SUCCESS, f"Corpus {corpus_id} attached", {"corpus": corpora.get_meta(corpus_id)}
+
+    # ---------------------------------------------------------------------------
+    def analyze_project(self, project, progress=None):
+        dir_project = os.path.join(PROJECTFOLDER, project)
+
+        if not os.path.exists(dir_project):
+            s = Status.FAILED
+            m = f"Project {project} does not exist"
+            d = {}
+            return s, m, d
+
+        sc_usecase = "coarse"
+        nlp_config_file = os.path.join(dir_project, "nlp.conf")
+        if os.path.exists(nlp_config_file):
+            with open(nlp_config_file, "r") as f:
+                sc_usecase = f.read()
+        #
+        # invoke specific handler through interface
+        # that deals with the specific analysis
+        #
+        print(f"NLP handler >{sc_usecase}< was selected")
+        hi = HandlerInterface(NLP_handlers[sc_usecase])
+        s, m, d = hi.analyze_project(dir_project, progress)
+        return s, m, d
+
+    # ---------------------------------------------------------------------------
+    def visualize_project(self, project, progress=None):
+        dir_project = os.path.join(PROJECTFOLDER, project)
+
+        if not os.path.exists(dir_project):
+            s = Status.FAILED
+            m = f"Project {project} does not exist"
+            d = {}
+            return s, m, d
+        
+        sc_visualizer = "coarse"
+        vis_config_file = os.path.join(dir_project, "vis.conf")
+        if os.path.exists(vis_config_file):
+            with open(vis_config_file, "r") as f:
+                sc_visualizer = f.read()
+
+        #
+        # invoke specific visualizer through interface
+        # that reads the pandas dataframes
+        # generated by the NLP analysis module.
+        #
+        vi = VisualizerInterface(Visualizers[sc_visualizer])
+        s, m, d = vi.visualize_project(dir_project, progress)
+        return s, m, d
+
+    # ---------------------------------------------------------------------------
+    def download_file(self, absfilename, fmt=None):
+        if not os.path.exists(absfilename):
+            s = Status.FAILED
+            m = f"File {absfilename} not found in task."
+            d = {}
+        elif fmt and not absfilename.endswith(".parquet"):
+            s = Status.FAILED
+            m = f"File {absfilename} is not a result that can be converted to {fmt}."
+            d = {}
+        elif fmt and fmt not in EXPORT_FORMATS:
+            s = Status.FAILED
+            m = f"Unknown format {fmt}. Choose one of {EXPORT_FORMATS}."
+            d = {}
+        else:
+            #
+            # results are stored as parquet. Other formats are
+            # generated on request and kept next to the result.
+            #
+            if fmt:
+                absfilename = Resultwriter().export_result_file(absfilename, fmt)
+            s = Status.SUCCESS
+            m = f"File {absfilename} found."
+            onlyfilename = os.path.basename(absfilename)
+            d = {
+                "file_location": absfilename,
+                "media_type": "application/octet-stream",
+                "filename": onlyfilename,
+            }
+        return s, m, d
+
+    # ---------------------------------------------------------------------------
+    def download_results(self, project, tags=None, fmt=None):
+        """
+        select the files of the results folder of a project for a
+        download as one archive. tags restricts the selection to results
+        of the given tags or file types (e.g. "coarse", "detailed", "png").
+        With fmt every parquet result is accompanied by its export.
+        """
+        result_folder = os.path.join(PROJECTFOLDER, project, RESFOLDERNAME)
+        if not os.path.exists(result_folder):
+            return Status.FAILED, f"Project {project} does not exist", {}
+        if fmt and fmt not in EXPORT_FORMATS:
+            return Status.FAILED, f"Unknown format {fmt}. Choose one of {EXPORT_FORMATS}.", {}
+
+        files = list()
+        for filename in sorted(os.listdir(result_folder)):
+            path = os.path.join(result_folder, filename)
+            #
+            # skip exports that are just being written
+            #
+            if os.path.isdir(path) or ".tmp." in filename:
+                continue
+            if tags and not any(Resultwriter.has_tag(filename, tag) for tag in tags):
+                continue
+            files.append(path)
+            if fmt and filename.endswith(".parquet"):
+                export = Resultwriter().export_result_file(path, fmt)
+                if export != path and export not in files:
+                    files.append(export)
+        #
+        # exports generated before may have been selected twice
+        #
+        files = list(dict.fromkeys(files))
+
+        s = Status.SUCCESS
+        m = f"{len(files)} result files of task {project}"
+        d = {"files": files, "filename": f"{project}.results.tar.gz"}
+        return s, m, d
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def stream_archive(files, chunk_size=2**20):
+        """
+        generate a tar.gz archive of the given files chunk by chunk. The
+        archive is compressed on the fly and never held in memory as a
+        whole, neither are the files. Members are named by their file
+        names and written in the pax format that allows long names.
+        """
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        written = 0
+        for path in files:
+            stat = os.stat(path)
+            info = tarfile.TarInfo(name=os.path.basename(path))
+            info.size = stat.st_size
+            info.mtime = stat.st_mtime
+            header = info.tobuf(format=tarfile.PAX_FORMAT)
+            written += len(header)
+            yield compressor.compress(header)
+            with open(path, "rb") as f:
+                remaining = info.size
+                while remaining > 0:
+                    chunk = f.read(min(chunk_size, remaining))
+                    if not chunk:
+                        raise IOError(f"File {path} changed while it was archived")
+                    remaining -= len(chunk)
+                    yield compressor.compress(chunk)
+            #
+            # members are padded to full blocks
+            #
+            padding = -info.size % tarfile.BLOCKSIZE
+            written += info.size + padding
+            yield compressor.compress(tarfile.NUL * padding)
+        #
+        # the archive ends with two empty blocks and is padded to full records
+        #
+        written += 2 * tarfile.BLOCKSIZE
+        trailer = 2 * tarfile.BLOCKSIZE + (-written % tarfile.RECORDSIZE)
+        yield compressor.compress(tarfile.NUL * trailer)
+        yield compressor.flush()
+
+    # ---------------------------------------------------------------------------
+    def warm_up_models(self, model_names=None):
+        if model_names is None:
+            model_names = WARMUP_MODELS
+        if not model_names:
+            return Status.SUCCESS, "No models configured for warm-up", {}
+        try:
+            loaded = registry.warm_up(model_names)
+            s = Status.SUCCESS
+            m = "Models loaded and resident."
+            d = {"models": loaded}
+        except Exception as e:
+            s = Status.FAILED
+            m = f"Problem loading models: {e}"
+            d = {}
+        return s, m, d
+
+    # ---------------------------------------------------------------------------
+    def stop_encoder_pools(self):
+        registry.stop_pools()
+        return Status.SUCCESS, "Encoder workers stopped", {}
+
+    # ---------------------------------------------------------------------------
+    def start_heatmap_workers(self):
+        try:
+            workers = heatmap_pool.start()
+            s = Status.SUCCESS
+            m = f"{workers} heatmap workers running." if workers else "Heatmaps are rendered in the job threads."
+            d = {"workers": workers}
+        except Exception as e:
+            s = Status.FAILED
+            m = f"Problem starting heatmap workers: {e}"
+            d = {}
+        return s, m, d
+
+    # ---------------------------------------------------------------------------
+    def stop_heatmap_workers(self):
+        heatmap_pool.stop()
+        return Status.SUCCESS, "Heatmap workers stopped", {}
+
+    # ---------------------------------------------------------------------------
+    def model_status(self):
+        s = Status.SUCCESS
+        m = "Models resident in this worker"
+        d = {
+            "models": registry.get_resident_models(),
+            "process_maxrss_mb": registry.process_memory_mb(),
+            "pid": os.getpid(),
+        }
+        return s, m, d
+
+    # ---------------------------------------------------------------------------
+    def embedding_store_status(self):
+        s = Status.SUCCESS
+        m = "Embedding store statistics of this worker"
+        d = store.get_stats()
+        return s, m, d
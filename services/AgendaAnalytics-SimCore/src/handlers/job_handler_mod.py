@@ -0,0 +1,417 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import urllib.request
+from contextlib import closing
+
+from dynaconf import settings
+
+from simcore_api_schema_mod import Status
+from nlpcore.model_registry_mod import registry
+
+PROJECTFOLDER = settings.PROJECTFOLDER
+TASKDBNAME = settings.TASKDBNAME
+JOB_WORKERS = settings.JOB_WORKERS
+JOB_POLL = settings.JOB_POLL
+JOB_HEARTBEAT = settings.JOB_HEARTBEAT
+JOB_STALE_SECONDS = settings.JOB_STALE_SECONDS
+JOB_CLAIM_GRACE = settings.JOB_CLAIM_GRACE
+JOB_MAX_ATTEMPTS = 2
+
+FINISHED = ("done", "failed")
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+
+class JobHandler:
+    """
+    This class runs analyses and visualizations as background jobs such
+    that the REST API keeps serving other tasks while a long analysis is
+    in progress. The jobs are queued in the SQLite database of the task
+    registry, which all worker processes of the REST API share. Every
+    process runs a bounded number of job threads that claim queued jobs
+    atomically, preferably the ones whose model is warm in this process.
+    Running jobs are kept alive by heartbeats, jobs of a worker that died
+    are queued again. Every change of a job increments its version such
+    that clients can wait for the next change instead of polling.
+
+    Jobs are given as a method name and JSON arguments, which every
+    process resolves to its own dispatcher by the resolve function.
+    """
+
+    def __init__(self, resolve=None, workers=JOB_WORKERS, path=None):
+        if path is None:
+            path = os.path.join(PROJECTFOLDER, TASKDBNAME)
+        self.path = path
+        self.resolve = resolve
+        self.workers = workers
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.threads = list()
+        self.stop_event = threading.Event()
+        self.wakeup = threading.Event()
+        #
+        # asyncio events of clients waiting for the next change of a job.
+        # They live in the event loop of the REST API and are set from
+        # the job threads through call_soon_threadsafe. Changes made by
+        # other processes are noticed by polling.
+        #
+        self.loop = None
+        self.waiters = dict()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(self.connect()) as db, db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    token TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    method TEXT NOT NULL,
+                    args TEXT NOT NULL,
+                    model TEXT,
+                    state TEXT NOT NULL,
+                    version INTEGER NOT NULL DEFAULT 0,
+                    progress_done INTEGER NOT NULL DEFAULT 0,
+                    progress_total INTEGER,
+                    submitted_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    status INTEGER,
+                    message TEXT NOT NULL DEFAULT '',
+                    details TEXT NOT NULL DEFAULT '{}',
+                    callback_url TEXT,
+                    worker TEXT,
+                    heartbeat REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0
+                )""")
+            db.execute("CREATE INDEX IF NOT EXISTS jobs_token ON jobs (token)")
+            db.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state)")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS workers (
+                    worker TEXT PRIMARY KEY,
+                    pid INTEGER NOT NULL,
+                    models TEXT NOT NULL,
+                    heartbeat REAL NOT NULL
+                )""")
+        return
+
+    # ---------------------------------------------------------------------------
+    def connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        db.row_factory = sqlite3.Row
+        return db
+
+    # ---------------------------------------------------------------------------
+    def start(self):
+        """
+        start the job threads and the heartbeat of this process. Only
+        processes that serve the REST API run jobs.
+        """
+        if self.threads:
+            return
+        self.beat()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self.work, name=f"simcore-job-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        thread = threading.Thread(target=self.keep_alive, name="simcore-job-heartbeat", daemon=True)
+        thread.start()
+        self.threads.append(thread)
+        logger.info(f"Job worker {self.worker_id} started with {self.workers} threads")
+        return
+
+    # ---------------------------------------------------------------------------
+    def submit(self, token:str, kind:str, func, *args, callback_url:str=None, model:str=None):
+        """
+        queue func(*args, progress=...) as a job of the given token.
+        func is a method of the dispatcher (or its name), args must be
+        JSON serializable. func has to return the usual (status, message,
+        details) tuple. A token runs at most one job at a time. If a
+        callback URL is given the final job status is posted there as
+        JSON. Jobs that encode texts name their model such that workers
+        having it loaded can take them first.
+        """
+        method = func if isinstance(func, str) else func.__name__
+        job_id = uuid.uuid4().hex
+        with closing(self.connect()) as db:
+            #
+            # the check and the insert must not interleave with another
+            # process submitting a job for the same token
+            #
+            db.execute("BEGIN IMMEDIATE")
+            active = db.execute("SELECT job_id, state FROM jobs WHERE token = ? AND state IN ('queued', 'running')",
+                                (token,)).fetchone()
+            if active is not None:
+                db.rollback()
+                message = f"Job {active['job_id']} of task {token} is still {active['state']}"
+                return Status.WARNING, message, self.get_job_info(active["job_id"])
+            db.execute("""
+                INSERT INTO jobs (job_id, token, kind, method, args, model, state, submitted_at, callback_url)
+                VALUES (?, ?, ?, ?, ?, ?, 'queued', ?, ?)""",
+                (job_id, token, kind, method, json.dumps(args), model, time.time(), callback_url))
+            db.commit()
+        self.wakeup.set()
+        logger.info(f"Job {job_id} ({kind}) of task {token} queued")
+        return Status.RUNNING, f"Job {job_id} queued", self.get_job_info(job_id)
+
+    # ---------------------------------------------------------------------------
+    def claim(self):
+        """
+        atomically take the oldest queued job this process should run.
+        A job whose model is warm in another live worker is left to that
+        worker for JOB_CLAIM_GRACE seconds.
+        """
+        now = time.time()
+        warm_here = set(registry.models)
+        with closing(self.connect()) as db:
+            #
+            # idle threads look without taking the write lock
+            #
+            if db.execute("SELECT 1 FROM jobs WHERE state = 'queued' LIMIT 1").fetchone() is None:
+                return None
+            db.execute("BEGIN IMMEDIATE")
+            warm_elsewhere = set()
+            for row in db.execute("SELECT models FROM workers WHERE worker != ? AND heartbeat > ?",
+                                  (self.worker_id, now - JOB_STALE_SECONDS)):
+                warm_elsewhere.update(json.loads(row["models"]))
+            queued = db.execute("SELECT job_id, model, submitted_at FROM jobs WHERE state = 'queued' ORDER BY submitted_at").fetchall()
+            for row in queued:
+                model = row["model"]
+                if (model is None or model in warm_here or model not in warm_elsewhere
+                        or now - row["submitted_at"] > JOB_CLAIM_GRACE):
+                    db.execute("""
+                        UPDATE jobs SET state = 'running', worker = ?, started_at = ?, heartbeat = ?,
+                                        attempts = attempts + 1, version = version + 1
+                        WHERE job_id = ?""", (self.worker_id, now, now, row["job_id"]))
+                    db.commit()
+                    return self.get_job(row["job_id"])
+            db.rollback()
+        return None
+
+    # ---------------------------------------------------------------------------
+    def work(self):
+        while not self.stop_event.is_set():
+            try:
+                job = self.claim()
+            except sqlite3.Error:
+                logger.exception("Claiming a job failed")
+                job = None
+            if job is None:
+                self.wakeup.wait(JOB_POLL)
+                self.wakeup.clear()
+                continue
+            self.changed(job["job_id"])
+            self.run_job(job)
+        return
+
+    # ---------------------------------------------------------------------------
+    def run_job(self, job):
+        job_id = job["job_id"]
+
+        def progress(done, total):
+            self.update(job_id, "progress_done = ?, progress_total = ?", (done, total))
+
+        try:
+            func = self.resolve(job["method"])
+            s, m, d = func(*json.loads(job["args"]), progress=progress)
+            state = "done" if s != Status.FAILED else "failed"
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed")
+            s, m, d = Status.FAILED, f"Job failed: {e}", {}
+            state = "failed"
+        finished_at = time.time()
+        self.update(job_id, "state = ?, status = ?, message = ?, details = ?, finished_at = ?",
+                    (state, s.value, m, json.dumps(d, default=str), finished_at))
+        logger.info(f"Job {job_id} of task {job['token']} {state} "
+                    f"after {finished_at - job['started_at']:.1f}s")
+        if job["callback_url"]:
+            self.post_callback(job)
+        return s, m, d
+
+    # ---------------------------------------------------------------------------
+    def update(self, job_id:str, assignments:str, params):
+        with closing(self.connect()) as db, db:
+            db.execute(f"UPDATE jobs SET {assignments}, version = version + 1 WHERE job_id = ?",
+                       tuple(params) + (job_id,))
+        self.changed(job_id)
+        return
+
+    # ---------------------------------------------------------------------------
+    def keep_alive(self):
+        """
+        heartbeat of this process and its running jobs. Jobs of workers
+        without heartbeat are queued again, or fail after JOB_MAX_ATTEMPTS.
+        """
+        while not self.stop_event.wait(JOB_HEARTBEAT):
+            try:
+                self.beat()
+                self.requeue_stale()
+            except sqlite3.Error:
+                logger.exception("Job heartbeat failed")
+        return
+
+    # ---------------------------------------------------------------------------
+    def beat(self):
+        now = time.time()
+        with closing(self.connect()) as db, db:
+            db.execute("INSERT OR REPLACE INTO workers (worker, pid, models, heartbeat) VALUES (?, ?, ?, ?)",
+                       (self.worker_id, os.getpid(), json.dumps(list(registry.models)), now))
+            db.execute("UPDATE jobs SET heartbeat = ? WHERE worker = ? AND state = 'running'", (now, self.worker_id))
+            db.execute("DELETE FROM workers WHERE heartbeat < ?", (now - 10 * JOB_STALE_SECONDS,))
+        return
+
+    # ---------------------------------------------------------------------------
+    def requeue_stale(self):
+        stale = time.time() - JOB_STALE_SECONDS
+        with closing(self.connect()) as db, db:
+            requeued = db.execute("""
+                UPDATE jobs SET state = 'queued', worker = NULL, version = version + 1
+                WHERE state = 'running' AND heartbeat < ? AND attempts < ?""",
+                (stale, JOB_MAX_ATTEMPTS)).rowcount
+            failed = db.execute("""
+                UPDATE jobs SET state = 'failed', status = ?, message = 'Job lost its worker', finished_at = ?,
+                                version = version + 1
+                WHERE state = 'running' AND heartbeat < ?""",
+                (Status.FAILED.value, time.time(), stale)).rowcount
+        if requeued or failed:
+            logger.warning(f"Jobs of lost workers: {requeued} queued again, {failed} failed")
+            self.wakeup.set()
+        return
+
+    # ---------------------------------------------------------------------------
+    def post_callback(self, job):
+        """
+        post the final status of a job to its callback URL. A callback
+        that can not be delivered is logged but does not fail the job.
+        """
+        body = json.dumps(self.get_job_info(job["job_id"])).encode("utf-8")
+        request = urllib.request.Request(
+            job["callback_url"], data=body, method="POST",
+            headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                logger.info(f"Callback for job {job['job_id']} delivered: {response.status}")
+        except Exception as e:
+            logger.warning(f"Callback for job {job['job_id']} to {job['callback_url']} failed: {e}")
+        return
+
+    # ---------------------------------------------------------------------------
+    def changed(self, job_id:str):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.wake, job_id)
+        return
+
+    # ---------------------------------------------------------------------------
+    def wake(self, job_id:str):
+        event = self.waiters.pop(job_id, None)
+        if event is not None:
+            event.set()
+        return
+
+    # ---------------------------------------------------------------------------
+    async def wait_for_change(self, job_id:str, version:int, timeout:float):
+        """
+        wait until the job has a version beyond the given one or is
+        finished, at most timeout seconds. Runs in the event loop. Jobs
+        of this process wake the waiters right away, jobs of other
+        processes are polled every JOB_POLL seconds.
+        """
+        self.loop = asyncio.get_running_loop()
+        deadline = self.loop.time() + timeout
+        while True:
+            job = self.get_job(job_id)
+            if job is None or job["version"] > version or job["state"] in FINISHED:
+                return
+            remaining = deadline - self.loop.time()
+            if remaining <= 0:
+                return
+            event = self.waiters.setdefault(job_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), min(remaining, JOB_POLL))
+            except asyncio.TimeoutError:
+                pass
+
+    # ---------------------------------------------------------------------------
+    async def wait_for_job(self, job_id:str):
+        """
+        wait until the job is finished and return its result
+        """
+        while True:
+            job = self.get_job(job_id)
+            if job["state"] in FINISHED:
+                return Status(job["status"]), job["message"], json.loads(job["details"])
+            await self.wait_for_change(job_id, job["version"], 60.0)
+
+    # ---------------------------------------------------------------------------
+    def get_job(self, job_id:str):
+        with closing(self.connect()) as db:
+            row = db.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    # ---------------------------------------------------------------------------
+    def get_active_job(self, token:str):
+        with closing(self.connect()) as db:
+            row = db.execute("SELECT * FROM jobs WHERE token = ? AND state IN ('queued', 'running')",
+                             (token,)).fetchone()
+        return dict(row) if row is not None else None
+
+    # ---------------------------------------------------------------------------
+    def get_job_info(self, job_id:str):
+        """
+        state, progress and timing of a job. Seconds are measured from
+        submission to start (queued) and from start to end or now (running).
+        """
+        job = self.get_job(job_id)
+        now = time.time()
+        started = job["started_at"]
+        finished = job["finished_at"]
+        info = {key: job[key] for key in ("job_id", "token", "kind", "state", "version",
+                                          "submitted_at", "started_at", "finished_at", "message", "worker")}
+        info["progress"] = {"done": job["progress_done"], "total": job["progress_total"]}
+        info["details"] = json.loads(job["details"])
+        info["status"] = job["status"]
+        info["queued_seconds"] = round((started if started else now) - job["submitted_at"], 3)
+        info["run_seconds"] = round((finished if finished else now) - started, 3) if started else None
+        return info
+
+    # ---------------------------------------------------------------------------
+    def get_job_status(self, token:str, job_id:str=None):
+        """
+        status of the given job of a token, or of its latest job
+        """
+        query = "SELECT job_id, state FROM jobs WHERE token = ?"
+        params = (token,)
+        if job_id is not None:
+            query += " AND job_id = ?"
+            params += (job_id,)
+        with closing(self.connect()) as db:
+            job = db.execute(query + " ORDER BY submitted_at DESC LIMIT 1", params).fetchone()
+        if job is None:
+            return Status.FAILED, f"No job found for task {token}", {}
+        return Status.SUCCESS, f"Job {job['job_id']} is {job['state']}", self.get_job_info(job["job_id"])
+
+    # ---------------------------------------------------------------------------
+    def remove_jobs(self, token:str):
+        """
+        forget the finished jobs of a closed task
+        """
+        with closing(self.connect()) as db, db:
+            db.execute("DELETE FROM jobs WHERE token = ? AND state IN ('done', 'failed')", (token,))
+        return
+
+    # ---------------------------------------------------------------------------
+    def shutdown(self):
+        """
+        stop claiming jobs. Running jobs end with the process, other
+        workers take them over once their heartbeat is stale.
+        """
+        self.stop_event.set()
+        self.wakeup.set()
+        with closing(self.connect()) as db, db:
+            db.execute("DELETE FROM workers WHERE worker = ?", (self.worker_id,))
+        return
@@ -0,0 +1,226 @@
+import logging
+import os
+import shutil
+import threading
+import time
+
+from dynaconf import settings
+
+PROJECTFOLDER = settings.PROJECTFOLDER
+CORPUSFOLDER = settings.CORPUSFOLDER
+REAPER_INTERVAL = settings.REAPER_INTERVAL
+TASK_TTL_HOURS = settings.TASK_TTL_HOURS
+DEACTIVATED_TTL_HOURS = settings.DEACTIVATED_TTL_HOURS
+DISK_QUOTA_MB = settings.DISK_QUOTA_MB
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+
+def folder_size(folder:str) -> int:
+    size = 0
+    for root, _, files in os.walk(folder):
+        for filename in files:
+            try:
+                size += os.lstat(os.path.join(root, filename)).st_size
+            except FileNotFoundError:
+                pass
+    return size
+
+
+class TaskReaper:
+    """
+    Background thread that keeps the project folders from filling up
+    the disk. Every REAPER_INTERVAL seconds it
+
+    - registers project folders that are unknown to the task registry
+      (e.g. created before the registry existed) such that they expire
+    - closes and deactivates tasks that were not used for TASK_TTL_HOURS
+    - deletes deactivated ("$$$") task and corpus folders after
+      DEACTIVATED_TTL_HOURS, and the staging folders of corpus
+      registrations that were not written to for as long (e.g. after
+      a crash during the upload)
+    - while all folders together take more than DISK_QUOTA_MB, deletes
+      deactivated folders right away and then closes the least recently
+      used tasks and deletes their folders
+
+    Tasks with a queued or running job are never touched. Only folders
+    named "$$$..." directly inside the project folder or the folder of a
+    corpus, and "staging-..." folders of a corpus are ever deleted.
+    """
+
+    def __init__(self, registry, purge_project, is_busy):
+        #
+        # purge_project(token) deactivates the folder of a task and
+        # returns the usual (status, message, details) tuple with the
+        # deactivated folder, is_busy(token) tells whether a job of
+        # the task is queued or running
+        #
+        self.registry = registry
+        self.purge_project = purge_project
+        self.is_busy = is_busy
+        self.stop_event = threading.Event()
+        self.thread = None
+        return
+
+    # ---------------------------------------------------------------------------
+    def start(self, interval=REAPER_INTERVAL):
+        if not interval or self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self.run, args=(interval,), name="simcore-reaper", daemon=True)
+        self.thread.start()
+        logger.info(f"Task reaper started, running every {interval}s")
+        return
+
+    # ---------------------------------------------------------------------------
+    def run(self, interval):
+        while not self.stop_event.wait(interval):
+            try:
+                self.reap()
+            except Exception:
+                logger.exception("Task reaper failed")
+        return
+
+    # ---------------------------------------------------------------------------
+    def stop(self):
+        self.stop_event.set()
+        return
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def corpus_folders():
+        if not os.path.exists(CORPUSFOLDER):
+            return []
+        folders = [os.path.join(CORPUSFOLDER, name) for name in os.listdir(CORPUSFOLDER)]
+        return [folder for folder in folders if os.path.isdir(folder)]
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def deactivated_folders():
+        """
+        deactivated task and corpus folders, oldest first. Renaming
+        a folder updates its ctime, which is taken as deactivation time.
+        """
+        parents = [PROJECTFOLDER] + TaskReaper.corpus_folders()
+        folders = list()
+        for parent in parents:
+            if not os.path.isdir(parent):
+                continue
+            for name in os.listdir(parent):
+                path = os.path.join(parent, name)
+                if name.startswith("$$$") and os.path.isdir(path):
+                    folders.append((os.stat(path).st_ctime, path))
+        return [path for _, path in sorted(folders)]
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def stale_staging_folders(before:float):
+        """
+        staging folders of corpus registrations nothing was written to
+        since before. A registration in progress keeps writing its texts.
+        """
+        folders = list()
+        for parent in TaskReaper.corpus_folders():
+            for name in os.listdir(parent):
+                path = os.path.join(parent, name)
+                if not name.startswith("staging-") or not os.path.isdir(path):
+                    continue
+                try:
+                    last_written = max(os.stat(root).st_mtime for root, _, _ in os.walk(path))
+                except (OSError, ValueError):
+                    continue
+                if last_written < before:
+                    folders.append(path)
+        return folders
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def delete_folder(path:str) -> int:
+        size = folder_size(path)
+        shutil.rmtree(path, ignore_errors=True)
+        logger.info(f"Deleted {path} ({size} bytes)")
+        return size
+
+    # ---------------------------------------------------------------------------
+    def expire(self, token:str):
+        """
+        close an unused task and deactivate its folder. Returns the
+        deactivated folder or None.
+        """
+        if not self.registry.close_task(token, status="expired"):
+            return None
+        s, m, d = self.purge_project(token)
+        logger.info(f"Task {token} expired: {m}")
+        return d.get("deactivated_folder")
+
+    # ---------------------------------------------------------------------------
+    def reap(self):
+        now = time.time()
+        summary = {"adopted": 0, "expired": 0, "deleted": 0, "freed_bytes": 0}
+        #
+        # project folders without a task, e.g. from before the registry
+        #
+        for name in os.listdir(PROJECTFOLDER):
+            path = os.path.join(PROJECTFOLDER, name)
+            if os.path.isdir(path) and not name.startswith("$$$") and not self.registry.is_known(name):
+                #
+                # other worker processes may adopt the same folder
+                # at the same time, only the one adding it counts it
+                #
+                if self.registry.adopt_task(name, created_at=os.stat(path).st_mtime):
+                    summary["adopted"] += 1
+        #
+        # measure the active tasks and expire the unused ones
+        #
+        tasks = self.registry.list_tasks("active")
+        for task in tasks:
+            task["size_bytes"] = folder_size(os.path.join(PROJECTFOLDER, task["token"]))
+            self.registry.set_size(task["token"], task["size_bytes"])
+        if TASK_TTL_HOURS:
+            for task in [task for task in tasks if task["last_used"] < now - TASK_TTL_HOURS * 3600]:
+                if not self.is_busy(task["token"]) and self.expire(task["token"]) is not None:
+                    tasks.remove(task)
+                    summary["expired"] += 1
+        #
+        # delete deactivated folders after their grace period
+        #
+        deactivated = self.deactivated_folders()
+        for path in list(deactivated):
+            if os.stat(path).st_ctime < now - DEACTIVATED_TTL_HOURS * 3600:
+                summary["freed_bytes"] += self.delete_folder(path)
+                summary["deleted"] += 1
+                deactivated.remove(path)
+        for path in self.stale_staging_folders(now - DEACTIVATED_TTL_HOURS * 3600):
+            summary["freed_bytes"] += self.delete_folder(path)
+            summary["deleted"] += 1
+        #
+        # enforce the disk quota, first with the deactivated folders
+        # and then with the least recently used tasks
+        #
+        if DISK_QUOTA_MB:
+            quota = DISK_QUOTA_MB * 2**20
+            used = sum(task["size_bytes"] for task in tasks) + sum(folder_size(path) for path in deactivated)
+            for path in deactivated:
+                if used <= quota:
+                    break
+                freed = self.delete_folder(path)
+                used -= freed
+                summary["freed_bytes"] += freed
+                summary["deleted"] += 1
+            for task in tasks:
+                if used <= quota:
+                    break
+                if self.is_busy(task["token"]):
+                    continue
+                folder = self.expire(task["token"])
+                if folder is not None:
+                    freed = self.delete_folder(folder)
+                    used -= freed
+                    summary["freed_bytes"] += freed
+                    summary["expired"] += 1
+                    summary["deleted"] += 1
+            if used > quota:
+                logger.warning(f"Disk quota of {DISK_QUOTA_MB} MB exceeded by tasks with running jobs")
+
+        if any(summary.values()):
+            logger.info(f"Task reaper: {summary}")
+        return summary
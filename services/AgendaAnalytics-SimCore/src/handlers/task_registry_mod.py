@@ -0,0 +1,125 @@
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from dynaconf import settings
+
+PROJECTFOLDER = settings.PROJECTFOLDER
+TASKDBNAME = settings.TASKDBNAME
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+
+class TaskRegistry:
+    """
+    Persistent registry of the tasks (tokens) of SimCore in a SQLite
+    database next to the project folders. Tasks survive restarts of the
+    REST API and are shared by all its worker processes. For every task
+    the creation time, the time of last use, the size of its folder and
+    its status are recorded:
+
+        active      the task is open
+        closed      the task was closed by its client
+        expired     the task was closed by the reaper (unused or over quota)
+
+    Every operation opens its own connection, which makes the registry
+    safe to use from the job threads and from several processes.
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.path.join(PROJECTFOLDER, TASKDBNAME)
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(self.connect()) as db, db:
+            #
+            # write ahead logging lets readers continue while
+            # another process writes
+            #
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    token TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    closed_at REAL,
+                    size_bytes INTEGER NOT NULL DEFAULT 0
+                )""")
+        return
+
+    # ---------------------------------------------------------------------------
+    def connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        db.row_factory = sqlite3.Row
+        return db
+
+    # ---------------------------------------------------------------------------
+    def add_task(self, token:str, created_at:float=None):
+        now = time.time()
+        if created_at is None:
+            created_at = now
+        with closing(self.connect()) as db, db:
+            db.execute("INSERT INTO tasks (token, status, created_at, last_used) VALUES (?, 'active', ?, ?)",
+                       (token, created_at, created_at))
+        return
+
+    # ---------------------------------------------------------------------------
+    def adopt_task(self, token:str, created_at:float) -> bool:
+        """
+        register a task found on disk unless it is known already. Several
+        processes may adopt the same folder at once, only one of them adds
+        it. Returns whether this call added the task.
+        """
+        with closing(self.connect()) as db, db:
+            cursor = db.execute("INSERT OR IGNORE INTO tasks (token, status, created_at, last_used) VALUES (?, 'active', ?, ?)",
+                                (token, created_at, created_at))
+            return cursor.rowcount > 0
+
+    # ---------------------------------------------------------------------------
+    def touch(self, token:str) -> bool:
+        """
+        mark an active task as used now. Returns whether the task is active.
+        """
+        with closing(self.connect()) as db, db:
+            cursor = db.execute("UPDATE tasks SET last_used = ? WHERE token = ? AND status = 'active'",
+                                (time.time(), token))
+            return cursor.rowcount > 0
+
+    # ---------------------------------------------------------------------------
+    def close_task(self, token:str, status:str="closed") -> bool:
+        with closing(self.connect()) as db, db:
+            cursor = db.execute("UPDATE tasks SET status = ?, closed_at = ? WHERE token = ? AND status = 'active'",
+                                (status, time.time(), token))
+            return cursor.rowcount > 0
+
+    # ---------------------------------------------------------------------------
+    def set_size(self, token:str, size_bytes:int):
+        with closing(self.connect()) as db, db:
+            db.execute("UPDATE tasks SET size_bytes = ? WHERE token = ?", (size_bytes, token))
+        return
+
+    # ---------------------------------------------------------------------------
+    def is_known(self, token:str) -> bool:
+        with closing(self.connect()) as db:
+            return db.execute("SELECT 1 FROM tasks WHERE token = ?", (token,)).fetchone() is not None
+
+    # ---------------------------------------------------------------------------
+    def list_tasks(self, status:str=None):
+        """
+        the tasks with the given status (all if None), least recently used first
+        """
+        query = "SELECT * FROM tasks"
+        params = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (status,)
+        with closing(self.connect()) as db:
+            return [dict(row) for row in db.execute(query + " ORDER BY last_used", params)]
+
+    # ---------------------------------------------------------------------------
+    def active_tokens(self):
+        return [task["token"] for task in self.list_tasks("active")]
@@ -1,15 +1,20 @@
 import logging
+import sqlite3
 import uuid
 
+from handlers.task_registry_mod import TaskRegistry
+
 logger = logging.getLogger(__name__)
 
 class TokenHandler:
     """
-    This class provides functionality for token generation and deletion
+    This class provides functionality for token generation and deletion.
+    The tokens are kept in the persistent task registry such that they
+    survive restarts and are valid in every worker process.
     """
 
-    def __init__(self):
-        self.tokenset = set()
+    def __init__(self, registry=None):
+        self.registry = registry if registry is not None else TaskRegistry()
         return
     
     # ---------------------------------------------------------------------------
@@ -19,21 +24,34 @@ class TokenHandler:
         of a UUID and checks for consistency.
         """
         token = uuid.uuid4().hex   # hex string representation of uuid token
-        if token in self.tokenset:
+        try:
+            self.registry.add_task(token)
+        except sqlite3.IntegrityError:
             logger.error("UUID handling inconsistency. Token exists already.")
             raise ValueError("*** intenal error ***")
-        self.tokenset.add(token)
         return token
     
     
     # ---------------------------------------------------------------------------
     def get_active_tasks(self):
-        return list(self.tokenset)
+        return self.registry.active_tokens()
     
 
+    # ---------------------------------------------------------------------------
+    def get_task_list(self, status:str=None):
+        """
+        registry entries (creation time, last use, size, status) of the
+        tasks with the given status, all tasks if None
+        """
+        return self.registry.list_tasks(status)
+
+
     # ---------------------------------------------------------------------------
     def check_token(self, token:str) -> bool:
-        if token in self.tokenset:
+        #
+        # every use of a token keeps its task from expiring
+        #
+        if self.registry.touch(token):
             return (token, True)
         else:
             return (token, False)
@@ -41,9 +59,7 @@ class TokenHandler:
 
     # ---------------------------------------------------------------------------
     def remove_token(self, token:str) -> str:
-        if token not in self.tokenset:
+        if not self.registry.close_task(token):
             logger.warning("Trying to remove a nonexisting token. No further action")
             return ''
-        self.tokenset.remove(token)
         return token
-        
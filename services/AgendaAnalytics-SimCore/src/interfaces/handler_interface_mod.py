@@ -7,6 +7,9 @@ class HandlerInterface():
         self.nlp_handler = NLP_handler()
         return
 
-    def analyze_project(self, project):
-        s, m, d = self.nlp_handler.analyze_project(project)
-        return s, m, d
\ No newline at end of file
+    def analyze_project(self, project, progress=None):
+        s, m, d = self.nlp_handler.analyze_project(project, progress)
+        return s, m, d
+
+    def analyze_texts(self, anatexts, reftexts, refstore=None, progress=None):
+        return self.nlp_handler.analyze_texts(anatexts, reftexts, refstore, progress)
@@ -8,6 +8,6 @@ class VisualizerInterface():
         self.visualizer = Visualizer_class()
         return
 
-    def visualize_project(self, project):
-        s, m, d = self.visualizer.visualize_project(project)
+    def visualize_project(self, project, progress=None):
+        s, m, d = self.visualizer.visualize_project(project, progress)
         return s, m, d
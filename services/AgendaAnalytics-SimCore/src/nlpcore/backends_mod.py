@@ -0,0 +1,154 @@
+import inspect
+import logging
+import os
+
+import torch
+from dynaconf import settings
+
+ONNXFOLDER = settings.ONNXFOLDER
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+
+def onnx_model_path(model_name:str, quantized:bool=False) -> str:
+    """
+    location of the exported ONNX model of a sentence transformer
+    """
+    filename = "model.int8.onnx" if quantized else "model.onnx"
+    return os.path.join(ONNXFOLDER, model_name.replace("/", "__"), filename)
+
+
+class TorchBackend:
+    """
+    The original encoder path. Sentence transformers runs the
+    transformer in PyTorch.
+    """
+
+    name = "torch"
+
+    def __init__(self, model):
+        self.model = model
+        return
+
+    def encode(self, texts, batch_size):
+        return self.model.encode(texts, batch_size=batch_size, convert_to_tensor=True)
+
+
+class OnnxBackend:
+    """
+    Encoder path through ONNX Runtime. Only the transformer itself runs
+    in ONNX Runtime, optionally with int8 dynamically quantized weights.
+    Tokenization and the modules following the transformer (pooling,
+    normalization) are taken over from the sentence transformer such
+    that the embeddings correspond to the PyTorch path.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model, model_name:str, quantized:bool=False):
+        #
+        # onnxruntime is only required if this backend is configured
+        #
+        import onnxruntime as ort
+
+        path = onnx_model_path(model_name, quantized)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No ONNX export at {path}. Run simcore_onnx_tool.py export first.")
+        self.model = model
+        self.name = "onnx-int8" if quantized else "onnx"
+        self.session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.modules = list(model._modules.values())[1:]
+        logger.info(f"ONNX backend {self.name} loaded from {path}")
+        return
+
+    @torch.no_grad()
+    def encode(self, texts, batch_size):
+        #
+        # like sentence transformers, sort by length to reduce padding
+        # and restore the original order at the end
+        #
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        embeddings = [None for _ in texts]
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            features = self.model.tokenize([texts[i] for i in batch])
+            feeds = {name: features[name].numpy() for name in self.input_names}
+            features["token_embeddings"] = torch.from_numpy(self.session.run(None, feeds)[0])
+            for module in self.modules:
+                features = module(features)
+            for i, emb in zip(batch, features["sentence_embedding"]):
+                embeddings[i] = emb
+        return torch.stack(embeddings)
+
+
+class TokenEmbeddings(torch.nn.Module):
+    """
+    wraps the transformer of a sentence transformer for the export
+    such that it takes positional inputs and returns token embeddings
+    """
+
+    def __init__(self, auto_model, input_names):
+        super().__init__()
+        self.auto_model = auto_model
+        self.input_names = input_names
+
+    def forward(self, *inputs):
+        return self.auto_model(**dict(zip(self.input_names, inputs)), return_dict=False)[0]
+
+
+def export_onnx(model, model_name:str, quantize:bool=True):
+    """
+    export the transformer of a sentence transformer to ONNX and,
+    if asked for, write an int8 dynamically quantized copy next to it.
+    Dynamic quantization derives its scales at runtime and therefore
+    needs no calibration data.
+    """
+    path = onnx_model_path(model_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    features = model.tokenize(["A sample sentence for tracing the transformer."])
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in features]
+    wrapper = TokenEmbeddings(model[0].auto_model, input_names).eval()
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+
+    #
+    # newer torch versions default to the dynamo exporter, which does
+    # not take dynamic_axes. The TorchScript exporter is used throughout.
+    #
+    kwargs = dict()
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        kwargs["dynamo"] = False
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapper,
+            tuple(features[name] for name in input_names),
+            path,
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            **kwargs,
+        )
+    exported = [path]
+    logger.info(f"Exported {model_name} to {path}")
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        qpath = onnx_model_path(model_name, quantized=True)
+        quantize_dynamic(path, qpath, weight_type=QuantType.QInt8)
+        exported.append(qpath)
+        logger.info(f"Quantized {model_name} to {qpath}")
+    return exported
+
+
+def make_backend(model, model_name:str, backend:str="torch"):
+    if backend == "torch":
+        return TorchBackend(model)
+    if backend == "onnx":
+        return OnnxBackend(model, model_name, quantized=False)
+    if backend == "onnx-int8":
+        return OnnxBackend(model, model_name, quantized=True)
+    raise ValueError(f"Unknown encoder backend {backend}")
@@ -0,0 +1,157 @@
+import glob
+import hashlib
+import logging
+import os
+import threading
+
+import numpy as np
+from dynaconf import settings
+
+EMBEDDINGSTORE = settings.EMBEDDINGSTORE
+EMBEDDINGSTORE_MAX_MB = settings.EMBEDDINGSTORE_MAX_MB
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+
+class EmbeddingStore:
+    """
+    Persistent on-disk store for embeddings. An entry holds the vectors
+    of one corpus (the sentences of a document or a document as a whole)
+    as a memory-mappable .npy file. Entries are keyed by the model name,
+    the hash of the texts and the settings used to split the document.
+    The store is bounded in size and evicts least recently used entries.
+    """
+
+    def __init__(self, root=EMBEDDINGSTORE, max_mb=EMBEDDINGSTORE_MAX_MB):
+        self.root = root
+        self.max_bytes = int(max_mb * 2**20) if max_mb else None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        #
+        # the size on disk is only determined once and then kept
+        # up to date by the store operations
+        #
+        self.size = None
+        os.makedirs(self.root, exist_ok=True)
+        return
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def make_key(model_name:str, corpus, split:str) -> str:
+        h = hashlib.sha256()
+        h.update(model_name.encode("utf-8"))
+        h.update(b"\x00")
+        h.update(split.encode("utf-8"))
+        for text in corpus:
+            h.update(b"\x1e")
+            h.update(text.encode("utf-8"))
+        return h.hexdigest()
+
+    # ---------------------------------------------------------------------------
+    def entry_path(self, key:str) -> str:
+        return os.path.join(self.root, key[:2], key + ".npy")
+
+    # ---------------------------------------------------------------------------
+    def entries(self):
+        return glob.glob(os.path.join(self.root, "*", "*.npy"))
+
+    # ---------------------------------------------------------------------------
+    def get(self, key:str):
+        """
+        return the memory-mapped embeddings stored under key or None.
+        The access time is recorded in the file mtime for LRU eviction.
+        """
+        path = self.entry_path(key)
+        try:
+            embeddings = np.load(path, mmap_mode="r")
+            os.utime(path)
+        except (OSError, ValueError):
+            with self.lock:
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        return embeddings
+
+    # ---------------------------------------------------------------------------
+    def put(self, key:str, embeddings:np.ndarray):
+        path = self.entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        #
+        # several workers may share the store. Writing to a temporary
+        # file and renaming it makes the entry appear atomically.
+        #
+        tmppath = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmppath, "wb") as f:
+            np.save(f, np.ascontiguousarray(embeddings, dtype=np.float32))
+        #
+        # an entry written before under the same key is replaced and
+        # its size no longer counts
+        #
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        os.replace(tmppath, path)
+        with self.lock:
+            if self.size is not None:
+                self.size += os.path.getsize(path) - replaced
+        self.evict()
+        return path
+
+    # ---------------------------------------------------------------------------
+    def evict(self):
+        """
+        remove least recently used entries until the store fits its bound
+        """
+        if self.max_bytes is None:
+            return
+        with self.lock:
+            if self.size is not None and self.size <= self.max_bytes:
+                return
+            stats = list()
+            for path in self.entries():
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                stats.append((st.st_mtime, st.st_size, path))
+            self.size = sum(size for _, size, _ in stats)
+            stats.sort()
+            for _, size, path in stats:
+                if self.size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                self.size -= size
+                self.evictions += 1
+                logger.info(f"Evicted embeddings {os.path.basename(path)}")
+        return
+
+    # ---------------------------------------------------------------------------
+    def get_stats(self):
+        entries = self.entries()
+        size = sum(os.path.getsize(path) for path in entries if os.path.exists(path))
+        with self.lock:
+            self.size = size
+            lookups = self.hits + self.misses
+            return {
+                "root": self.root,
+                "entries": len(entries),
+                "size_mb": round(size / 2**20, 2),
+                "max_mb": round(self.max_bytes / 2**20, 2) if self.max_bytes else None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+            }
+
+
+#
+# the store shared by all handlers of this worker process
+#
+store = EmbeddingStore()
@@ -0,0 +1,215 @@
+import logging
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+
+from dynaconf import settings
+from sentence_transformers import SentenceTransformer
+
+from nlpcore.backends_mod import make_backend
+
+MODEL_NAME = settings.MODEL_NAME
+ENCODER_WORKERS = settings.ENCODER_WORKERS
+BACKENDS = settings.BACKENDS
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of sentence transformer models. Each model
+    is loaded from disk only once per worker process and then kept warm
+    for all subsequent analyses. Handlers do not own their models but
+    borrow them from this registry.
+    """
+
+    def __init__(self):
+        self.models = dict()
+        self.load_info = dict()
+        self.pools = dict()
+        self.backends = dict()
+        self.padding = dict()
+        self.lock = threading.Lock()
+        return
+
+    # ---------------------------------------------------------------------------
+    def get_model(self, model_name=None) -> SentenceTransformer:
+        """
+        return the resident model with the given name. The model is
+        loaded on first request. If no name is given the configured
+        default model is returned.
+        """
+        if model_name is None:
+            model_name = MODEL_NAME
+        #
+        # loading takes seconds. The lock makes sure that two concurrent
+        # requests do not load the same model twice.
+        #
+        with self.lock:
+            if model_name not in self.models:
+                logger.info(f"Loading model {model_name}")
+                start = time.time()
+                self.models[model_name] = SentenceTransformer(model_name)
+                self.load_info[model_name] = {
+                    "loaded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "load_seconds": round(time.time() - start, 3),
+                }
+                logger.info(f"Model {model_name} resident after {self.load_info[model_name]['load_seconds']}s")
+            return self.models[model_name]
+
+    # ---------------------------------------------------------------------------
+    def get_backend(self, model_name=None, backend=None):
+        """
+        return the encoder backend of a model. Unless given explicitly
+        the backend is configured per model in settings.toml and
+        defaults to PyTorch.
+        """
+        if model_name is None:
+            model_name = MODEL_NAME
+        if backend is None:
+            backend = BACKENDS.get(model_name, "torch")
+        model = self.get_model(model_name)
+        with self.lock:
+            if (model_name, backend) not in self.backends:
+                self.backends[(model_name, backend)] = make_backend(model, model_name, backend)
+            return self.backends[(model_name, backend)]
+
+    # ---------------------------------------------------------------------------
+    def warm_up(self, model_names=None):
+        """
+        load a list of models in advance such that the first analysis
+        does not pay for loading them
+        """
+        if not model_names:
+            model_names = [MODEL_NAME]
+        for model_name in model_names:
+            self.get_backend(model_name)
+        return list(model_names)
+
+    # ---------------------------------------------------------------------------
+    @contextmanager
+    def use_pool(self, model_name=None, workers=ENCODER_WORKERS):
+        """
+        the pool of encoder worker processes for the given model, held
+        exclusively until the block ends. Every worker holds its own copy
+        of the model. The pool is started on first request and then kept
+        running like the model itself.
+
+        The input and output queues of a pool are shared by all callers,
+        concurrent encodes (e.g. of two job threads) would take each
+        other's chunks. The lock of the pool is therefore held for the
+        whole encode, and stopping the pool waits for it.
+        """
+        if model_name is None:
+            model_name = MODEL_NAME
+        model = self.get_model(model_name)
+        while True:
+            with self.lock:
+                if model_name not in self.pools:
+                    logger.info(f"Starting {workers} encoder workers for {model_name}")
+                    pool = model.start_multi_process_pool(target_devices=["cpu"] * workers)
+                    self.pools[model_name] = {"pool": pool, "workers": workers, "lock": threading.Lock(), "stopped": False}
+                entry = self.pools[model_name]
+            with entry["lock"]:
+                #
+                # the pool may have been stopped while waiting for it
+                #
+                if not entry["stopped"]:
+                    yield entry["pool"]
+                    return
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def stop_pool(model_name, entry):
+        """
+        stop a pool removed from the registry once its current user is done
+        """
+        with entry["lock"]:
+            SentenceTransformer.stop_multi_process_pool(entry["pool"])
+            entry["stopped"] = True
+        logger.info(f"Encoder workers for {model_name} stopped")
+        return
+
+    # ---------------------------------------------------------------------------
+    def stop_pools(self):
+        with self.lock:
+            pools, self.pools = self.pools, dict()
+        for model_name, entry in pools.items():
+            self.stop_pool(model_name, entry)
+        return
+
+    # ---------------------------------------------------------------------------
+    def release(self, model_name) -> bool:
+        with self.lock:
+            if model_name not in self.models:
+                return False
+            entry = self.pools.pop(model_name, None)
+            for key in [key for key in self.backends if key[0] == model_name]:
+                del self.backends[key]
+            del self.models[model_name]
+            del self.load_info[model_name]
+        if entry is not None:
+            self.stop_pool(model_name, entry)
+        logger.info(f"Model {model_name} released")
+        return True
+
+    # ---------------------------------------------------------------------------
+    def record_padding(self, model_name, real_tokens:int, padded_tokens:int):
+        """
+        account the tokens of encoded batches with and without padding
+        """
+        with self.lock:
+            counts = self.padding.setdefault(model_name, {"real_tokens": 0, "padded_tokens": 0})
+            counts["real_tokens"] += real_tokens
+            counts["padded_tokens"] += padded_tokens
+        return
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def model_memory(model) -> int:
+        """
+        memory in bytes occupied by parameters and buffers of a model
+        """
+        nbytes = sum(p.numel() * p.element_size() for p in model.parameters())
+        nbytes += sum(b.numel() * b.element_size() for b in model.buffers())
+        return nbytes
+
+    # ---------------------------------------------------------------------------
+    def get_resident_models(self):
+        with self.lock:
+            resident = list()
+            for model_name, model in self.models.items():
+                info = {
+                    "name": model_name,
+                    "device": str(model.device),
+                    "max_seq_length": model.max_seq_length,
+                    "memory_mb": round(self.model_memory(model) / 2**20, 2),
+                    "encoder_workers": self.pools[model_name]["workers"] if model_name in self.pools else 0,
+                    "backends": [backend for name, backend in self.backends if name == model_name],
+                    "padding_waste_ratio": None,
+                }
+                #
+                # share of the encoded tokens that were padding
+                #
+                counts = self.padding.get(model_name)
+                if counts and counts["padded_tokens"]:
+                    info["padding_waste_ratio"] = round(1 - counts["real_tokens"] / counts["padded_tokens"], 4)
+                info.update(self.load_info[model_name])
+                resident.append(info)
+        return resident
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def process_memory_mb() -> float:
+        """
+        peak resident set size of this worker process (linux reports kB)
+        """
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2)
+
+
+#
+# the one registry of this worker process
+#
+registry = ModelRegistry()
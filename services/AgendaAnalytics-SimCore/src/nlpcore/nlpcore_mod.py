@@ -1,60 +1,322 @@
-import logging
-import os
-
-from sentence_transformers import SentenceTransformer, util
-
-logger = logging.getLogger(os.path.basename(__file__))
-
-
-class NLPCore:
-
-    def __init__(self):
-        """
-        Initialize NLPCore class that manages a reference text and a 
-        text to be analyzed on a 1:1 basis. Any further sophistication has to
-        be carried out by the encompassing module that will address the actual
-        use case in a more specific way.
-        """
-        #
-        # the main embedder
-        #
-        #self.model = SentenceTransformer('T-Systems-onsite/cross-en-de-roberta-sentence-transformer')
-        #
-        # take a very small model for testing the code
-        #
-        self.model = SentenceTransformer("sentence-transformers/paraphrase-albert-small-v2")
-        return
-    
-
-    def embed(self, input):
-        return self.model.encode(input, convert_to_tensor=True)
-
-    ################################################################
-    #
-    #       generate embeddings for the reference corpus
-    #
-    def embed_corpus(self, corpus):
-        """
-        embed a corpus stored as sentences in a list
-        """
-        embeddings = self.embed(corpus)
-        assert embeddings.shape[0] == len(corpus)
-        return embeddings
-
-
-    ################################################################
-    #
-    #       generate similarity matrix
-    #
-    def gen_sim_matrix(self, emb1, emb2):
-        """
-        generate sim matrix. emb1 and emb2 hereby have to be
-        tensorflow tensors. The cosine similarity between all
-        encompassing vectors is hereby calculated. We set negative
-        similarity values to zero since they actually indicate
-        dissimilarity
-        """
-        simarr = util.cos_sim(emb1, emb2)
-        simarr = simarr.numpy()
-        simarr[simarr<0.0] = 0.0
-        return simarr
+import logging
+import os
+
+import numpy as np
+import torch
+from dynaconf import settings
+from sentence_transformers import util
+
+from nlpcore.model_registry_mod import registry, MODEL_NAME
+from nlpcore.embedding_store_mod import store
+
+EMBED_BATCH_SIZE = settings.EMBED_BATCH_SIZE
+EMBEDDINGSTORE_ENABLED = settings.EMBEDDINGSTORE_ENABLED
+ENCODER_WORKERS = settings.ENCODER_WORKERS
+ENCODER_POOL_MIN_SENTENCES = settings.ENCODER_POOL_MIN_SENTENCES
+EMBED_TOKEN_BUDGET = settings.EMBED_TOKEN_BUDGET
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+
+class NLPCore:
+
+    def __init__(self, model_name=None):
+        """
+        Initialize NLPCore class that manages a reference text and a 
+        text to be analyzed on a 1:1 basis. Any further sophistication has to
+        be carried out by the encompassing module that will address the actual
+        use case in a more specific way.
+        """
+        #
+        # the main embedder is configured in settings.toml. It is not
+        # loaded here but borrowed from the process-wide model registry
+        # where it stays warm between analyses.
+        #
+        self.model_name = model_name if model_name else MODEL_NAME
+        self.model = registry.get_model(self.model_name)
+        self.backend = registry.get_backend(self.model_name)
+        #
+        # embeddings of corpora that were seen before are taken from
+        # the persistent embedding store
+        #
+        self.store = store if EMBEDDINGSTORE_ENABLED else None
+        return
+    
+
+    def embed(self, input, batch_size=EMBED_BATCH_SIZE):
+        #
+        # large corpora are sharded over the encoder worker processes
+        # if there are any. The results come back in input order.
+        # The pool always runs the PyTorch backend and serves one
+        # encode at a time.
+        #
+        if self.backend.name == "torch" and ENCODER_WORKERS > 1 and len(input) >= ENCODER_POOL_MIN_SENTENCES:
+            with registry.use_pool(self.model_name) as pool:
+                embeddings = self.model.encode_multi_process(input, pool, batch_size=batch_size)
+            return torch.from_numpy(embeddings)
+        if EMBED_TOKEN_BUDGET and len(input) > 1:
+            return self.embed_bucketed(input, EMBED_TOKEN_BUDGET)
+        return self.backend.encode(input, batch_size)
+
+
+    ################################################################
+    #
+    #       encode length buckets with a token budget per batch
+    #
+    def embed_bucketed(self, input, token_budget):
+        """
+        sort the texts into buckets of similar token length (powers of
+        two up to the maximum sequence length of the model) and encode
+        every bucket with as many texts per batch as fit into the token
+        budget. Short fragments are thus encoded in large batches and
+        long run-on sentences in small ones, and neither pads up to the
+        other. The embeddings are returned in input order.
+        """
+        max_length = self.model.max_seq_length
+        lengths = self.model.tokenizer(input, truncation=True, max_length=max_length, return_length=True)["length"]
+        buckets = dict()
+        for i, length in enumerate(lengths):
+            bucket = 16
+            while bucket < length:
+                bucket *= 2
+            buckets.setdefault(min(bucket, max_length), []).append(i)
+
+        embeddings = [None for _ in input]
+        real_tokens = 0
+        padded_tokens = 0
+        for bucket, indices in sorted(buckets.items()):
+            batch_size = max(1, token_budget // bucket)
+            encoded = self.backend.encode([input[i] for i in indices], batch_size)
+            for i, emb in zip(indices, encoded):
+                embeddings[i] = emb
+            #
+            # the encoder pads every batch to its longest text. Batches
+            # are formed from the texts sorted by length.
+            #
+            bucket_lengths = sorted((lengths[i] for i in indices), reverse=True)
+            for start in range(0, len(bucket_lengths), batch_size):
+                batch = bucket_lengths[start:start + batch_size]
+                real_tokens += sum(batch)
+                padded_tokens += batch[0] * len(batch)
+        registry.record_padding(self.model_name, real_tokens, padded_tokens)
+        logger.info(f"Encoded {len(input)} texts in {len(buckets)} length buckets, "
+                    f"padding waste {1 - real_tokens / padded_tokens:.3f}")
+        return torch.stack(embeddings)
+
+
+    ################################################################
+    #
+    #       generate embeddings for the reference corpus
+    #
+    def embed_corpus(self, corpus, split=None, batch_size=EMBED_BATCH_SIZE):
+        """
+        embed a corpus stored as sentences in a list. If split names
+        the way the corpus was formed from its document the persistent
+        embedding store is consulted before encoding.
+        """
+        if split is not None:
+            return self.embed_corpora([corpus], split, batch_size)[0]
+        embeddings = self.embed(corpus, batch_size)
+        assert embeddings.shape[0] == len(corpus)
+        return embeddings
+
+
+    ################################################################
+    #
+    #       generate embeddings for several corpora at once
+    #
+    def embed_corpora(self, corpora, split=None, batch_size=EMBED_BATCH_SIZE, store=None):
+        """
+        embed a list of corpora (each stored as sentences in a list)
+        in one batched encoder pass. One embedding tensor is returned
+        per corpus, in the order of the corpora. Corpora found in the
+        embedding store are not encoded again. A store given explicitly
+        (e.g. the one of a registered reference corpus) replaces the
+        shared store.
+        """
+        return self.embed_groups([(corpora, split, store)], batch_size)[0]
+
+
+    ################################################################
+    #
+    #       generate embeddings for several groups of corpora
+    #
+    def embed_groups(self, groups, batch_size=EMBED_BATCH_SIZE):
+        """
+        embed several groups of corpora, each given as a tuple
+        (corpora, split, store) with the meaning of embed_corpora, in
+        one encoder pass. This way e.g. the documents and the sentences
+        of the same texts share the length buckets and batches of the
+        encoder. The embeddings are returned as one list per group.
+        """
+        items = list()
+        for corpora, split, store in groups:
+            if store is None:
+                store = self.store
+            items += [(corpus, split, store) for corpus in corpora]
+        embeddings = [None for _ in items]
+        keys = [None for _ in items]
+        #
+        # embeddings of other backends differ slightly from the
+        # PyTorch ones and are stored separately
+        #
+        model_key = self.model_name
+        if self.backend.name != "torch":
+            model_key = f"{self.model_name}#{self.backend.name}"
+        for i, (corpus, split, store) in enumerate(items):
+            if split is not None and store is not None:
+                keys[i] = store.make_key(model_key, corpus, split)
+                cached = store.get(keys[i])
+                if cached is not None:
+                    embeddings[i] = torch.from_numpy(np.array(cached))
+
+        missing = [i for i, emb in enumerate(embeddings) if emb is None]
+        if missing:
+            sizes = [len(items[i][0]) for i in missing]
+            flat = [sentence for i in missing for sentence in items[i][0]]
+            encoded = torch.split(self.embed_corpus(flat, batch_size=batch_size), sizes)
+            for i, emb in zip(missing, encoded):
+                embeddings[i] = emb
+                if keys[i] is not None:
+                    items[i][2].put(keys[i], emb.cpu().numpy())
+
+        grouped = list()
+        start = 0
+        for corpora, _, _ in groups:
+            grouped.append(embeddings[start:start + len(corpora)])
+            start += len(corpora)
+        return grouped
+
+
+    ################################################################
+    #
+    #       split long documents into token windows
+    #
+    def chunk_document(self, text, chunk_tokens=None, max_chunks=None):
+        """
+        split a document into consecutive windows of at most chunk_tokens
+        tokens such that no part of it gets truncated by the encoder.
+        The chunks are cut from the original text along the token offsets.
+        At most max_chunks chunks are returned.
+        """
+        tokenizer = self.model.tokenizer
+        if not chunk_tokens:
+            #
+            # leave room for the special tokens added by the encoder
+            #
+            chunk_tokens = self.model.max_seq_length - 2
+        if tokenizer.is_fast:
+            encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)
+            offsets = encoding["offset_mapping"]
+            chunks = [text[offsets[i][0]:offsets[min(i + chunk_tokens, len(offsets)) - 1][1]]
+                      for i in range(0, len(offsets), chunk_tokens)]
+        else:
+            ids = tokenizer(text, add_special_tokens=False, verbose=False)["input_ids"]
+            chunks = [tokenizer.decode(ids[i:i + chunk_tokens])
+                      for i in range(0, len(ids), chunk_tokens)]
+        chunks = [chunk for chunk in chunks if chunk.strip()]
+        if max_chunks:
+            chunks = chunks[:max_chunks]
+        return chunks if chunks else [text]
+
+
+    ################################################################
+    #
+    #       pool chunk embeddings into one document vector
+    #
+    @staticmethod
+    def pool_embeddings(embeddings, pooling="mean"):
+        """
+        pool the chunk embeddings of one document. "mean" and "max" work
+        elementwise, "attention" weights every chunk by the softmax of its
+        scaled agreement with the mean of all chunks.
+        """
+        if pooling == "mean":
+            return embeddings.mean(dim=0)
+        if pooling == "max":
+            return embeddings.max(dim=0).values
+        if pooling == "attention":
+            scores = embeddings @ embeddings.mean(dim=0) / embeddings.shape[1] ** 0.5
+            weights = torch.softmax(scores, dim=0)
+            return weights @ embeddings
+        raise ValueError(f"Unknown pooling {pooling}")
+
+
+    ################################################################
+    #
+    #       generate similarity matrix
+    #
+    @staticmethod
+    def gen_sim_matrix(emb1, emb2):
+        """
+        generate sim matrix. emb1 and emb2 hereby have to be
+        tensorflow tensors. The cosine similarity between all
+        encompassing vectors is hereby calculated. We set negative
+        similarity values to zero since they actually indicate
+        dissimilarity
+        """
+        simarr = util.cos_sim(emb1, emb2)
+        simarr = simarr.numpy()
+        simarr[simarr<0.0] = 0.0
+        return simarr
+
+
+    ################################################################
+    #
+    #       generate similarity matrices against several blocks
+    #
+    @staticmethod
+    def gen_sim_blocks(emb1, emb_blocks):
+        """
+        generate the sim matrices of emb1 against each tensor in
+        emb_blocks. The blocks are stacked such that all similarities
+        are computed by a single matrix multiply. The result is sliced
+        back into one array per block.
+        """
+        sizes = [emb.shape[0] for emb in emb_blocks]
+        simarr = NLPCore.gen_sim_matrix(emb1, torch.cat(emb_blocks))
+        offsets = np.cumsum([0] + sizes)
+        return [simarr[:, offsets[i]:offsets[i + 1]] for i in range(len(sizes))]
+
+
+    ################################################################
+    #
+    #       generate sparse similarities against several blocks
+    #
+    @staticmethod
+    def gen_topk_blocks(emb1, emb_blocks, top_k=5, threshold=0.0, row_chunk=2048):
+        """
+        sparse counterpart of gen_sim_blocks. For every row of emb1 only
+        the top_k most similar entries of each block are kept (all entries
+        if top_k is 0), and of those only the ones above threshold. The
+        dense matrix is never materialized beyond row_chunk rows. In the
+        same pass the mean over the nonzero entries (nan if there are none)
+        and the maximum of every full row are computed per block.
+        Each block is returned as a dict of COO arrays "rows", "cols",
+        "values" and the row aggregates "row_mean" and "row_max".
+        """
+        sizes = [emb.shape[0] for emb in emb_blocks]
+        offsets = np.cumsum([0] + sizes)
+        stacked = torch.cat(emb_blocks)
+        parts = [{"rows": [], "cols": [], "values": [], "row_mean": [], "row_max": []} for _ in sizes]
+
+        for start in range(0, emb1.shape[0], row_chunk):
+            simarr = util.cos_sim(emb1[start:start + row_chunk], stacked)
+            simarr = simarr.clamp(min=0.0)
+            for b, part in enumerate(parts):
+                block = simarr[:, offsets[b]:offsets[b + 1]]
+                nonzero = (block > 0.0).sum(dim=1)
+                part["row_mean"].append((block.sum(dim=1) / nonzero).numpy())
+                part["row_max"].append(block.max(dim=1).values.numpy())
+                if top_k:
+                    values, cols = block.topk(min(top_k, block.shape[1]), dim=1)
+                    rows = torch.arange(block.shape[0]).unsqueeze(1).expand_as(cols)
+                else:
+                    rows, cols = torch.nonzero(block, as_tuple=True)
+                    values = block[rows, cols]
+                keep = (values > threshold) & (values > 0.0)
+                part["rows"].append((rows[keep] + start).numpy())
+                part["cols"].append(cols[keep].numpy())
+                part["values"].append(values[keep].numpy())
+
+        return [{key: np.concatenate(value) for key, value in part.items()} for part in parts]
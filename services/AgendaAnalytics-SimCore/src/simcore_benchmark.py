@@ -0,0 +1,69 @@
+##########################################################################################
+###  Benchmarks for the SimCore NLP core. Run from the SimCore root directory such
+###  that settings.toml is found, e.g.
+###
+###  python src/simcore_benchmark.py encoder_pool --textfile analysis.txt --max-workers 8
+##########################################################################################
+
+import argparse
+import os
+import time
+
+from sentence_transformers import SentenceTransformer
+
+from nlpcore.model_registry_mod import registry, MODEL_NAME
+from nlpcore.nlpcore_mod import EMBED_BATCH_SIZE
+from utils.preprocessing_mod import Preprocessing
+
+
+################################################################################
+#
+# sentences/second of the encoder for 1 to N worker processes on the
+# sentences of a large analysis text
+#
+def bench_encoder_pool(args):
+
+    with open(args.textfile, "r") as f:
+        corpus = Preprocessing().make_corpus_from_text(f.read())
+    model = registry.get_model(args.model)
+    print(f"{len(corpus)} sentences, model {args.model}, {os.cpu_count()} cores")
+    print(f"{'workers':>8} {'seconds':>10} {'sentences/s':>12} {'speedup':>8}")
+
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        if workers == 1:
+            start = time.time()
+            model.encode(corpus, batch_size=args.batch_size)
+            elapsed = time.time() - start
+        else:
+            #
+            # the pool is started outside the timing since it is kept
+            # warm in the service as well
+            #
+            pool = model.start_multi_process_pool(target_devices=["cpu"] * workers)
+            start = time.time()
+            model.encode_multi_process(corpus, pool, batch_size=args.batch_size)
+            elapsed = time.time() - start
+            SentenceTransformer.stop_multi_process_pool(pool)
+        if baseline is None:
+            baseline = elapsed
+        print(f"{workers:>8} {elapsed:>10.2f} {len(corpus) / elapsed:>12.1f} {baseline / elapsed:>8.2f}")
+
+
+################################################################################
+#
+# main
+#
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SimCore benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    pool_parser = subparsers.add_parser("encoder_pool", help="encoder throughput for 1..N worker processes")
+    pool_parser.add_argument("--textfile", required=True, help="large analysis text")
+    pool_parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    pool_parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE)
+    pool_parser.add_argument("--model", default=MODEL_NAME)
+    pool_parser.set_defaults(func=bench_encoder_pool)
+
+    args = parser.parse_args()
+    args.func(args)
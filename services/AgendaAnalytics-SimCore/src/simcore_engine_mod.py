@@ -0,0 +1,110 @@
+##########################################################################################
+###  Library interface of SimCore for services that run in the same process, e.g.
+###
+###  from simcore_engine_mod import SimCoreEngine
+###  results = SimCoreEngine().analyze_texts({"analysis.txt": text}, reference_texts,
+###                                          analyzers=["coarse", "detailed"])
+###
+###  The analyzers are the ones of the REST API, which wraps them around project
+###  folders. The engine takes the texts in memory and returns the results as
+###  pandas dataframes without writing any files.
+##########################################################################################
+
+import io
+import logging
+import os
+
+from dynaconf import settings
+
+from interfaces.handler_interface_mod import HandlerInterface
+from handlers.dispatcher_mod import NLP_handlers
+from handlers.corpus_handler_mod import corpora
+from handlers.abstract_handler_mod import AbstractHandler
+from utils.resultwriter_mod import Resultwriter
+
+REFFOLDERNAME = settings.REFFOLDERNAME
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+
+class SimCoreEngine:
+    """
+    Runs the SimCore analyzers on texts given in memory. Models, the
+    embedding store and the registered corpora are shared with everything
+    else in the process, such that reference texts that were embedded
+    before are not encoded again.
+    """
+
+    def __init__(self):
+        return
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def available_analyzers():
+        return list(NLP_handlers.keys())
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def as_texts(texts):
+        """
+        texts as list of (name, text) tuples from a dict or an iterable
+        of tuples. Empty texts are omitted like empty files of a project.
+        """
+        if isinstance(texts, dict):
+            texts = texts.items()
+        return [(name, text) for name, text in texts if text]
+
+    # ---------------------------------------------------------------------------
+    def analyze_texts(self, analysis_texts, reference_texts=None, analyzers=("coarse",), corpus_id=None, progress=None):
+        """
+        analyze the analysis texts against the reference texts, or against
+        the registered corpus corpus_id, with each of the analyzers. Texts
+        are given as {name: text} or as (name, text) tuples. Returns
+        {analyzer: {result name: dataframe}} where the result names are the
+        file names of the REST API without extension, e.g.
+        "analysis.txt.coarse" or "analysis.txt$sdg.1-2.txt.detailed".
+        progress(analyzer, done, total) is called as the analyzers proceed.
+        """
+        unknown = [analyzer for analyzer in analyzers if analyzer not in NLP_handlers]
+        if unknown:
+            raise ValueError(f"NLP analyzer {', '.join(unknown)} not implemented, available: {', '.join(NLP_handlers)}")
+        if (reference_texts is None) == (corpus_id is None):
+            raise ValueError("Either reference_texts or corpus_id must be given")
+
+        anatexts = self.as_texts(analysis_texts)
+        if corpus_id is not None:
+            if not corpora.valid_corpus_id(corpus_id) or corpora.get_meta(corpus_id) is None:
+                raise ValueError(f"Corpus {corpus_id} is not registered")
+            #
+            # registered corpora come with their precomputed embeddings,
+            # the version stays readable until the analyzers are done
+            #
+            with corpora.reading(corpus_id) as versiondir:
+                reftexts = AbstractHandler.read_texts(os.path.join(versiondir, REFFOLDERNAME))
+                return self.run_analyzers(anatexts, reftexts, corpora.get_store(versiondir), analyzers, progress)
+        return self.run_analyzers(anatexts, self.as_texts(reference_texts), None, analyzers, progress)
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def run_analyzers(anatexts, reftexts, refstore, analyzers, progress=None):
+        results = dict()
+        for analyzer in analyzers:
+            logger.info(f"Analyzing {len(anatexts)} against {len(reftexts)} texts with {analyzer}")
+            callback = None
+            if progress:
+                callback = lambda done, total, analyzer=analyzer: progress(analyzer, done, total)
+            hi = HandlerInterface(NLP_handlers[analyzer])
+            results[analyzer] = {
+                f"{name}.{tag}": rdf for name, tag, rdf in hi.analyze_texts(anatexts, reftexts, refstore, callback)
+            }
+        return results
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def result_bytes(rdf) -> bytes:
+        """
+        a result as the parquet file the REST API would have written
+        """
+        with io.BytesIO() as fh:
+            Resultwriter.write_parquet(rdf, fh)
+            return fh.getvalue()
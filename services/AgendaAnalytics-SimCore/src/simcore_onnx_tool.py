@@ -0,0 +1,94 @@
+##########################################################################################
+###  Export of sentence transformer models to ONNX and accuracy check of the ONNX
+###  backends against PyTorch. Run from the SimCore root directory such that
+###  settings.toml is found, e.g.
+###
+###  python src/simcore_onnx_tool.py export
+###  python src/simcore_onnx_tool.py check --backend onnx-int8
+##########################################################################################
+
+import argparse
+import os
+import sys
+import time
+
+from sentence_transformers import util
+
+from nlpcore.backends_mod import export_onnx, make_backend, TorchBackend
+from nlpcore.model_registry_mod import registry, MODEL_NAME
+from nlpcore.nlpcore_mod import EMBED_BATCH_SIZE
+
+FIXTURE_CORPUS = os.path.join(os.path.dirname(__file__), "nlpcore", "fixtures", "backend_check_corpus.txt")
+
+
+################################################################################
+#
+# export the transformer of a model to ONNX plus an int8 quantized copy.
+# Dynamic quantization computes the activation scales at runtime, so no
+# calibration corpus is needed.
+#
+def export(args):
+    model = registry.get_model(args.model)
+    for path in export_onnx(model, args.model, quantize=not args.no_quantize):
+        print(f"{path} {os.path.getsize(path) / 2**20:.1f} MB")
+    return 0
+
+
+################################################################################
+#
+# compare the cosine scores of all sentence pairs of the fixture corpus
+# between PyTorch and the ONNX backend. The check fails if any score
+# deviates by more than the tolerance.
+#
+def check(args):
+    with open(args.corpus, "r") as f:
+        corpus = [line.strip() for line in f if line.strip()]
+    model = registry.get_model(args.model)
+    baseline = TorchBackend(model)
+    candidate = make_backend(model, args.model, args.backend)
+
+    scores = dict()
+    for backend in (baseline, candidate):
+        start = time.time()
+        emb = backend.encode(corpus, args.batch_size)
+        elapsed = time.time() - start
+        scores[backend.name] = util.cos_sim(emb, emb)
+        print(f"{backend.name:>10} {len(corpus) / elapsed:>10.1f} sentences/s")
+
+    diff = (scores[candidate.name] - scores[baseline.name]).abs()
+    top1 = (scores[candidate.name].fill_diagonal_(-1).argmax(dim=1) == scores[baseline.name].fill_diagonal_(-1).argmax(dim=1)).float().mean()
+    print(f"{len(corpus)} sentences, model {args.model}, backend {candidate.name}")
+    print(f"max abs score deviation  {diff.max().item():.5f}")
+    print(f"mean abs score deviation {diff.mean().item():.5f}")
+    print(f"top-1 agreement          {top1.item():.3f}")
+
+    if diff.max().item() > args.tolerance:
+        print(f"FAILED: deviation above tolerance {args.tolerance}")
+        return 1
+    print("PASSED")
+    return 0
+
+
+################################################################################
+#
+# main
+#
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SimCore ONNX backend tool")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="export a model to ONNX and quantize it to int8")
+    export_parser.add_argument("--model", default=MODEL_NAME)
+    export_parser.add_argument("--no-quantize", action="store_true", help="skip the int8 copy")
+    export_parser.set_defaults(func=export)
+
+    check_parser = subparsers.add_parser("check", help="compare cosine scores of an ONNX backend with PyTorch")
+    check_parser.add_argument("--model", default=MODEL_NAME)
+    check_parser.add_argument("--backend", default="onnx-int8", choices=["onnx", "onnx-int8"])
+    check_parser.add_argument("--corpus", default=FIXTURE_CORPUS, help="one sentence per line")
+    check_parser.add_argument("--tolerance", type=float, default=0.05)
+    check_parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE)
+    check_parser.set_defaults(func=check)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
@@ -1,385 +1,768 @@
-##########################################################################################
-###  FastAPI application can be started with uvicorn main:app --reload
-###  where "main" is the name of the containing Python file and app is the object within
-### the main file holding the FastAPI instance.
-### localhost:XXXXX/openapi.json returns a generated API description of the implemented
-### API.
-##########################################################################################
-
-import os
-import logging
-from io import BytesIO
-
-import uvicorn
-from fastapi import FastAPI, Depends, File, UploadFile
-from fastapi.responses import FileResponse
-
-from simcore_api_schema_mod import SCResponse, Status
-from handlers.token_handler_mod import TokenHandler
-from handlers.dispatcher_mod import Dispatcher
-
-logging.basicConfig(
-    filename=os.path.join("./simcore_events.log"),
-    filemode="a",
-    format="[%(asctime)s] %(levelname)s - %(message)s",
-    datefmt="%m/%d/%Y %I:%M:%S %p",
-    level=logging.INFO,
-)
-logger = logging.getLogger(os.path.basename(__file__))
-
-#
-# instantiate dispatcher and collect methods
-#
-disp = Dispatcher()
-custom_methods = [method_name for method_name in dir(disp) if callable(getattr(disp, method_name))]
-custom_methods = [x for x in custom_methods if not x.startswith("__")]
-
-#
-# instantiate token handler and collect methods
-#
-th = TokenHandler()
-token_methods = [method_name for method_name in dir(th) if callable(getattr(th, method_name))]
-token_methods = [x for x in token_methods if not x.startswith("__")]
-
-#
-# combine the method lists
-#
-custom_methods += token_methods
-
-#
-# return non-func structure in case of valid/invalid token
-#
-SuccessTokenValidation = (Status.SUCCESS, "valid token", {})
-FailedTokenValidation = (Status.FAILED, "invalid token", {})
-
-#
-# definitions to make the appearance of the API endpoints well structured and clear
-#
-tags_metadata = [
-    {
-        "name": "system",
-        "description": "Root entry point for completeness. No specific functionality",
-    },
-    {
-        "name": "tasks",
-        "description": "Start and stop token-based projects. Open task issues a token for all remaining operations"
-    },
-    {
-        "name": "config",
-        "description": "Set type of NLP processing and visualization",
-    },
-    {
-        "name": "status",
-        "description": "Obtain list of active projects and specific information on projects",
-    },
-    {
-        "name": "upload",
-        "description": "Text and reference file upload into an active project",
-    },
-    {
-        "name": "analysis",
-        "description": "Start similarity analysis based on transformer models",
-    },
-    {
-        "name": "downloads",
-        "description": "Download generated files from an active task",
-    },
-]
-
-app = FastAPI(
-    title="SimCore REST API",
-    description="NLP Service to compute document similarities with transformers",
-    version="0.1.0",
-    openapi_tags=tags_metadata
-    # removed server spec, because of CORS error for VM deployment
-    #,
-    # servers=[
-    #     {
-    #         "url": "http://localhost:9060",
-    #         "description": "SimCore Server"
-    #     }
-    # ]
-)
-
-
-################################################################################
-#
-# root entry point. Just returns a json welcome message.
-#
-@app.get("/", tags=["system"])
-async def root_entry():
-    return {"message": "****** REST API SimCore ******"}
-
-
-################################################################################
-#
-# endpoint for opening a task. Here a token will be issued and the
-# folder generated.
-#
-@app.get("/open_task", tags=["tasks"])
-async def open_task() -> SCResponse:
-
-    assert "issue_token" in custom_methods
-    assert "create_project" in custom_methods
-    #
-    # first issue a token, then create a project with the
-    # name of the token. A folder with the token string is 
-    # generated under /projects but this time this folder
-    # is deleted immediately once the token gets invalidated.
-    # *** If the folder can not be generated for some reason
-    # we have to revoke the token immediately in order
-    # to avoid inconsistencies!
-    #
-    token = th.issue_token()
-
-    s, m, d = disp.create_project(token)
-
-    if s == Status.SUCCESS:
-        m = m + " Task activated."
-        d = {"token":token}
-        logger.info(f"Task with token {token} activated.")
-    else:
-        d = {"token":''}
-        rtoken = th.remove_token(token)
-        if rtoken != token:
-            raise ValueError ("** internal error E065 **")
-        logger.error(f"Task folder could bot be generated.")
-    return SCResponse(status=s, message=m, details=d)
-
-
-################################################################################
-#
-# endpoint for closing a task. If the running status is terminated then the
-# token is revoked and the corresponding folder/subfolder is deleted.
-#
-@app.get("/close_task/{token}", tags=["tasks"])
-async def close_task(checked = Depends(th.check_token)) -> SCResponse:
-
-    assert "purge_project" in custom_methods
-
-    token, valid = checked
-    print(token, valid)
-    if not valid:
-        s, m, d = FailedTokenValidation
-    else:
-        rtoken = th.remove_token(token)
-        if rtoken != token:
-            s = Status.FAILED
-            m = f"Internal token handling error: {token} not under control"
-            d = {}
-        else:
-            s, m, d = disp.purge_project(token)
-
-    return SCResponse(status=s, message=m, details=d)
-
-################################################################################
-#
-# endpoint for setting the kind of NLP processing (use case specific)
-# Corresponding routines are provided by the SimCore developers. In the token-based
-# environment we have to persist the requested NLP processing in the corresponding
-# folders and decide in the moment of analysis execution.
-#
-@app.post("/set_analyzer/{token}", tags=["config"])
-async def set_analyzer(analyzer: str, checked = Depends(th.check_token)) -> SCResponse:
-
-    token, valid = checked
-    print(token, valid)
-    if not valid:
-        s, m, d = FailedTokenValidation
-    else:
-        assert "set_analyzer" in custom_methods
-        s, m, d = disp.set_analyzer(token, analyzer)
-
-    return SCResponse(status=s, message=m, details=d)
-
-
-################################################################################
-#
-# endpoint for setting the kind of NLP processing (use case specific)
-# Corresponding routines are provided by the SimCore developers 
-#
-@app.post("/set_visualizer/{token}", tags=["config"])
-async def set_visualizer(sc_visualizer: str, checked = Depends(th.check_token)) -> SCResponse:
-
-    token, valid = checked
-    print(token, valid)
-    if not valid:
-        s, m, d = FailedTokenValidation
-    else:
-        assert "set_visualizer" in custom_methods
-        s, m, d = disp.set_visualizer(token, sc_visualizer)
-
-    return SCResponse(status=s, message=m, details=d)
-
-
-################################################################################
-#
-# endpoint for a list of all active tasks
-#
-@app.get("/get_active_tasks", tags=["status"])
-async def get_active_tasks() -> SCResponse:
-
-    assert "get_active_tasks" in custom_methods
-
-    tasks = th.get_active_tasks()
-    s = Status.SUCCESS
-    m = "collected all active tasks"
-    d = {"active":tasks}
-    return SCResponse(status=s, message=m, details=d)
-
-
-################################################################################
-#
-# endpoint for setting the kind of NLP processing (use case specific)
-# Corresponding routines are provided by the SimCore developers 
-#
-@app.get("/list_task_files/{token}", tags=["status"])
-async def list_task_files(checked = Depends(th.check_token)) -> SCResponse:
-
-    token, valid = checked
-    print(token, valid)
-    if not valid:
-        s, m, d = FailedTokenValidation
-    else:
-        assert "list_task_files" in custom_methods
-        s, m, d = disp.list_task_files(token)
-
-    return SCResponse(status=s, message=m, details=d)
-
-
-################################################################################
-#
-# 2 entry points for uploading reference and analysis texts.
-# The information of the project name is transferred
-# as a >path parameter< in the URL:
-# post .... localhost:XXXX/create/project_name
-#
-# The file upload occurs via the parameter ufile:UploadFile...
-#
-# A corresponding curl call to address this endpoint with project name and file upload
-# would be:
-#
-# curl -i -F "ufile=@/home/user/company_text.txt" localhost:7705/create/demoproject
-#
-# keep in mind that the parameter name in the function and in the curl must be identical
-# otherwise a 422 unprocessable error will occur.
-#
-# we need to utilize a buffer since generating a temporary file in the container
-# with "non-root" permissions is not possible.
-#
-@app.post("/upload_text/{token}", tags=["upload"])
-async def upload_text(ufile: UploadFile = File(...),
-                      checked = Depends(th.check_token)) -> SCResponse:
-
-    token, valid = checked
-    print(token, valid)
-    if not valid:
-        s, m, d = FailedTokenValidation
-    else:
-        assert "upload_text" in custom_methods
-        #
-        # get filename and data from ufile
-        #
-        textfilename = ufile.filename
-        buf = BytesIO(await ufile.read())
-        s, m, d = disp.upload_text(token, textfilename, buf, is_reference=False)
-
-    return SCResponse(status=s, message=m, details=d)
-
-
-################################################################################
-#
-# same for uploading reference. An additional flag is set that indicates that the
-# file uploaded by this endpoint should go into the reference folder.
-#
-@app.post("/upload_reference/{token}", tags=["upload"])
-async def upload_reference(ufile: UploadFile = File(...),
-                      checked = Depends(th.check_token)) -> SCResponse:
-
-    token, valid = checked
-    print(token, valid)
-    if not valid:
-        s, m, d = FailedTokenValidation
-    else:
-        assert "upload_text" in custom_methods
-        #
-        # get filename and data from ufile
-        #
-        reffilename = ufile.filename
-        buf = BytesIO(await ufile.read())
-        s, m, d = disp.upload_text(token, reffilename, buf, is_reference=True)
-
-    return SCResponse(status=s, message=m, details=d)
-
-
-################################################################################
-#
-# endpoint for starting the similarity analysis. The files to be analyzed are not
-# given explicitly because all files uploaded to the project folder will be analyzed
-# and the result returned
-#
-@app.get("/analyze_project/{token}", tags=["analysis"])
-async def analyze_project(checked = Depends(th.check_token)) -> SCResponse:
-
-    token, valid = checked
-    print(token, valid)
-    if not valid:
-        s, m, d = FailedTokenValidation
-    else:
-        assert "analyze_project" in custom_methods
-        s, m, d = disp.analyze_project(token)   # NLP config is read from current folder!
-
-    return SCResponse(status=s, message=m, details=d)
-
-
-################################################################################
-#
-# endpoint for starting the similarity analysis. The files to be analyzed are not
-# given explicitly because all files uploaded to the project folder will be analyzed
-# and the result returned
-#
-@app.get("/visualize_project/{token}", tags=["analysis"])
-async def visualize_project(checked = Depends(th.check_token)) -> SCResponse:
-
-    token, valid = checked
-    print(token, valid)
-    if not valid:
-        s, m, d = FailedTokenValidation
-    else:
-        assert "visualize_project" in custom_methods
-        s, m, d = disp.visualize_project(token)  # VIS is read from current folder!
-
-    return SCResponse(status=s, message=m, details=d)
-
-
-################################################################################
-#
-# endpoint for downloading files that are given by an absolute path
-#
-@app.post("/download_file/{token}", tags=["downloads"])
-async def download_file(afilepath: str, checked = Depends(th.check_token)) -> FileResponse:
-
-    token, valid = checked
-    print(token, valid)
-    if not valid:
-        s, m, d = FailedTokenValidation
-        return None
-    else:
-        assert "download_file" in custom_methods
-        s, m, d = disp.download_file(afilepath)
-        print(m)
-    if s != Status.SUCCESS:
-        return None
-
-    return FileResponse(path=d["file_location"], 
-                        media_type=d["media_type"],
-                        filename=d["filename"])
-
-
-################################################################################
-#
-# main
-#
-if __name__ == "__main__":
-    logger.info("*** SimCore REST interface started ***")
-    uvicorn.run(app, host="0.0.0.0", port=9060, workers=1)
+##########################################################################################
+###  FastAPI application can be started with uvicorn main:app --reload
+###  where "main" is the name of the containing Python file and app is the object within
+### the main file holding the FastAPI instance.
+### localhost:XXXXX/openapi.json returns a generated API description of the implemented
+### API.
+##########################################################################################
+
+import os
+import json
+import logging
+from typing import List, Optional
+
+import uvicorn
+from dynaconf import settings
+from fastapi import FastAPI, Depends, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+
+from simcore_api_schema_mod import SCResponse, Status
+from handlers.token_handler_mod import TokenHandler
+from handlers.dispatcher_mod import Dispatcher
+from handlers.job_handler_mod import JobHandler
+from handlers.task_reaper_mod import TaskReaper
+from nlpcore.model_registry_mod import MODEL_NAME
+
+logging.basicConfig(
+    filename=os.path.join("./simcore_events.log"),
+    filemode="a",
+    format="[%(asctime)s] %(levelname)s - %(message)s",
+    datefmt="%m/%d/%Y %I:%M:%S %p",
+    level=logging.INFO,
+)
+logger = logging.getLogger(os.path.basename(__file__))
+
+API_WORKERS = settings.API_WORKERS
+
+#
+# instantiate dispatcher and collect methods
+#
+disp = Dispatcher()
+custom_methods = [method_name for method_name in dir(disp) if callable(getattr(disp, method_name))]
+custom_methods = [x for x in custom_methods if not x.startswith("__")]
+
+#
+# instantiate token handler and collect methods
+#
+th = TokenHandler()
+token_methods = [method_name for method_name in dir(th) if callable(getattr(th, method_name))]
+token_methods = [x for x in token_methods if not x.startswith("__")]
+
+#
+# instantiate job handler running analyses and visualizations in the
+# background and collect methods. The jobs are queued in the task
+# registry and run by whichever worker process claims them.
+#
+jh = JobHandler(resolve=lambda method_name: getattr(disp, method_name))
+job_methods = [method_name for method_name in dir(jh) if callable(getattr(jh, method_name))]
+job_methods = [x for x in job_methods if not x.startswith("__")]
+
+#
+# the reaper closes unused tasks and deletes deactivated folders
+# in the background. Tasks with active jobs are left alone.
+#
+reaper = TaskReaper(th.registry, disp.purge_project, lambda token: jh.get_active_job(token) is not None)
+
+#
+# combine the method lists
+#
+custom_methods += token_methods
+custom_methods += job_methods
+
+#
+# return non-func structure in case of valid/invalid token
+#
+SuccessTokenValidation = (Status.SUCCESS, "valid token", {})
+FailedTokenValidation = (Status.FAILED, "invalid token", {})
+
+#
+# definitions to make the appearance of the API endpoints well structured and clear
+#
+tags_metadata = [
+    {
+        "name": "system",
+        "description": "Root entry point for completeness. No specific functionality",
+    },
+    {
+        "name": "tasks",
+        "description": "Start and stop token-based projects. Open task issues a token for all remaining operations"
+    },
+    {
+        "name": "config",
+        "description": "Set type of NLP processing and visualization",
+    },
+    {
+        "name": "status",
+        "description": "Obtain list of active projects and specific information on projects",
+    },
+    {
+        "name": "upload",
+        "description": "Text and reference file upload into an active project",
+    },
+    {
+        "name": "corpora",
+        "description": "Register reference corpora once and attach them to any number of tasks",
+    },
+    {
+        "name": "analysis",
+        "description": "Start similarity analysis based on transformer models",
+    },
+    {
+        "name": "downloads",
+        "description": "Download generated files from an active task",
+    },
+]
+
+app = FastAPI(
+    title="SimCore REST API",
+    description="NLP Service to compute document similarities with transformers",
+    version="0.1.0",
+    openapi_tags=tags_metadata
+    # removed server spec, because of CORS error for VM deployment
+    #,
+    # servers=[
+    #     {
+    #         "url": "http://localhost:9060",
+    #         "description": "SimCore Server"
+    #     }
+    # ]
+)
+
+
+################################################################################
+#
+# optional warm-up of the configured models such that the first analysis
+# does not pay for loading them from disk
+#
+@app.on_event("startup")
+async def warm_up_models():
+    assert "warm_up_models" in custom_methods
+    s, m, d = disp.warm_up_models()
+    logger.info(f"Model warm-up: {m} {d}")
+    #
+    # the heatmap workers are started before the job threads
+    #
+    assert "start_heatmap_workers" in custom_methods
+    s, m, d = disp.start_heatmap_workers()
+    logger.info(m)
+    assert "start" in custom_methods
+    jh.start()
+    reaper.start()
+
+
+################################################################################
+#
+# encoder and heatmap worker processes must not outlive the REST API
+#
+@app.on_event("shutdown")
+async def stop_encoder_pools():
+    assert "stop_encoder_pools" in custom_methods
+    assert "shutdown" in custom_methods
+    jh.shutdown()
+    reaper.stop()
+    s, m, d = disp.stop_encoder_pools()
+    logger.info(m)
+    s, m, d = disp.stop_heatmap_workers()
+    logger.info(m)
+
+
+################################################################################
+#
+# root entry point. Just returns a json welcome message.
+#
+@app.get("/", tags=["system"])
+async def root_entry():
+    return {"message": "****** REST API SimCore ******"}
+
+
+################################################################################
+#
+# endpoint for opening a task. Here a token will be issued and the
+# folder generated.
+#
+@app.get("/open_task", tags=["tasks"])
+async def open_task(callback_url: Optional[str] = None) -> SCResponse:
+
+    assert "issue_token" in custom_methods
+    assert "create_project" in custom_methods
+    assert "set_callback" in custom_methods
+    #
+    # first issue a token, then create a project with the
+    # name of the token. A folder with the token string is 
+    # generated under /projects but this time this folder
+    # is deleted immediately once the token gets invalidated.
+    # *** If the folder can not be generated for some reason
+    # we have to revoke the token immediately in order
+    # to avoid inconsistencies!
+    #
+    token = th.issue_token()
+
+    s, m, d = disp.create_project(token)
+
+    if s == Status.SUCCESS:
+        #
+        # the final status of every job of the task is posted
+        # to the optional callback URL
+        #
+        if callback_url:
+            disp.set_callback(token, callback_url)
+        m = m + " Task activated."
+        d = {"token":token}
+        logger.info(f"Task with token {token} activated.")
+    else:
+        d = {"token":''}
+        rtoken = th.remove_token(token)
+        if rtoken != token:
+            raise ValueError ("** internal error E065 **")
+        logger.error(f"Task folder could bot be generated.")
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# endpoint for closing a task. If the running status is terminated then the
+# token is revoked and the corresponding folder/subfolder is deleted.
+#
+@app.get("/close_task/{token}", tags=["tasks"])
+async def close_task(checked = Depends(th.check_token)) -> SCResponse:
+
+    assert "purge_project" in custom_methods
+    assert "get_active_job" in custom_methods
+    assert "remove_jobs" in custom_methods
+
+    token, valid = checked
+    print(token, valid)
+    if not valid:
+        s, m, d = FailedTokenValidation
+    elif jh.get_active_job(token) is not None:
+        #
+        # the folder of a running job must not be deactivated
+        #
+        s = Status.WARNING
+        m = f"Task {token} has a queued or running job. Close it after the job finished."
+        d = {}
+    else:
+        jh.remove_jobs(token)
+        rtoken = th.remove_token(token)
+        if rtoken != token:
+            s = Status.FAILED
+            m = f"Internal token handling error: {token} not under control"
+            d = {}
+        else:
+            s, m, d = disp.purge_project(token)
+
+    return SCResponse(status=s, message=m, details=d)
+
+################################################################################
+#
+# endpoint for setting the kind of NLP processing (use case specific)
+# Corresponding routines are provided by the SimCore developers. In the token-based
+# environment we have to persist the requested NLP processing in the corresponding
+# folders and decide in the moment of analysis execution.
+#
+@app.post("/set_analyzer/{token}", tags=["config"])
+async def set_analyzer(analyzer: str, checked = Depends(th.check_token)) -> SCResponse:
+
+    token, valid = checked
+    print(token, valid)
+    if not valid:
+        s, m, d = FailedTokenValidation
+    else:
+        assert "set_analyzer" in custom_methods
+        s, m, d = disp.set_analyzer(token, analyzer)
+
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# endpoint for setting the kind of NLP processing (use case specific)
+# Corresponding routines are provided by the SimCore developers 
+#
+@app.post("/set_visualizer/{token}", tags=["config"])
+async def set_visualizer(sc_visualizer: str, checked = Depends(th.check_token)) -> SCResponse:
+
+    token, valid = checked
+    print(token, valid)
+    if not valid:
+        s, m, d = FailedTokenValidation
+    else:
+        assert "set_visualizer" in custom_methods
+        s, m, d = disp.set_visualizer(token, sc_visualizer)
+
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# endpoint for a list of all active tasks
+#
+@app.get("/get_active_tasks", tags=["status"])
+async def get_active_tasks() -> SCResponse:
+
+    assert "get_active_tasks" in custom_methods
+
+    tasks = th.get_active_tasks()
+    s = Status.SUCCESS
+    m = "collected all active tasks"
+    d = {"active":tasks}
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# endpoint for the registry entries of all tasks: creation time, time
+# of last use, folder size (as of the last reaper run) and status
+#
+@app.get("/list_tasks", tags=["status"])
+async def list_tasks(status: Optional[str] = None) -> SCResponse:
+
+    assert "get_task_list" in custom_methods
+
+    tasks = th.get_task_list(status)
+    s = Status.SUCCESS
+    m = f"{len(tasks)} tasks in the registry"
+    d = {"tasks":tasks}
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# endpoint reporting the models resident in this worker and their memory
+#
+@app.get("/model_status", tags=["status"])
+async def model_status() -> SCResponse:
+
+    assert "model_status" in custom_methods
+
+    s, m, d = disp.model_status()
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# endpoint reporting size and hit/miss counters of the embedding store
+#
+@app.get("/embedding_store_status", tags=["status"])
+async def embedding_store_status() -> SCResponse:
+
+    assert "embedding_store_status" in custom_methods
+
+    s, m, d = disp.embedding_store_status()
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# endpoint reporting state (queued, running, done, failed), progress in
+# analyzed document pairs and timing of the latest or a given job of a task
+#
+@app.get("/job_status/{token}", tags=["status"])
+async def job_status(job_id: Optional[str] = None, checked = Depends(th.check_token)) -> SCResponse:
+
+    token, valid = checked
+    if not valid:
+        s, m, d = FailedTokenValidation
+    else:
+        assert "get_job_status" in custom_methods
+        s, m, d = jh.get_job_status(token, job_id)
+
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# long-poll endpoint. It returns the job status as soon as the job changed
+# beyond the given version (progress or state) or after timeout seconds.
+# Clients pass the returned version back to wait for the next change.
+#
+@app.get("/wait_job/{token}", tags=["status"])
+async def wait_job(job_id: Optional[str] = None, version: int = 0, timeout: float = 30.0,
+                   checked = Depends(th.check_token)) -> SCResponse:
+
+    token, valid = checked
+    if not valid:
+        s, m, d = FailedTokenValidation
+    else:
+        assert "get_job_status" in custom_methods
+        assert "wait_for_change" in custom_methods
+        s, m, d = jh.get_job_status(token, job_id)
+        if s == Status.SUCCESS:
+            await jh.wait_for_change(d["job_id"], version, min(timeout, 300.0))
+            s, m, d = jh.get_job_status(token, d["job_id"])
+
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# server-sent events of a job. Every change of the job is sent as a
+# "progress" event, the end as a "done" or "failed" event after which
+# the stream closes. Comments keep idle connections alive.
+#
+@app.get("/job_events/{token}", tags=["status"])
+async def job_events(job_id: Optional[str] = None, checked = Depends(th.check_token)):
+
+    token, valid = checked
+    assert "get_job_status" in custom_methods
+    s, m, d = jh.get_job_status(token, job_id) if valid else FailedTokenValidation
+    if s != Status.SUCCESS:
+        return SCResponse(status=s, message=m, details=d)
+
+    async def events(job_id):
+        version = -1
+        while True:
+            await jh.wait_for_change(job_id, version, 15.0)
+            s, m, d = jh.get_job_status(token, job_id)
+            if s != Status.SUCCESS:
+                return
+            if d["version"] == version:
+                yield ": keep-alive\n\n"
+                continue
+            version = d["version"]
+            event = d["state"] if d["state"] in ("done", "failed") else "progress"
+            yield f"event: {event}\ndata: {json.dumps(d)}\n\n"
+            if event != "progress":
+                return
+
+    return StreamingResponse(events(d["job_id"]), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
+################################################################################
+#
+# endpoint for setting the kind of NLP processing (use case specific)
+# Corresponding routines are provided by the SimCore developers 
+#
+@app.get("/list_task_files/{token}", tags=["status"])
+async def list_task_files(checked = Depends(th.check_token)) -> SCResponse:
+
+    token, valid = checked
+    print(token, valid)
+    if not valid:
+        s, m, d = FailedTokenValidation
+    else:
+        assert "list_task_files" in custom_methods
+        s, m, d = disp.list_task_files(token)
+
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# 2 entry points for uploading reference and analysis texts.
+# The information of the project name is transferred
+# as a >path parameter< in the URL:
+# post .... localhost:XXXX/create/project_name
+#
+# The file upload occurs via the parameter ufile:UploadFile...
+#
+# A corresponding curl call to address this endpoint with project name and file upload
+# would be:
+#
+# curl -i -F "ufile=@/home/user/company_text.txt" localhost:7705/create/demoproject
+#
+# keep in mind that the parameter name in the function and in the curl must be identical
+# otherwise a 422 unprocessable error will occur.
+#
+# the upload is streamed from the spooled upload file into the project folder
+# in chunks. No full copy of the file is held in memory. Writing the files
+# runs in the thread pool such that the event loop keeps serving other
+# requests, e.g. clients waiting for their jobs.
+#
+@app.post("/upload_text/{token}", tags=["upload"])
+async def upload_text(ufile: UploadFile = File(...),
+                      checked = Depends(th.check_token)) -> SCResponse:
+
+    token, valid = checked
+    print(token, valid)
+    if not valid:
+        s, m, d = FailedTokenValidation
+    else:
+        assert "upload_text" in custom_methods
+        #
+        # get filename and data from ufile
+        #
+        textfilename = ufile.filename
+        s, m, d = await run_in_threadpool(disp.upload_text, token, textfilename, ufile.file, is_reference=False)
+
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# same for uploading reference. An additional flag is set that indicates that the
+# file uploaded by this endpoint should go into the reference folder.
+#
+@app.post("/upload_reference/{token}", tags=["upload"])
+async def upload_reference(ufile: UploadFile = File(...),
+                      checked = Depends(th.check_token)) -> SCResponse:
+
+    token, valid = checked
+    print(token, valid)
+    if not valid:
+        s, m, d = FailedTokenValidation
+    else:
+        assert "upload_text" in custom_methods
+        #
+        # get filename and data from ufile
+        #
+        reffilename = ufile.filename
+        s, m, d = await run_in_threadpool(disp.upload_text, token, reffilename, ufile.file, is_reference=True)
+
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# bulk upload of many texts in one request, either as multipart with many
+# "ufiles" parts or as a single zip/tar(.gz) archive. The is_reference flag
+# selects the reference or the analysis folder. Every file or archive entry
+# is streamed into the folder (in the thread pool, like all uploads) and
+# reported with its own result.
+#
+# curl -F "ufiles=@sdg.1-1.txt" -F "ufiles=@sdg.1-2.txt" "localhost:9060/upload_files/<token>?is_reference=true"
+# curl -F "ufile=@agenda.tar.gz" "localhost:9060/upload_archive/<token>?is_reference=true"
+#
+@app.post("/upload_files/{token}", tags=["upload"])
+async def upload_files(ufiles: List[UploadFile] = File(...), is_reference: bool = False,
+                       checked = Depends(th.check_token)) -> SCResponse:
+
+    token, valid = checked
+    if not valid:
+        s, m, d = FailedTokenValidation
+    else:
+        assert "upload_texts" in custom_methods
+        s, m, d = await run_in_threadpool(disp.upload_texts, token, [(ufile.filename, ufile.file) for ufile in ufiles], is_reference)
+
+    return SCResponse(status=s, message=m, details=d)
+
+
+@app.post("/upload_archive/{token}", tags=["upload"])
+async def upload_archive(ufile: UploadFile = File(...), is_reference: bool = False,
+                         checked = Depends(th.check_token)) -> SCResponse:
+
+    token, valid = checked
+    if not valid:
+        s, m, d = FailedTokenValidation
+    else:
+        assert "upload_archive" in custom_methods
+        s, m, d = await run_in_threadpool(disp.upload_archive, token, ufile.filename, ufile.file, is_reference)
+
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# register a named reference corpus from many multipart "ufiles" parts or a
+# single zip/tar archive. Changed content replaces the registered version,
+# unchanged content keeps it. The sentence and document embeddings of the
+# corpus are then precomputed in a background job of the version, such
+# that every new version gets its own job even while the job of the
+# previous one is still running. Storing and hashing the files waits for
+# the lock of the corpus and runs in the thread pool, like all uploads.
+#
+@app.post("/register_corpus/{corpus_id}", tags=["corpora"])
+async def register_corpus(corpus_id: str, ufiles: List[UploadFile] = File(...)) -> SCResponse:
+
+    assert "register_corpus" in custom_methods
+    assert "precompute_corpus" in custom_methods
+
+    s, m, d = await run_in_threadpool(disp.register_corpus, corpus_id, [(ufile.filename, ufile.file) for ufile in ufiles])
+    if s == Status.SUCCESS:
+        version = d["corpus"]["version"]
+        js, jm, jd = await run_in_threadpool(jh.submit, f"corpus:{corpus_id}:{version}", "corpus", disp.precompute_corpus,
+                                             corpus_id, version, model=MODEL_NAME)
+        d["job"] = jd
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# metadata, embedding store and precomputation job of a corpus
+#
+@app.get("/corpus_status/{corpus_id}", tags=["corpora"])
+async def corpus_status(corpus_id: str) -> SCResponse:
+
+    assert "corpus_status" in custom_methods
+    assert "get_job_status" in custom_methods
+
+    s, m, d = await run_in_threadpool(disp.corpus_status, corpus_id)
+    if s == Status.SUCCESS:
+        d["job"] = (await run_in_threadpool(jh.get_job_status, f"corpus:{corpus_id}:{d['corpus']['version']}"))[2]
+    return SCResponse(status=s, message=m, details=d)
+
+
+@app.get("/list_corpora", tags=["corpora"])
+async def list_corpora() -> SCResponse:
+
+    assert "list_corpora" in custom_methods
+
+    s, m, d = disp.list_corpora()
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# use a registered corpus as the reference texts of a task
+#
+@app.post("/attach_corpus/{token}", tags=["corpora"])
+async def attach_corpus(corpus_id: str, checked = Depends(th.check_token)) -> SCResponse:
+
+    token, valid = checked
+    if not valid:
+        s, m, d = FailedTokenValidation
+    else:
+        assert "attach_corpus" in custom_methods
+        s, m, d = disp.attach_corpus(token, corpus_id)
+
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# analyses and visualizations run as background jobs such that the event
+# loop keeps serving other tasks. The endpoint returns the queued job at
+# once (status RUNNING) unless wait is set. Then it returns the result of
+# the job without blocking the event loop in the meantime. Queueing the
+# job may wait for the write lock of the registry and thus runs in the
+# thread pool.
+#
+async def submit_job(token, kind, func, wait, model=None):
+
+    assert "submit" in custom_methods
+    assert "wait_for_job" in custom_methods
+    assert "get_callback" in custom_methods
+
+    s, m, d = await run_in_threadpool(jh.submit, token, kind, func, token, callback_url=disp.get_callback(token), model=model)
+    if wait and s == Status.RUNNING:
+        s, m, d = await jh.wait_for_job(d["job_id"])
+    return s, m, d
+
+
+################################################################################
+#
+# endpoint for starting the similarity analysis. The files to be analyzed are not
+# given explicitly because all files uploaded to the project folder will be analyzed
+# and the result returned
+#
+@app.get("/analyze_project/{token}", tags=["analysis"])
+async def analyze_project(wait: bool = False, checked = Depends(th.check_token)) -> SCResponse:
+
+    token, valid = checked
+    print(token, valid)
+    if not valid:
+        s, m, d = FailedTokenValidation
+    else:
+        assert "analyze_project" in custom_methods
+        s, m, d = await submit_job(token, "analysis", disp.analyze_project, wait, model=MODEL_NAME)   # NLP config is read from current folder!
+
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# endpoint for starting the similarity analysis. The files to be analyzed are not
+# given explicitly because all files uploaded to the project folder will be analyzed
+# and the result returned
+#
+@app.get("/visualize_project/{token}", tags=["analysis"])
+async def visualize_project(wait: bool = False, checked = Depends(th.check_token)) -> SCResponse:
+
+    token, valid = checked
+    print(token, valid)
+    if not valid:
+        s, m, d = FailedTokenValidation
+    else:
+        assert "visualize_project" in custom_methods
+        s, m, d = await submit_job(token, "visualization", disp.visualize_project, wait)  # VIS is read from current folder!
+
+    return SCResponse(status=s, message=m, details=d)
+
+
+################################################################################
+#
+# endpoint for downloading files that are given by an absolute path
+#
+@app.post("/download_file/{token}", tags=["downloads"])
+async def download_file(afilepath: str, fmt: str = None, checked = Depends(th.check_token)) -> FileResponse:
+    """
+    results are stored as parquet files. With fmt ("parquet", "xlsx"
+    or "csv") a result is returned in that format instead, exports are
+    generated on first request.
+    """
+
+    token, valid = checked
+    print(token, valid)
+    if not valid:
+        s, m, d = FailedTokenValidation
+        return None
+    else:
+        assert "download_file" in custom_methods
+        s, m, d = await run_in_threadpool(disp.download_file, afilepath, fmt)
+        print(m)
+    if s != Status.SUCCESS:
+        return None
+
+    return FileResponse(path=d["file_location"], 
+                        media_type=d["media_type"],
+                        filename=d["filename"])
+
+
+################################################################################
+#
+# endpoint for downloading the results of a task as one streamed archive
+#
+@app.get("/download_results/{token}", tags=["downloads"])
+async def download_results(tags: Optional[str] = None, fmt: str = None, checked = Depends(th.check_token)):
+    """
+    the files of the results folder as one tar.gz archive that is
+    compressed while it is sent. tags is a comma separated list of
+    result tags or file types to restrict the archive to (e.g.
+    "coarse,png"). With fmt ("xlsx" or "csv") every parquet result
+    is accompanied by its export.
+    """
+
+    assert "download_results" in custom_methods
+    assert "stream_archive" in custom_methods
+    assert "get_active_job" in custom_methods
+
+    token, valid = checked
+    print(token, valid)
+    if not valid:
+        s, m, d = FailedTokenValidation
+    elif jh.get_active_job(token) is not None:
+        #
+        # results that are just being written are not archived
+        #
+        s = Status.WARNING
+        m = f"Task {token} has a queued or running job. Download the results after the job finished."
+        d = {}
+    else:
+        tag_list = [tag.strip() for tag in tags.split(",") if tag.strip()] if tags else None
+        s, m, d = await run_in_threadpool(disp.download_results, token, tag_list, fmt)
+    print(m)
+    if s != Status.SUCCESS:
+        return SCResponse(status=s, message=m, details=d)
+
+    return StreamingResponse(disp.stream_archive(d["files"]),
+                             media_type="application/gzip",
+                             headers={"Content-Disposition": f'attachment; filename="{d["filename"]}"'})
+
+
+################################################################################
+#
+# main
+#
+if __name__ == "__main__":
+    logger.info("*** SimCore REST interface started ***")
+    #
+    # several worker processes are started from the import string of
+    # the app. They share tasks and jobs through the task registry.
+    #
+    if API_WORKERS > 1:
+        uvicorn.run("simcore_rest_api:app", host="0.0.0.0", port=9060, workers=API_WORKERS,
+                    app_dir=os.path.dirname(os.path.abspath(__file__)))
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=9060, workers=1)
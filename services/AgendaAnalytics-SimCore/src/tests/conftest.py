@@ -0,0 +1,23 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+#
+# the tests run with the settings of the SimCore root and import the
+# modules from src like the REST API does. Every test works in its own
+# directory such that projects, corpora and embeddings of a test do not
+# leak into others. Folders created when the modules are imported go
+# to a temporary directory as well.
+#
+SIMCORE_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("SETTINGS_FILE_FOR_DYNACONF", os.path.join(SIMCORE_SRC, "..", "settings.toml"))
+sys.path.insert(0, SIMCORE_SRC)
+os.chdir(tempfile.mkdtemp(prefix="simcore-tests-"))
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
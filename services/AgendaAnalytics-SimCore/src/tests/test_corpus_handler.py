@@ -0,0 +1,114 @@
+import hashlib
+import multiprocessing
+import os
+import subprocess
+import sys
+
+from handlers.corpus_handler_mod import CorpusHandler, REFFOLDERNAME
+
+
+def write_texts(folder, texts):
+    os.makedirs(folder, exist_ok=True)
+    for name, text in texts.items():
+        with open(os.path.join(folder, name), "w") as f:
+            f.write(text)
+
+
+def test_content_hash_recipe(workdir):
+    write_texts("texts", {"sdg.1-2.txt": "second", "sdg.1-1.txt": "first"})
+    h = hashlib.sha256()
+    for name, text in [("sdg.1-1.txt", "first"), ("sdg.1-2.txt", "second")]:
+        h.update(f"{name}\0{hashlib.sha256(text.encode()).hexdigest()}\n".encode("utf-8"))
+    assert CorpusHandler.content_hash("texts") == h.hexdigest()
+
+
+def test_content_hash_is_stable_and_ignores_hidden_files(workdir):
+    write_texts("a", {"sdg.1-1.txt": "first", "sdg.1-2.txt": "second"})
+    write_texts("b", {"sdg.1-2.txt": "second", "sdg.1-1.txt": "first", ".gitkeep": "", ".DS_Store": "x"})
+    assert CorpusHandler.content_hash("a") == CorpusHandler.content_hash("a")
+    assert CorpusHandler.content_hash("a") == CorpusHandler.content_hash("b")
+    write_texts("b", {"sdg.1-2.txt": "changed"})
+    assert CorpusHandler.content_hash("a") != CorpusHandler.content_hash("b")
+
+
+def test_text_name():
+    assert CorpusHandler.text_name("sdg.1-1.txt") == "sdg.1-1.txt"
+    assert CorpusHandler.text_name("../../sdg.1-1.txt") == "sdg.1-1.txt"
+    assert CorpusHandler.text_name("dir\\sdg.1-1.txt") == "sdg.1-1.txt"
+    assert CorpusHandler.text_name("agenda/.gitkeep") is None
+    assert CorpusHandler.text_name("agenda/") is None
+
+
+def register(handler, corpus_id, texts):
+    textdir = handler.stage(corpus_id)
+    write_texts(textdir, texts)
+    return handler.commit(corpus_id, textdir)
+
+
+def versions(handler, corpus_id):
+    # the version folders that are not deactivated
+    folder = os.path.join(handler.root, corpus_id)
+    return sorted(name for name in os.listdir(folder) if os.path.isdir(os.path.join(folder, name)) and not name.startswith("$$$"))
+
+
+def test_register_unchanged_keeps_version(workdir):
+    handler = CorpusHandler(root="corpora")
+    meta, changed = register(handler, "sdg", {"sdg.1-1.txt": "first"})
+    assert changed
+    again, changed = register(handler, "sdg", {"sdg.1-1.txt": "first"})
+    assert not changed
+    assert again["version"] == meta["version"]
+    assert versions(handler, "sdg") == [meta["version"]]
+
+
+def test_superseded_version_is_deactivated(workdir):
+    handler = CorpusHandler(root="corpora")
+    old, _ = register(handler, "sdg", {"sdg.1-1.txt": "first"})
+    new, changed = register(handler, "sdg", {"sdg.1-1.txt": "changed"})
+    assert changed and new["version"] != old["version"]
+    assert new["superseded"] == []
+    assert versions(handler, "sdg") == [new["version"]]
+    assert handler.get_version_dir("sdg") == os.path.join("corpora", "sdg", new["version"])
+
+
+def test_superseded_version_stays_readable_while_read(workdir):
+    handler = CorpusHandler(root="corpora")
+    old, _ = register(handler, "sdg", {"sdg.1-1.txt": "first"})
+    with handler.reading("sdg") as versiondir:
+        new, _ = register(handler, "sdg", {"sdg.1-1.txt": "changed"})
+        assert new["superseded"] == [old["version"]]
+        with open(os.path.join(versiondir, REFFOLDERNAME, "sdg.1-1.txt")) as f:
+            assert f.read() == "first"
+        # new readers get the new version
+        with handler.reading("sdg") as current:
+            assert os.path.basename(current) == new["version"]
+    assert versions(handler, "sdg") == [new["version"]]
+    assert handler.get_meta("sdg")["superseded"] == []
+
+
+def test_leases_of_dead_processes_are_ignored(workdir):
+    handler = CorpusHandler(root="corpora")
+    old, _ = register(handler, "sdg", {"sdg.1-1.txt": "first"})
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    leases = os.path.join(handler.get_version_dir("sdg"), "leases")
+    os.makedirs(leases)
+    open(os.path.join(leases, f"{process.pid}-0"), "w").close()
+    new, _ = register(handler, "sdg", {"sdg.1-1.txt": "changed"})
+    assert new["superseded"] == []
+    assert versions(handler, "sdg") == [new["version"]]
+
+
+def register_in_process(n):
+    register(CorpusHandler(root="corpora"), "sdg", {"sdg.1-1.txt": f"version {n % 3}"})
+
+
+def test_concurrent_registrations_of_processes(workdir):
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        pool.map(register_in_process, range(24))
+    handler = CorpusHandler(root="corpora")
+    meta = handler.get_meta("sdg")
+    # exactly the current version is left, no staging folder or superseded version
+    assert versions(handler, "sdg") == [meta["version"]]
+    assert meta["superseded"] == []
+    assert CorpusHandler.content_hash(os.path.join(handler.get_version_dir("sdg"), REFFOLDERNAME)) == meta["content_hash"]
@@ -0,0 +1,68 @@
+import os
+import time
+
+import numpy as np
+
+from nlpcore.embedding_store_mod import EmbeddingStore
+
+
+def test_make_key_depends_on_model_split_and_texts():
+    key = EmbeddingStore.make_key("model", ["a b", "c"], "sentences")
+    assert key == EmbeddingStore.make_key("model", ["a b", "c"], "sentences")
+    assert key != EmbeddingStore.make_key("other", ["a b", "c"], "sentences")
+    assert key != EmbeddingStore.make_key("model", ["a b", "c"], "document")
+    assert key != EmbeddingStore.make_key("model", ["c", "a b"], "sentences")
+    # the texts are separated, joining them differently gives another key
+    assert key != EmbeddingStore.make_key("model", ["a", "b c"], "sentences")
+
+
+def test_put_get_roundtrip(workdir):
+    store = EmbeddingStore(root="embeddings", max_mb=None)
+    embeddings = np.random.default_rng(0).random((7, 16))
+    key = EmbeddingStore.make_key("model", ["text"], "sentences")
+    assert store.get(key) is None
+    store.put(key, embeddings)
+    stored = store.get(key)
+    assert stored.dtype == np.float32
+    np.testing.assert_allclose(stored, embeddings.astype(np.float32))
+    stats = store.get_stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_least_recently_used_entries_are_evicted(workdir):
+    # every entry takes a bit more than 40 kB, the store holds two
+    store = EmbeddingStore(root="embeddings", max_mb=0.1)
+    keys = [EmbeddingStore.make_key("model", [str(i)], "sentences") for i in range(3)]
+    for i, key in enumerate(keys[:2]):
+        store.put(key, np.zeros((10, 1024)))
+        os.utime(store.entry_path(key), (time.time() - 100 + i, time.time() - 100 + i))
+    # reading the older entry makes the other one the least recently used
+    assert store.get(keys[0]) is not None
+    store.put(keys[2], np.zeros((10, 1024)))
+    assert store.get(keys[1]) is None
+    assert store.get(keys[0]) is not None and store.get(keys[2]) is not None
+    assert store.get_stats()["evictions"] == 1
+
+
+def test_replacing_an_entry_keeps_the_size(workdir):
+    store = EmbeddingStore(root="embeddings", max_mb=1)
+    key = EmbeddingStore.make_key("model", ["text"], "sentences")
+    store.get_stats()
+    for _ in range(3):
+        store.put(key, np.zeros((10, 1024)))
+    assert store.size == os.path.getsize(store.entry_path(key))
+
+
+def test_stored_embeddings_are_reused(workdir):
+    # needs the configured sentence transformer model
+    from nlpcore.nlpcore_mod import NLPCore
+
+    nlpcore = NLPCore()
+    store = EmbeddingStore(root="embeddings", max_mb=None)
+    corpora = [["We protect the climate.", "Our schools teach children."], ["Take urgent action."]]
+    first = nlpcore.embed_corpora(corpora, split="sentences", store=store)
+    assert store.get_stats()["entries"] == 2
+    second = nlpcore.embed_corpora(corpora, split="sentences", store=store)
+    assert store.hits == 2
+    for a, b in zip(first, second):
+        np.testing.assert_allclose(a.cpu().numpy(), b.cpu().numpy(), rtol=0, atol=1e-6)
@@ -0,0 +1,103 @@
+import time
+from contextlib import closing
+
+import pytest
+
+from simcore_api_schema_mod import Status
+from handlers.job_handler_mod import JobHandler, JOB_MAX_ATTEMPTS, JOB_STALE_SECONDS
+
+
+class Dispatcher:
+    # stands in for the dispatcher the job methods are resolved from
+
+    def analyze_project(self, token, progress=None):
+        progress(1, 1)
+        return Status.SUCCESS, f"Project {token} analyzed", {"files": 1}
+
+    def visualize_project(self, token, progress=None):
+        raise ValueError("no results")
+
+
+@pytest.fixture
+def workers(workdir):
+    # two worker processes sharing the task registry
+    disp = Dispatcher()
+    return [JobHandler(resolve=lambda method_name: getattr(disp, method_name), path="tasks.db") for _ in range(2)]
+
+
+def set_heartbeat(handler, job_id, heartbeat):
+    with closing(handler.connect()) as db, db:
+        db.execute("UPDATE jobs SET heartbeat = ? WHERE job_id = ?", (heartbeat, job_id))
+
+
+def test_one_active_job_per_token(workers):
+    first, _ = workers
+    s, m, d = first.submit("t", "analysis", "analyze_project", "t")
+    assert s == Status.RUNNING and d["state"] == "queued"
+    s, m, again = first.submit("t", "analysis", "analyze_project", "t")
+    assert s == Status.WARNING and again["job_id"] == d["job_id"]
+    assert first.submit("u", "analysis", "analyze_project", "u")[0] == Status.RUNNING
+
+
+def test_a_job_is_claimed_once(workers):
+    first, second = workers
+    _, _, d = first.submit("t", "analysis", "analyze_project", "t")
+    job = first.claim()
+    assert job["job_id"] == d["job_id"] and job["worker"] == first.worker_id and job["attempts"] == 1
+    assert second.claim() is None
+    assert first.claim() is None
+
+
+def test_job_with_stale_heartbeat_is_requeued_and_claimed_again(workers):
+    first, second = workers
+    _, _, d = first.submit("t", "analysis", "analyze_project", "t")
+    job = first.claim()
+    # a current heartbeat keeps the job with its worker
+    second.requeue_stale()
+    assert second.get_job(job["job_id"])["state"] == "running"
+
+    set_heartbeat(first, job["job_id"], time.time() - JOB_STALE_SECONDS - 1)
+    second.requeue_stale()
+    requeued = second.get_job(job["job_id"])
+    assert requeued["state"] == "queued" and requeued["worker"] is None
+    assert requeued["version"] > job["version"]
+
+    job = second.claim()
+    assert job["job_id"] == d["job_id"] and job["worker"] == second.worker_id and job["attempts"] == 2
+    s, m, result = second.run_job(job)
+    assert s == Status.SUCCESS
+    info = second.get_job_info(job["job_id"])
+    assert info["state"] == "done" and info["details"] == {"files": 1}
+    assert info["progress"] == {"done": 1, "total": 1}
+
+
+def test_job_fails_when_its_worker_is_lost_too_often(workers):
+    first, second = workers
+    _, _, d = first.submit("t", "analysis", "analyze_project", "t")
+    for attempt in range(JOB_MAX_ATTEMPTS):
+        job = first.claim()
+        assert job["attempts"] == attempt + 1
+        set_heartbeat(first, job["job_id"], time.time() - JOB_STALE_SECONDS - 1)
+        second.requeue_stale()
+    job = second.get_job(d["job_id"])
+    assert job["state"] == "failed" and job["message"] == "Job lost its worker"
+    assert second.claim() is None
+
+
+def test_failing_job(workers):
+    first, _ = workers
+    first.submit("t", "visualization", "visualize_project", "t")
+    s, m, d = first.run_job(first.claim())
+    assert s == Status.FAILED and m == "Job failed: no results"
+    s, m, d = first.get_job_status("t")
+    assert d["state"] == "failed" and d["status"] == Status.FAILED.value
+
+
+def test_job_of_a_model_warm_elsewhere_is_left_to_that_worker(workers):
+    first, second = workers
+    with closing(second.connect()) as db, db:
+        db.execute("INSERT INTO workers (worker, pid, models, heartbeat) VALUES (?, ?, ?, ?)",
+                   (second.worker_id, 0, '["warm-model"]', time.time()))
+    first.submit("t", "analysis", "analyze_project", "t", model="warm-model")
+    assert first.claim() is None
+    assert second.claim()["worker"] == second.worker_id
@@ -0,0 +1,56 @@
+import threading
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def pooled(monkeypatch):
+    # needs the configured sentence transformer model. Every encode goes through a pool of two workers
+    from nlpcore import nlpcore_mod
+    from nlpcore.model_registry_mod import registry
+
+    monkeypatch.setattr(nlpcore_mod, "ENCODER_WORKERS", 2)
+    monkeypatch.setattr(nlpcore_mod, "ENCODER_POOL_MIN_SENTENCES", 1)
+    yield nlpcore_mod.NLPCore()
+    registry.stop_pools()
+
+
+def corpus(i):
+    return [f"Sentence {j} of corpus {i} is about {'water energy climate schools'.split()[j % 4]}." for j in range(40)]
+
+
+def test_concurrent_encodes_share_the_pool(pooled):
+    from nlpcore.model_registry_mod import registry
+
+    expected = [pooled.backend.encode(corpus(i), 8).numpy() for i in range(4)]
+    results = [None] * 4
+
+    def encode(i):
+        results[i] = pooled.embed(corpus(i), batch_size=8).numpy()
+
+    threads = [threading.Thread(target=encode, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for result, embeddings in zip(results, expected):
+        np.testing.assert_allclose(result, embeddings, rtol=0, atol=1e-5)
+    assert len(registry.pools) == 1
+
+
+def test_stopping_waits_for_the_encode(pooled):
+    from nlpcore.model_registry_mod import registry
+
+    with registry.use_pool(pooled.model_name) as pool:
+        stopper = threading.Thread(target=registry.stop_pools)
+        stopper.start()
+        stopper.join(timeout=1.0)
+        # the pool is still in use
+        assert stopper.is_alive()
+        embeddings = pooled.model.encode_multi_process(corpus(0), pool, batch_size=8)
+    stopper.join()
+    assert embeddings.shape[0] == 40
+    assert registry.pools == {}
+    # the next encode starts a new pool
+    assert pooled.embed(corpus(1)).shape[0] == 40
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from utils.preprocessing_mod import Preprocessing
+
+
+SENTENCES = [
+    "We protect the climate.",
+    "WE PROTECT THE CLIMATE!",
+    "We protect the climate.",
+    "  We protect the climate.  ",
+    "Our schools teach children to read and write.",
+    "Our schools teach children to read and write!",
+]
+
+
+def test_exact_merges_identical_sentences_only():
+    unique, inverse, counts = Preprocessing().collapse_duplicates(SENTENCES, mode="exact")
+    assert unique == ["We protect the climate.", "WE PROTECT THE CLIMATE!", "Our schools teach children to read and write.", "Our schools teach children to read and write!"]
+    assert list(inverse) == [0, 1, 0, 0, 2, 3]
+    assert list(counts) == [3, 1, 1, 1]
+    assert [unique[i].strip() for i in inverse] == [s.strip() for s in SENTENCES]
+
+
+def test_normalized_merges_case_and_punctuation():
+    unique, inverse, _ = Preprocessing().collapse_duplicates(SENTENCES, mode="normalized")
+    assert len(unique) == 2
+    assert list(inverse) == [0, 0, 0, 0, 1, 1]
+
+
+def test_off_keeps_all():
+    unique, inverse, counts = Preprocessing().collapse_duplicates(SENTENCES, mode="off")
+    assert unique == SENTENCES
+    assert list(inverse) == list(range(len(SENTENCES)))
+    assert list(counts) == [1] * len(SENTENCES)
+
+
+def test_default_mode_is_exact():
+    prepro = Preprocessing()
+    assert prepro.dedup_mode == "exact"
+    assert len(prepro.collapse_duplicates(SENTENCES)[0]) == 4
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        Preprocessing().collapse_duplicates(SENTENCES, mode="exactly")
+
+
+def test_detailed_results_with_and_without_dedup():
+    # needs the configured sentence transformer model
+    from handlers.detailed_handler_mod import DetailedHandler
+
+    anatexts = [("analysis.txt", " ".join(SENTENCES + ["The company reduces its emissions every year."] + SENTENCES))]
+    reftexts = [("sdg.13-1.txt", "Take urgent action to combat climate change and its impacts. Strengthen resilience to climate related hazards."),
+                ("sdg.4-1.txt", "Ensure inclusive and equitable quality education. Promote lifelong learning opportunities for all.")]
+
+    results = dict()
+    for mode in ["off", "exact"]:
+        handler = DetailedHandler()
+        handler.prepro.dedup_mode = mode
+        results[mode] = {name: df for name, _, df in handler.analyze_texts(anatexts, reftexts)}
+
+    assert results["off"].keys() == results["exact"].keys()
+    for name, df in results["off"].items():
+        assert list(df.index) == list(results["exact"][name].index)
+        assert list(df.columns) == list(results["exact"][name].columns)
+        np.testing.assert_allclose(results["exact"][name].to_numpy(), df.to_numpy(), rtol=0, atol=1e-5)
@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.resultwriter_mod import Resultwriter
+
+
+def sentence_matrix():
+    # like the detailed analyzers: sentences as labels, repeated and in text order
+    index = ["We protect the climate.", "Our schools teach children.", "We protect the climate."]
+    columns = ["Take urgent action.", "Ensure education.", "Take urgent action.", "Zero hunger."]
+    return pd.DataFrame(np.random.default_rng(0).random((3, 4)), index=index, columns=columns)
+
+
+@pytest.mark.parametrize("rdf", [
+    sentence_matrix(),
+    # like the coarse analyzer: unique file names, not sorted
+    pd.DataFrame([[0.1, 0.2, 0.3]], index=["ana.txt"], columns=["sdg.2-1.txt", "sdg.10-1.txt", "sdg.1-1.txt"]),
+    # labels that are no strings
+    pd.DataFrame([[1.0, 2.0], [3.0, 4.0]], columns=[3, 1]),
+])
+def test_parquet_roundtrip_keeps_column_order(workdir, rdf):
+    Resultwriter.write_parquet(rdf, "result.detailed.parquet")
+    back = Resultwriter.read_result_file("result.detailed.parquet")
+    assert list(back.columns) == list(rdf.columns)
+    assert list(back.index) == list(rdf.index)
+    np.testing.assert_array_equal(back.to_numpy(), rdf.to_numpy())
+
+
+def test_write_result_file_writes_parquet(workdir):
+    files = Resultwriter().write_result_file(sentence_matrix(), root=str(workdir), name="ana.txt$sdg.1-1.txt", tag="detailed")
+    assert files == [os.path.join(str(workdir), "ana.txt$sdg.1-1.txt.detailed.parquet")]
+    assert Resultwriter.has_tag(os.path.basename(files[0]), "detailed")
+    assert not Resultwriter.has_tag(os.path.basename(files[0]), "coarse")
+
+
+def test_csv_export_is_generated_once(workdir):
+    rdf = sentence_matrix()
+    Resultwriter.write_parquet(rdf, "result.detailed.parquet")
+    writer = Resultwriter()
+    outfile = writer.export_result_file("result.detailed.parquet", "csv")
+    assert outfile == "result.detailed.csv"
+    with open(outfile) as f:
+        assert f.read() == rdf.to_csv()
+    mtime = os.path.getmtime(outfile)
+    assert writer.export_result_file("result.detailed.parquet", "csv") == outfile
+    assert os.path.getmtime(outfile) == mtime
+    with pytest.raises(ValueError):
+        writer.export_result_file("result.detailed.parquet", "pdf")
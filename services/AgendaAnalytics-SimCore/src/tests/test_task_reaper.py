@@ -0,0 +1,126 @@
+import os
+import time
+from contextlib import closing
+
+import pytest
+
+from simcore_api_schema_mod import Status
+from handlers import task_reaper_mod
+from handlers.task_reaper_mod import TaskReaper
+from handlers.task_registry_mod import TaskRegistry
+
+
+def make_folder(path, size=10):
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "analysis.txt"), "wb") as f:
+        f.write(b"x" * size)
+
+
+def purge_project(token):
+    # deactivates the folder like the dispatcher does
+    folder = os.path.join("projects", "$$$" + token)
+    os.rename(os.path.join("projects", token), folder)
+    return Status.SUCCESS, f"Project {token} deactivated", {"deactivated_folder": folder}
+
+
+def folders():
+    # the project folders, without the registry database
+    return sorted(name for name in os.listdir("projects") if not name.startswith("tasks.db"))
+
+
+def last_used(registry, token, seconds_ago):
+    with closing(registry.connect()) as db, db:
+        db.execute("UPDATE tasks SET last_used = ? WHERE token = ?", (time.time() - seconds_ago, token))
+
+
+@pytest.fixture
+def registry(workdir):
+    return TaskRegistry(path=os.path.join("projects", "tasks.db"))
+
+
+def test_registry_tracks_use_and_closing(registry):
+    registry.add_task("a")
+    registry.add_task("b")
+    last_used(registry, "b", 100)
+    assert registry.active_tokens() == ["b", "a"]
+    assert registry.touch("b")
+    assert registry.active_tokens() == ["a", "b"]
+    assert registry.close_task("a")
+    assert not registry.close_task("a")
+    assert not registry.touch("a")
+    assert registry.is_known("a") and not registry.is_known("c")
+    assert [task["token"] for task in registry.list_tasks("closed")] == ["a"]
+
+
+def test_reaper_expires_unused_tasks(registry):
+    for token in ["unused", "busy", "recent"]:
+        make_folder(os.path.join("projects", token))
+        registry.add_task(token)
+    last_used(registry, "unused", task_reaper_mod.TASK_TTL_HOURS * 3600 + 1)
+    last_used(registry, "busy", task_reaper_mod.TASK_TTL_HOURS * 3600 + 1)
+    # a folder from before the registry is adopted
+    make_folder(os.path.join("projects", "unknown"))
+
+    summary = TaskReaper(registry, purge_project, lambda token: token == "busy").reap()
+    assert summary["adopted"] == 1 and summary["expired"] == 1
+    assert registry.active_tokens() == ["busy", "recent", "unknown"]
+    assert [task["status"] for task in registry.list_tasks() if task["token"] == "unused"] == ["expired"]
+    assert folders() == ["$$$unused", "busy", "recent", "unknown"]
+    assert [task["size_bytes"] for task in registry.list_tasks("active")] == [10, 10, 10]
+
+
+def test_adoption_by_another_worker_is_not_counted(registry, monkeypatch):
+    make_folder(os.path.join("projects", "unknown"))
+    assert registry.adopt_task("unknown", created_at=time.time())
+    assert not registry.adopt_task("unknown", created_at=time.time())
+    # the folder was adopted by another worker between the check and the insert
+    monkeypatch.setattr(registry, "is_known", lambda token: False)
+    summary = TaskReaper(registry, purge_project, lambda token: False).reap()
+    assert summary["adopted"] == 0
+    assert registry.active_tokens() == ["unknown"]
+
+
+def test_reaper_deletes_deactivated_folders_after_grace_period(registry, monkeypatch):
+    make_folder(os.path.join("projects", "$$$old"))
+    make_folder(os.path.join("corpora", "sdg", "$$$0123"))
+    make_folder(os.path.join("corpora", "sdg", "4567"))
+    reaper = TaskReaper(registry, purge_project, lambda token: False)
+    assert reaper.reap()["deleted"] == 0
+
+    monkeypatch.setattr(task_reaper_mod, "DEACTIVATED_TTL_HOURS", 0)
+    summary = reaper.reap()
+    assert summary["deleted"] == 2 and summary["freed_bytes"] == 20
+    assert not os.path.exists(os.path.join("projects", "$$$old"))
+    assert os.listdir(os.path.join("corpora", "sdg")) == ["4567"]
+
+
+def test_reaper_deletes_abandoned_staging_folders(registry, monkeypatch):
+    abandoned = os.path.join("corpora", "sdg", "staging-abandoned")
+    make_folder(os.path.join(abandoned, "texts"))
+    past = time.time() - 3600
+    for folder in [abandoned, os.path.join(abandoned, "texts")]:
+        os.utime(folder, (past, past))
+    make_folder(os.path.join("corpora", "sdg", "staging-uploading", "texts"))
+    make_folder(os.path.join("corpora", "sdg", "4567"))
+    reaper = TaskReaper(registry, purge_project, lambda token: False)
+    assert reaper.reap()["deleted"] == 0
+
+    monkeypatch.setattr(task_reaper_mod, "DEACTIVATED_TTL_HOURS", 0.5)
+    summary = reaper.reap()
+    assert summary["deleted"] == 1 and summary["freed_bytes"] == 10
+    assert sorted(os.listdir(os.path.join("corpora", "sdg"))) == ["4567", "staging-uploading"]
+
+
+def test_reaper_enforces_disk_quota_least_recently_used_first(registry, monkeypatch):
+    monkeypatch.setattr(task_reaper_mod, "DISK_QUOTA_MB", 1)
+    for i, token in enumerate(["oldest", "busy", "older", "newest"]):
+        make_folder(os.path.join("projects", token), size=400 * 1024)
+        registry.add_task(token)
+        last_used(registry, token, 100 - i)
+    make_folder(os.path.join("projects", "$$$deactivated"), size=400 * 1024)
+
+    summary = TaskReaper(registry, purge_project, lambda token: token == "busy").reap()
+    # five folders of 400 kB: the deactivated one and the two least recently used idle tasks go
+    assert summary["deleted"] == 3 and summary["expired"] == 2
+    assert registry.active_tokens() == ["busy", "newest"]
+    assert folders() == ["busy", "newest"]
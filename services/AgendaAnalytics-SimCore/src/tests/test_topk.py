@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import torch
+
+from handlers.detailed_topk_handler_mod import expand_rows
+from nlpcore.nlpcore_mod import NLPCore
+
+
+def embeddings(rows, seed):
+    return torch.from_numpy(np.random.default_rng(seed).normal(size=(rows, 8)).astype(np.float32))
+
+
+def dense_topk(dense, top_k, threshold):
+    # the top_k columns of every row by a full argsort, as (row, col) -> value
+    matches = dict()
+    for row in range(dense.shape[0]):
+        cols = np.argsort(-dense[row], kind="stable")
+        if top_k:
+            cols = cols[:top_k]
+        for col in cols:
+            if dense[row, col] > threshold and dense[row, col] > 0.0:
+                matches[(row, col)] = dense[row, col]
+    return matches
+
+
+@pytest.mark.parametrize("top_k,threshold", [(3, 0.0), (3, 0.2), (10, 0.0), (0, 0.1)])
+def test_topk_blocks_match_dense_argsort(top_k, threshold):
+    emb1 = embeddings(13, 0)
+    blocks = [embeddings(5, 1), embeddings(3, 2), embeddings(7, 3)]
+    dense_blocks = NLPCore.gen_sim_blocks(emb1, blocks)
+    # a small row_chunk makes the rows run through several chunks
+    sparse_blocks = NLPCore.gen_topk_blocks(emb1, blocks, top_k, threshold, row_chunk=4)
+
+    for dense, sparse in zip(dense_blocks, sparse_blocks):
+        expected = dense_topk(dense, top_k, threshold)
+        found = {(row, col): value for row, col, value in zip(sparse["rows"], sparse["cols"], sparse["values"])}
+        assert found.keys() == expected.keys()
+        np.testing.assert_allclose([found[key] for key in expected], list(expected.values()), rtol=0, atol=1e-6)
+        np.testing.assert_allclose(sparse["row_max"], dense.max(axis=1), rtol=0, atol=1e-6)
+        with np.errstate(invalid="ignore"):
+            np.testing.assert_allclose(sparse["row_mean"], dense.sum(axis=1) / (dense > 0.0).sum(axis=1), rtol=0, atol=1e-6)
+
+
+def test_expand_rows_repeats_the_matches_of_unique_sentences():
+    unique = embeddings(4, 0)
+    inverse = np.array([2, 0, 2, 3, 1, 0])
+    reference = [embeddings(6, 1)]
+    collapsed = expand_rows(NLPCore.gen_topk_blocks(unique, reference, 2)[0], inverse)
+    full = NLPCore.gen_topk_blocks(unique[torch.from_numpy(inverse)], reference, 2)[0]
+
+    def matches(block):
+        return sorted(zip(block["rows"], block["cols"], np.round(block["values"], 6)))
+
+    assert matches(collapsed) == matches(full)
+    np.testing.assert_allclose(collapsed["row_mean"], full["row_mean"], rtol=0, atol=1e-6)
+    np.testing.assert_allclose(collapsed["row_max"], full["row_max"], rtol=0, atol=1e-6)
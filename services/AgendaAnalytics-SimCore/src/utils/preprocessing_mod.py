@@ -1,57 +1,162 @@
-import os
-import logging
-import pandas as pd
-
-#import nltk
-#try:
-#    nltk.download("punkt", download_dir='./data')
-#    nltk.data.path.append('./data')
-#except:
-#    print("./tokenizers exist")
-
-from nltk import tokenize
-
-logger = logging.getLogger(os.path.basename(__file__))
-
-
-class Preprocessing:
-    """
-    Class which provides a range of routines for preprocessing texts
-    """
-
-    def __init__(self):
-        return
-
-    def make_corpus_from_text(self, text, min_word_count=5):
-        """
-        do a sentence tokenization and keep only sentences having
-        min_word_count words in them. Currently min_word_count is not
-        used!
-        """
-
-        corpus = list()
-        sentences = tokenize.sent_tokenize(text)
-
-        for sentence in sentences:
-            sentence = sentence.rstrip("\n")
-            #
-            # test for minimum length
-            # No longer suitable for detailed analysis
-            #
-            #if len(sentence.split(" ")) < min_word_count:
-            #    logger.info(f"Omitted: {sentence}")
-            #    continue
-            corpus.append(sentence)
-        return corpus
-    
-
-    def make_df_from_array(self, simarr, ana_corpus, ref_corpus) -> pd.DataFrame:
-        """
-        Generate a dataframe where the sentences are used as index and column names.
-        Pandas does not eliminate duplicate indices which is necessary for this purpose.
-        Additionally it was asked by the users that the sentences be not truncated for later
-        retrieval in the original document!
-        """
-        df_index = [x for x in ana_corpus]
-        df_columns = [x for x in ref_corpus]
-        return pd.DataFrame(data=simarr, index=df_index, columns=df_columns)
+import os
+import re
+import zlib
+import logging
+import numpy as np
+import pandas as pd
+from dynaconf import settings
+
+#import nltk
+#try:
+#    nltk.download("punkt", download_dir='./data')
+#    nltk.data.path.append('./data')
+#except:
+#    print("./tokenizers exist")
+
+from nltk import tokenize
+
+DEDUP_MODE = settings.DEDUP_MODE
+DEDUP_THRESHOLD = settings.DEDUP_THRESHOLD
+DEDUP_MODES = ("off", "exact", "normalized", "minhash")
+
+#
+# fixed hash permutations for MinHash such that signatures are
+# comparable across calls. 16 bands of 4 rows give a high chance of
+# finding pairs above a Jaccard similarity of about 0.5.
+#
+MINHASH_BANDS = 16
+MINHASH_ROWS = 4
+MINHASH_PRIME = np.uint64(2**31 - 1)
+_rng = np.random.RandomState(1)
+MINHASH_A = _rng.randint(1, 2**31 - 1, size=MINHASH_BANDS * MINHASH_ROWS).astype(np.uint64)
+MINHASH_B = _rng.randint(0, 2**31 - 1, size=MINHASH_BANDS * MINHASH_ROWS).astype(np.uint64)
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+
+class Preprocessing:
+    """
+    Class which provides a range of routines for preprocessing texts
+    """
+
+    def __init__(self):
+        #
+        # describes how documents are split into corpora. It is part of
+        # the key under which embeddings are persisted and has to change
+        # whenever the splitting below changes.
+        #
+        self.split_tag = "nltk-punkt"
+        self.dedup_mode = DEDUP_MODE
+        return
+
+    def make_corpus_from_text(self, text, min_word_count=5):
+        """
+        do a sentence tokenization and keep only sentences having
+        min_word_count words in them. Currently min_word_count is not
+        used!
+        """
+
+        corpus = list()
+        sentences = tokenize.sent_tokenize(text)
+
+        for sentence in sentences:
+            sentence = sentence.rstrip("\n")
+            #
+            # test for minimum length
+            # No longer suitable for detailed analysis
+            #
+            #if len(sentence.split(" ")) < min_word_count:
+            #    logger.info(f"Omitted: {sentence}")
+            #    continue
+            corpus.append(sentence)
+        return corpus
+
+
+    @staticmethod
+    def normalize_sentence(sentence) -> str:
+        """
+        case folded sentence with punctuation and runs of whitespace
+        reduced to single blanks
+        """
+        return re.sub(r"\W+", " ", sentence.casefold()).strip()
+
+
+    @staticmethod
+    def minhash_signature(tokens, shingle=3) -> np.ndarray:
+        """
+        MinHash signature of the word shingles of a sentence
+        """
+        shingles = {" ".join(tokens[i:i + shingle]) for i in range(max(1, len(tokens) - shingle + 1))}
+        hashes = np.array([zlib.crc32(x.encode("utf-8")) for x in shingles], dtype=np.uint64)
+        return ((np.outer(hashes % MINHASH_PRIME, MINHASH_A) + MINHASH_B) % MINHASH_PRIME).min(axis=0)
+
+
+    def collapse_duplicates(self, corpus, mode=None, threshold=DEDUP_THRESHOLD):
+        """
+        collapse repeated sentences (cookie banners, footers, headings
+        of crawled pages) of a corpus before it reaches the encoder.
+        "exact" merges sentences that are identical apart from leading
+        and trailing whitespace, such that the results do not change.
+        "normalized" merges sentences that are equal after normalization
+        and "minhash" additionally those whose estimated Jaccard
+        similarity of word shingles reaches threshold. Both give merged
+        sentences the scores of their representative. "off" keeps all.
+        Without mode the dedup_mode of the instance is used.
+        The first occurrence represents its duplicates. Returned are the
+        unique sentences, the inverse map (corpus[i] is represented by
+        unique[inverse[i]]) and the multiplicity of every unique sentence.
+        """
+        mode = mode or self.dedup_mode
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"Unknown dedup mode {mode}")
+        inverse = np.arange(len(corpus))
+        if mode != "off":
+            seen = dict()
+            buckets = dict()
+            for i, sentence in enumerate(corpus):
+                if mode == "exact":
+                    normalized = sentence.strip()
+                else:
+                    normalized = self.normalize_sentence(sentence)
+                if normalized in seen:
+                    inverse[i] = seen[normalized]
+                    continue
+                seen[normalized] = i
+                tokens = normalized.split()
+                if mode != "minhash" or len(tokens) < 3:
+                    continue
+                #
+                # locality sensitive hashing: sentences sharing any band
+                # of their signature are candidates and merged if their
+                # signatures agree in threshold of the permutations
+                #
+                signature = self.minhash_signature(tokens)
+                keys = [(band, signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS].tobytes())
+                        for band in range(MINHASH_BANDS)]
+                for key in keys:
+                    candidate = buckets.get(key)
+                    if candidate is not None and (candidate[1] == signature).mean() >= threshold:
+                        inverse[i] = candidate[0]
+                        seen[normalized] = candidate[0]
+                        break
+                else:
+                    for key in keys:
+                        buckets.setdefault(key, (i, signature))
+
+        representatives, inverse, counts = np.unique(inverse, return_inverse=True, return_counts=True)
+        unique = [corpus[i] for i in representatives]
+        if len(unique) < len(corpus):
+            logger.info(f"Collapsed {len(corpus)} sentences to {len(unique)} ({mode})")
+        return unique, inverse, counts
+
+
+    def make_df_from_array(self, simarr, ana_corpus, ref_corpus) -> pd.DataFrame:
+        """
+        Generate a dataframe where the sentences are used as index and column names.
+        Pandas does not eliminate duplicate indices which is necessary for this purpose.
+        Additionally it was asked by the users that the sentences be not truncated for later
+        retrieval in the original document!
+        """
+        df_index = [x for x in ana_corpus]
+        df_columns = [x for x in ref_corpus]
+        return pd.DataFrame(data=simarr, index=df_index, columns=df_columns)
@@ -1,7 +1,22 @@
 import os
+import json
 import logging
+import uuid
 import joblib
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dynaconf import settings
+
+RESULT_FORMAT = settings.RESULT_FORMAT
+RESULT_COMPRESSION = settings.RESULT_COMPRESSION
+
+#
+# formats a result can be downloaded in. "parquet" is the stored
+# result itself, the others are generated from it on first request.
+#
+EXPORT_FORMATS = ["parquet", "xlsx", "csv"]
 
 logger = logging.getLogger(os.path.basename(__file__))
 
@@ -23,6 +38,16 @@ class Resultwriter:
         #
         outfilename = ".".join([name, tag])
         outfile = os.path.join(root, outfilename)
+
+        if RESULT_FORMAT == "parquet":
+            #
+            # write out a compressed parquet file. Excel sheets are
+            # generated from it only when they are downloaded.
+            #
+            outfile = outfile + ".parquet"
+            self.write_parquet(rdf, outfile)
+            local_filename_list.append(outfile)
+            return local_filename_list
         #
         # write out serialized data in joblib format
         #
@@ -37,3 +62,75 @@ class Resultwriter:
         local_filename_list.append(outfile)
 
         return local_filename_list  # return full path of generated file as list.
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def write_parquet(rdf: pd.DataFrame, outfile: str):
+        """
+        parquet requires unique string column names. The sentence matrices
+        of the detailed analyzers use the (possibly repeated) sentences as
+        labels, so their columns are stored by position and the original
+        labels are kept in the schema metadata. The index is stored as is.
+        """
+        columns = list(rdf.columns)
+        plain = all(isinstance(c, str) for c in columns) and len(set(columns)) == len(columns)
+        frame = rdf
+        if not plain:
+            frame = rdf.set_axis([str(i) for i in range(len(columns))], axis="columns")
+        table = pa.Table.from_pandas(frame)
+        if not plain:
+            metadata = dict(table.schema.metadata)
+            metadata[b"simcore.columns"] = json.dumps(columns, default=str).encode("utf-8")
+            table = table.replace_schema_metadata(metadata)
+        pq.write_table(table, outfile, compression=RESULT_COMPRESSION)
+        return
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def read_result_file(path: str) -> pd.DataFrame:
+        """
+        read a result written by write_result_file in either format
+        """
+        if not path.endswith(".parquet"):
+            return joblib.load(path)
+        table = pq.read_table(path)
+        rdf = table.to_pandas()
+        metadata = table.schema.metadata or {}
+        if b"simcore.columns" in metadata:
+            rdf.columns = json.loads(metadata[b"simcore.columns"])
+        return rdf
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def has_tag(filename: str, tag: str) -> bool:
+        """
+        whether filename is a result of the given tag in either format
+        """
+        return filename.endswith("." + tag) or filename.endswith("." + tag + ".parquet")
+
+    # ---------------------------------------------------------------------------
+    def export_result_file(self, path: str, fmt: str) -> str:
+        """
+        return the path of a parquet result in the requested format.
+        Exports are generated next to the result on first request and
+        reused as long as they are newer than the result.
+        """
+        if fmt == "parquet":
+            return path
+        outfile = path[:-len(".parquet")] + "." + fmt
+        if os.path.exists(outfile) and os.path.getmtime(outfile) >= os.path.getmtime(path):
+            return outfile
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown result format {fmt}")
+        rdf = self.read_result_file(path)
+        #
+        # concurrent downloads must not see a half written export
+        #
+        tmpfile = os.path.join(os.path.dirname(outfile), f"{uuid.uuid4().hex}.tmp.{fmt}")
+        if fmt == "xlsx":
+            rdf.to_excel(tmpfile, sheet_name="Similarity_result", engine="xlsxwriter")
+        else:
+            rdf.to_csv(tmpfile)
+        os.replace(tmpfile, outfile)
+        logger.info(f"Exported {path} as {fmt}")
+        return outfile
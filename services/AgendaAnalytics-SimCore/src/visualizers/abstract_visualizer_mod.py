@@ -19,7 +19,8 @@ class AbstractVizualizer(ABC):
     
 
     @abstractmethod
-    def visualize_project(self, project: str):
+    def visualize_project(self, project: str, progress=None):
         """
-        Method must be implemented by all visualizers
+        Method must be implemented by all visualizers.
+        progress(done, total) may be called to report progress.
         """
\ No newline at end of file
@@ -1,16 +1,19 @@
 import os
 import logging
-import joblib
 import pandas as pd
 import seaborn as sns
-import matplotlib.pylab as plt
+from matplotlib.figure import Figure
 
 from dynaconf import settings
 from simcore_api_schema_mod import Status
+from utils.resultwriter_mod import Resultwriter
 from visualizers.abstract_visualizer_mod import AbstractVizualizer
+from visualizers.render_manifest_mod import RenderManifest
 
 
 RESFOLDERNAME = settings.RESFOLDERNAME
+VIS_DPI = settings.VIS_DPI
+VIS_ANNOT = settings.VIS_ANNOT
 PROCESSABLE = "coarse" # this is the filetag for files whoso content can be visualized here
 REQUIRED_COLS = ["ana_tag", "ana_text", "ref_tag", "ref_text", "similarity"]
 
@@ -36,77 +39,100 @@ class CoarseVisualizer(AbstractVizualizer):
     #
     # this routine must be implemented and does the specific rendering
     #
-    def visualize_project(self, project: str):
+    def visualize_project(self, project: str, progress=None):
 
         generated_files = []
         result_folder = os.path.join(project, RESFOLDERNAME)
-        foundfile = False
-        cdf = pd.DataFrame()
+        files = [f for f in sorted(os.listdir(result_folder)) if Resultwriter.has_tag(f, PROCESSABLE)]
+        #
+        # results rendered before are only rendered again if they changed.
+        # Their similarities are kept in the manifest for the 2D heatmap.
+        #
+        manifest = RenderManifest(project, "coarse", {"dpi": VIS_DPI, "annot": VIS_ANNOT})
+        changed = bool(manifest.prune(files))
+        rendered = 0
+
+        for i, f in enumerate(files):
 
-        for f in os.listdir(result_folder):
+            if manifest.is_current(f):
+                generated_files += manifest.get_outputs(f)
+                continue
 
-            if f.endswith(PROCESSABLE):
-                foundfile = True
-                print(f)
-                #
-                # load corresponding dataframe
-                # and sort with respect to reference texts
-                # (important for concat!)
-                #
-                df = joblib.load(os.path.join(result_folder, f))
-                if not self.checkcolumns(df):
-                    s = Status.FAILED
-                    m = "** Internal error in coarse visualizer. Check data table."
-                    d = {"generated_files": []}
-                    return s, m, d
+            changed = True
+            print(f)
+            stamp = manifest.stamp(f)
+            #
+            # load corresponding dataframe
+            # and sort with respect to reference texts
+            # (important for concat!)
+            #
+            df = Resultwriter.read_result_file(os.path.join(result_folder, f))
+            if not self.checkcolumns(df):
+                s = Status.FAILED
+                m = "** Internal error in coarse visualizer. Check data table."
+                d = {"generated_files": []}
+                return s, m, d
 
-                df = df.sort_values("ref_tag")
-                df = df.drop(columns=["ana_text", "ref_text"])
-                #
-                # generate a bar plot for this specific file
-                # tref contains the name of the current analysis text
-                #
-                tref = str(df["ana_tag"].loc[0])
-                tref_outfile = os.path.join(result_folder, tref + ".png")
-                ax = df.plot.bar(x="ref_tag", y="similarity", 
-                                title=f"Coarse similarities for text {tref}", 
-                                xlabel="Reference texts",
-                                ylabel="Similarity",
-                                legend=None)
-                #
-                # save original bar plot
-                #
-                ax.figure.savefig(tref_outfile, dpi=600, bbox_inches='tight')
-                generated_files.append(tref_outfile)
-                #
-                # rearrange and eliminate parts of the df making it suitable
-                # for concatenation
-                #
-                df = df.rename(columns={"similarity":tref})
-                df = df.drop(columns=["ana_tag"])
-                df.index = df["ref_tag"]
-                df = df.drop(columns=["ref_tag"])
-                #
-                # form the larger dataframe for a 2D heatmap
-                #
-                cdf = pd.concat([cdf, df], axis="columns")
+            df = df.sort_values("ref_tag")
+            df = df.drop(columns=["ana_text", "ref_text"])
+            #
+            # generate a bar plot for this specific file
+            # tref contains the name of the current analysis text
+            #
+            tref = str(df["ana_tag"].iloc[0])
+            tref_outfile = os.path.join(result_folder, tref + ".png")
+            #
+            # the plots are drawn into figures of their own instead of
+            # the global current figure of pyplot, which is not thread
+            # safe (visualizations run in several job threads)
+            #
+            ax = df.plot.bar(x="ref_tag", y="similarity", 
+                            title=f"Coarse similarities for text {tref}", 
+                            xlabel="Reference texts",
+                            ylabel="Similarity",
+                            legend=None,
+                            ax=Figure().subplots())
+            ax.figure.savefig(tref_outfile, dpi=VIS_DPI, bbox_inches='tight')
+            generated_files.append(tref_outfile)
+            rendered += 1
+            #
+            # keep the similarities of this analysis text per reference
+            # text for the 2D heatmap
+            #
+            similarities = {str(ref): float(sim) for ref, sim in zip(df["ref_tag"], df["similarity"])}
+            manifest.record(f, [tref_outfile], data={"ana_tag": tref, "similarities": similarities}, stamp=stamp)
+            if progress:
+                progress(i + 1, len(files))
         #
         # plot 2D heatmap of text similarities
-        # if there were data to visualize
+        # if there were data to visualize and any of them changed
         #
-        if foundfile:
-            ax = sns.heatmap(cdf.T, cmap='Greens', linewidths=0.5, annot=True)
-            plt.title('2D heatmap of similarities', fontsize = 15)
-            plt.xlabel('Reference texts', fontsize = 15)
-            plt.ylabel('Analysis texts', fontsize = 15)
-            tref_outfile = os.path.join(result_folder, "2D_heatmap.png")
-            ax.figure.savefig(tref_outfile, dpi=600, bbox_inches='tight')
-            generated_files.append(tref_outfile)
+        heatmap_outfile = os.path.join(result_folder, "2D_heatmap.png")
+        if files and (changed or not os.path.exists(heatmap_outfile)):
+            #
+            # form the larger dataframe for a 2D heatmap from the
+            # similarities kept in the manifest, one column per
+            # analysis text
+            #
+            cdf = pd.DataFrame({
+                manifest.get_data(f)["ana_tag"]: pd.Series(manifest.get_data(f)["similarities"])
+                for f in files
+            }).sort_index()
+            fig = Figure()
+            ax = sns.heatmap(cdf.T, cmap='Greens', linewidths=0.5, annot=VIS_ANNOT, ax=fig.subplots())
+            ax.set_title('2D heatmap of similarities', fontsize = 15)
+            ax.set_xlabel('Reference texts', fontsize = 15)
+            ax.set_ylabel('Analysis texts', fontsize = 15)
+            fig.savefig(heatmap_outfile, dpi=VIS_DPI, bbox_inches='tight')
+            rendered += 1
+        if files:
+            generated_files.append(heatmap_outfile)
+        manifest.save()
 
         s = Status.SUCCESS
-        if foundfile:
+        if files:
             m = f"Visualizations done."
         else:
             m = f"No {PROCESSABLE} data found for visualization."
-        d = {"generated_files": generated_files}
-        return s, m, d
\ No newline at end of file
+        d = {"generated_files": generated_files, "rendered": rendered}
+        return s, m, d
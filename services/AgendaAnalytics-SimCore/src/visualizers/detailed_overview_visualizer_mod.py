@@ -0,0 +1,114 @@
+import os
+import json
+import logging
+import pandas as pd
+import seaborn as sns
+from matplotlib.figure import Figure
+
+from dynaconf import settings
+from simcore_api_schema_mod import Status
+from utils.resultwriter_mod import Resultwriter
+from visualizers.abstract_visualizer_mod import AbstractVizualizer
+from visualizers.render_manifest_mod import RenderManifest
+
+
+RESFOLDERNAME = settings.RESFOLDERNAME
+VIS_DPI = settings.VIS_DPI
+VIS_ANNOT = settings.VIS_ANNOT
+PROCESSABLE = "detailed"   # this is the filetag for files whose content can be visualized here
+MAX_ANNOTATED_CELLS = 400  # beyond this the numbers are not readable anyway
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+class DetailedOverviewVisualizer(AbstractVizualizer):
+    """
+    cheap alternative to the detailed visualizer: instead of one heatmap
+    per analysis/reference pair a single heatmap of all pairs is drawn.
+    Every cell is the mean over the sentences of the analysis text of
+    their best match in the reference text. The same matrix is written
+    as JSON for clients that render interactive heatmaps themselves.
+    """
+
+    def __init__(self):
+        logger.info(str(self.__class__.__name__) +  " initialized")
+        return
+
+    #
+    # this routine must be implemented and does the specific rendering
+    #
+    def visualize_project(self, project: str, progress=None):
+
+        generated_files = []
+        result_folder = os.path.join(project, RESFOLDERNAME)
+        files = [f for f in sorted(os.listdir(result_folder)) if Resultwriter.has_tag(f, PROCESSABLE)]
+        json_outfile = os.path.join(result_folder, "detailed_overview.json")
+        png_outfile = os.path.join(result_folder, "detailed_overview.png")
+        #
+        # the score of a result is kept in the manifest and only
+        # computed again if the result changed
+        #
+        manifest = RenderManifest(project, "detailed_overview", {"dpi": VIS_DPI, "annot": VIS_ANNOT})
+        changed = bool(manifest.prune(files))
+        scores = dict()
+
+        for i, f in enumerate(files):
+            if not manifest.is_current(f):
+                changed = True
+                stamp = manifest.stamp(f)
+                df = Resultwriter.read_result_file(os.path.join(result_folder, f))
+                score = float(df.max(axis=1).mean()) if df.size else None
+                manifest.record(f, [], data=score, stamp=stamp)
+            #
+            # recover first and second part of the filename
+            #
+            f1f2 = f.split("."+PROCESSABLE)[0]
+            f1, f2 = f1f2.split("$")
+            if manifest.get_data(f) is not None:
+                scores.setdefault(f2, dict())[f1] = manifest.get_data(f)
+            if progress:
+                progress(i + 1, len(files))
+
+        rendered = 0
+        current = not changed and os.path.exists(json_outfile) and os.path.exists(png_outfile)
+        if scores and current:
+            generated_files += [json_outfile, png_outfile]
+        elif scores:
+            #
+            # rows are the analysis texts, columns the reference texts
+            #
+            odf = pd.DataFrame(scores).sort_index().sort_index(axis="columns")
+
+            payload = {
+                "metric": "mean best sentence similarity",
+                "analysis_texts": list(odf.index),
+                "reference_texts": list(odf.columns),
+                "values": [[None if pd.isna(v) else round(v, 4) for v in row] for row in odf.values],
+            }
+            with open(json_outfile, "w") as fp:
+                json.dump(payload, fp)
+            generated_files.append(json_outfile)
+
+            width = min(max(8, 0.3 * len(odf.columns)), 60)
+            height = min(max(4, 0.4 * len(odf.index)), 60)
+            #
+            # drawn without pyplot, whose global current figure is not
+            # thread safe (visualizations run in several job threads)
+            #
+            fig = Figure(figsize = (width, height))
+            annot = VIS_ANNOT and odf.size <= MAX_ANNOTATED_CELLS
+            ax = sns.heatmap(odf, cmap='Greens', linewidths=0.5, annot=annot, vmin=0.0, vmax=1.0, ax=fig.subplots())
+            ax.set_title('Overview of detailed similarities', fontsize = 15)
+            ax.set_xlabel('Reference texts', fontsize = 15)
+            ax.set_ylabel('Analysis texts', fontsize = 15)
+            fig.savefig(png_outfile, dpi=VIS_DPI, bbox_inches='tight')
+            generated_files.append(png_outfile)
+            rendered += 1
+        manifest.save()
+
+        s = Status.SUCCESS
+        if scores:
+            m = f"Visualizations done."
+        else:
+            m = f"No {PROCESSABLE} data found for visualization."
+        d = {"generated_files": generated_files, "rendered": rendered}
+        return s, m, d
@@ -1,19 +1,101 @@
 import os
 import logging
-import joblib
-import seaborn as sns
-import matplotlib.pylab as plt
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 from dynaconf import settings
 from simcore_api_schema_mod import Status
+from utils.resultwriter_mod import Resultwriter
 from visualizers.abstract_visualizer_mod import AbstractVizualizer
+from visualizers.render_manifest_mod import RenderManifest
+from visualizers import heatmap_worker_mod
 
 
 RESFOLDERNAME = settings.RESFOLDERNAME
+VIS_DPI = settings.VIS_DPI
+VIS_ANNOT = settings.VIS_ANNOT
+VIS_WORKERS = settings.VIS_WORKERS
+VIS_POOL_MIN_JOBS = settings.VIS_POOL_MIN_JOBS
 PROCESSABLE = "detailed"   # this is the filetag for files whose content can be visualized here
 
 logger = logging.getLogger(os.path.basename(__file__))
 
+
+class HeatmapPool:
+    """
+    the worker processes the heatmaps are rendered in. Rendering is CPU
+    bound and holds the GIL, hence processes. They are kept for all
+    visualizations of this worker process.
+
+    The workers are spawned, not forked, as the parent runs threads
+    (models, jobs) that must not be copied mid-operation. Like the workers
+    of the encoder pool, a spawned child imports the main script of its
+    parent, for SimCore the REST API, without starting it. The REST API
+    starts the workers when it starts up, before any job thread runs.
+    Otherwise, e.g. after a worker died, they are started on first use.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pool = None
+        self.workers = 0
+        return
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def usable_workers(workers=VIS_WORKERS):
+        return min(workers, os.cpu_count() or 1)
+
+    # ---------------------------------------------------------------------------
+    def start(self, workers=VIS_WORKERS) -> int:
+        """
+        start the workers unless a single one would do. Returns the number
+        of workers running.
+        """
+        workers = self.usable_workers(workers)
+        if workers <= 1:
+            return 0
+        self.get(workers)
+        return self.workers
+
+    # ---------------------------------------------------------------------------
+    def get(self, workers):
+        with self.lock:
+            if self.pool is None:
+                context = multiprocessing.get_context("spawn")
+                pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+                #
+                # the pool starts a process per submitted call until all
+                # workers run, so they are all started here and none later
+                #
+                futures = [pool.submit(heatmap_worker_mod.ready) for _ in range(workers)]
+                pids = [future.result() for future in futures]
+                logger.info(f"Started {workers} heatmap workers {pids}")
+                self.pool, self.workers = pool, workers
+            return self.pool
+
+    # ---------------------------------------------------------------------------
+    def stop(self, pool=None):
+        """
+        stop the workers. With a pool given only that one is stopped, e.g.
+        after one of its workers died, such that the next call starts new
+        workers.
+        """
+        with self.lock:
+            if self.pool is None or pool not in (None, self.pool):
+                return
+            self.pool.shutdown(wait=pool is None)
+            self.pool, self.workers = None, 0
+            logger.info("Heatmap workers stopped")
+        return
+
+
+heatmap_pool = HeatmapPool()
+
+
 class DetailedVisualizer(AbstractVizualizer):
 
     def __init__(self):
@@ -23,63 +105,93 @@ class DetailedVisualizer(AbstractVizualizer):
     #
     # this routine must be implemented and does the specific rendering
     #
-    def visualize_project(self, project: str):
+    def visualize_project(self, project: str, progress=None):
 
-        def charlim(s):
-            return s[:25]
-
-        generated_files = []
         result_folder = os.path.join(project, RESFOLDERNAME)
-        foundfile = False
+        files = [f for f in sorted(os.listdir(result_folder)) if Resultwriter.has_tag(f, PROCESSABLE)]
+        #
+        # results rendered before are only rendered again if they changed
+        #
+        manifest = RenderManifest(project, "detailed", {"dpi": VIS_DPI, "annot": VIS_ANNOT})
+        manifest.prune(files)
+        current = []
+        jobs = []
+        sources = []
 
-        for f in os.listdir(result_folder):
+        for f in files:
 
-            if f.endswith(PROCESSABLE):
-                foundfile = True
+            if manifest.is_current(f):
+                current += manifest.get_outputs(f)
+            else:
                 print(f)
                 #
                 # recover first and second part of the filename
                 #
                 f1f2 = f.split("."+PROCESSABLE)[0]
                 f1, f2 = f1f2.split("$")
-
-                #
-                # load corresponding dataframe
-                # and sort with respect to reference texts
-                # (important for concat!)
-                #
-                df = joblib.load(os.path.join(result_folder, f))
-                #
-                # *** Pitfall ***
-                #
-                # We end up with horrible crashs if we do not truncate the
-                # generic row and column labeling for the 2D visualization!
-                # Seaborn automatically uses the dataframe indices and dataframe
-                # column names as labelings in the plot! We therefore must
-                # truncate them accordingly.
-                #
-                df.index = map(charlim, df.index)
-                df.columns = map(charlim, df.columns)
                 #
-                # generate seaborn 2D heatmap
-                #
-                plt.figure(figsize = (16,10))
-                ax = sns.heatmap(df, cmap='Greens', linewidths=0.5, annot=True)
-                plt.title('2D heatmap of similarities', fontsize = 15)
-                plt.xlabel('Reference text: '+f2, fontsize = 15)
-                plt.ylabel('Analysis text: '+f1, fontsize = 15)
-                #
-                # generate filename from fragments and save graph to disk
+                # generate filename from fragments
                 #
                 tref_outfile = "$".join([f1, f2]) + ".2D_heatmap.png"
                 tref_outfile = os.path.join(result_folder, tref_outfile)
-                ax.figure.savefig(tref_outfile, dpi=600, bbox_inches='tight')
-                generated_files.append(tref_outfile)
+                jobs.append((os.path.join(result_folder, f), tref_outfile, f1, f2))
+                sources.append((f, manifest.stamp(f)))
+
+        rendered = self.render_all(jobs, progress)
+        for (f, stamp), outfile in zip(sources, rendered):
+            manifest.record(f, [outfile], stamp=stamp)
+        manifest.save()
 
         s = Status.SUCCESS
-        if foundfile:
+        if files:
             m = f"Visualizations done."
         else:
             m = f"No {PROCESSABLE} data found for visualization."
-        d = {"generated_files": generated_files}
-        return s, m, d
\ No newline at end of file
+        d = {"generated_files": current + rendered, "rendered": len(rendered)}
+        return s, m, d
+
+    # ---------------------------------------------------------------------------
+    @staticmethod
+    def render_all(jobs, progress=None, workers=VIS_WORKERS, min_jobs=VIS_POOL_MIN_JOBS):
+        """
+        render the heatmaps of all (infile, outfile, f1, f2) pairs. Batches
+        of at least min_jobs heatmaps are rendered in the worker processes
+        of the heatmap pool if there is more than one worker and more than
+        one CPU, smaller ones right here in the job thread.
+        """
+        generated_files = []
+        if progress:
+            progress(0, len(jobs))
+        workers = heatmap_pool.usable_workers(workers)
+        if workers <= 1 or len(jobs) < max(min_jobs, 2):
+            for infile, outfile, f1, f2 in jobs:
+                df = Resultwriter.read_result_file(infile)
+                generated_files.append(heatmap_worker_mod.render_heatmap(df, outfile, f1, f2, VIS_DPI, VIS_ANNOT))
+                if progress:
+                    progress(len(generated_files), len(jobs))
+            return generated_files
+        #
+        # the results are read here, the workers only draw. At most two
+        # results per worker are in flight, such that the results of a
+        # large project are not all held in memory at once
+        #
+        pool = heatmap_pool.get(workers)
+        pending = deque()
+
+        def collect():
+            generated_files.append(pending.popleft().result())
+            if progress:
+                progress(len(generated_files), len(jobs))
+
+        try:
+            for infile, outfile, f1, f2 in jobs:
+                if len(pending) >= 2 * workers:
+                    collect()
+                df = Resultwriter.read_result_file(infile)
+                pending.append(pool.submit(heatmap_worker_mod.render_heatmap, df, outfile, f1, f2, VIS_DPI, VIS_ANNOT))
+            while pending:
+                collect()
+        except BrokenProcessPool:
+            heatmap_pool.stop(pool)
+            raise
+        return generated_files
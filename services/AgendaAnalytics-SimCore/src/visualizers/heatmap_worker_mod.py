@@ -0,0 +1,52 @@
+#
+# entry module of the heatmap workers of the detailed visualizer. It
+# imports nothing but the plotting libraries, such that a worker process
+# starts without the models, the registries and the REST API of SimCore.
+# The results are read by the visualizer and passed in as dataframes.
+#
+import os
+
+import pandas as pd
+import seaborn as sns
+from matplotlib.figure import Figure
+
+
+def charlim(s):
+    return s[:25]
+
+
+def ready() -> int:
+    """
+    no-op the visualizer submits to every worker when it starts the pool
+    """
+    return os.getpid()
+
+
+def render_heatmap(df: pd.DataFrame, outfile: str, f1: str, f2: str, dpi: int, annot: bool) -> str:
+    """
+    render the heatmap of one analysis/reference pair. The figure is
+    drawn without pyplot, whose global current figure is not thread
+    safe, such that this also runs in several job threads at once. It
+    is not registered anywhere and freed after saving.
+    """
+    #
+    # *** Pitfall ***
+    #
+    # We end up with horrible crashs if we do not truncate the
+    # generic row and column labeling for the 2D visualization!
+    # Seaborn automatically uses the dataframe indices and dataframe
+    # column names as labelings in the plot! We therefore must
+    # truncate them accordingly.
+    #
+    df.index = map(charlim, df.index)
+    df.columns = map(charlim, df.columns)
+    #
+    # generate seaborn 2D heatmap
+    #
+    fig = Figure(figsize = (16,10))
+    ax = sns.heatmap(df, cmap='Greens', linewidths=0.5, annot=annot, ax=fig.subplots())
+    ax.set_title('2D heatmap of similarities', fontsize = 15)
+    ax.set_xlabel('Reference text: '+f2, fontsize = 15)
+    ax.set_ylabel('Analysis text: '+f1, fontsize = 15)
+    fig.savefig(outfile, dpi=dpi, bbox_inches='tight')
+    return outfile
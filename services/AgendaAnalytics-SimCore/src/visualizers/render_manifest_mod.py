@@ -0,0 +1,106 @@
+import os
+import json
+import hashlib
+import logging
+
+from dynaconf import settings
+
+RESFOLDERNAME = settings.RESFOLDERNAME
+MANIFESTNAME = "render_manifest.json"
+
+logger = logging.getLogger(os.path.basename(__file__))
+
+
+class RenderManifest:
+    """
+    Keeps track of the result files a visualizer of a project has
+    already rendered, such that repeated visualizations only render new
+    or changed results. A result counts as unchanged as long as its
+    modification time and size are the same, or else its content hash,
+    and its images still exist. Analyses write all results again, most
+    of them with the same content.
+    Every visualizer has its own section in render_manifest.json of the
+    project, which is reset when the rendering parameters change.
+    Visualizers may keep small extracts of a result along with it (e.g.
+    the values of a combined plot) to avoid loading it again.
+    """
+
+    def __init__(self, project: str, visualizer: str, params: dict):
+        self.result_folder = os.path.join(project, RESFOLDERNAME)
+        self.path = os.path.join(project, MANIFESTNAME)
+        self.visualizer = visualizer
+        self.manifest = dict()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    self.manifest = json.load(f)
+            except ValueError:
+                logger.warning(f"Unreadable {self.path}, rendering everything again")
+        section = self.manifest.get(visualizer)
+        if section is None or section["params"] != params:
+            section = {"params": params, "files": {}}
+            self.manifest[visualizer] = section
+        self.files = section["files"]
+        return
+
+    # ---------------------------------------------------------------------------
+    def stamp(self, source: str):
+        stat = os.stat(os.path.join(self.result_folder, source))
+        return [stat.st_mtime_ns, stat.st_size]
+
+    # ---------------------------------------------------------------------------
+    def content_hash(self, source: str) -> str:
+        h = hashlib.sha256()
+        with open(os.path.join(self.result_folder, source), "rb") as f:
+            for block in iter(lambda: f.read(2**20), b""):
+                h.update(block)
+        return h.hexdigest()
+
+    # ---------------------------------------------------------------------------
+    def is_current(self, source: str) -> bool:
+        entry = self.files.get(source)
+        if entry is None or not all(os.path.exists(output) for output in entry["outputs"]):
+            return False
+        stamp = self.stamp(source)
+        if entry["stamp"] == stamp:
+            return True
+        if entry["hash"] == self.content_hash(source):
+            entry["stamp"] = stamp
+            return True
+        return False
+
+    # ---------------------------------------------------------------------------
+    def get_outputs(self, source: str):
+        return self.files[source]["outputs"]
+
+    # ---------------------------------------------------------------------------
+    def get_data(self, source: str):
+        return self.files[source]["data"]
+
+    # ---------------------------------------------------------------------------
+    def record(self, source: str, outputs, data=None, stamp=None):
+        """
+        record a rendered result. The stamp should be taken before the
+        result is read, then a result changed meanwhile is rendered again.
+        """
+        if stamp is None:
+            stamp = self.stamp(source)
+        self.files[source] = {"stamp": stamp, "hash": self.content_hash(source), "outputs": list(outputs), "data": data}
+        return
+
+    # ---------------------------------------------------------------------------
+    def prune(self, sources) -> list:
+        """
+        forget the results that are not among sources anymore
+        """
+        removed = [source for source in self.files if source not in sources]
+        for source in removed:
+            del self.files[source]
+        return removed
+
+    # ---------------------------------------------------------------------------
+    def save(self):
+        with open(self.path + ".tmp", "w") as f:
+            json.dump(self.manifest, f)
+        os.replace(self.path + ".tmp", self.path)
+        return